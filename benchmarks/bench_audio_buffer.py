@@ -0,0 +1,96 @@
+"""Benchmark utterance accumulation and WAV assembly in the HTTP client.
+
+Compares the previous approach (bytes concatenation followed by a copy
+through wave/BytesIO) with AudioBuffer, reporting bytes copied and wall
+time per utterance for a range of utterance lengths.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_audio_buffer
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import time
+import wave
+
+from custom_components.openai_stt.audio import AudioBuffer
+
+SAMPLE_RATE = 16000
+SAMPLE_WIDTH = 2
+CHANNELS = 1
+CHUNK_MS = 20
+
+
+def _chunks(seconds: float) -> list[bytes]:
+    """Return PCM chunks the way a satellite delivers them."""
+    chunk_size = SAMPLE_RATE * SAMPLE_WIDTH * CHUNK_MS // 1000
+    count = int(seconds * 1000 / CHUNK_MS)
+    return [bytes(chunk_size)] * count
+
+
+def _legacy(chunks: list[bytes]) -> tuple[int, int]:
+    """Accumulate with bytes += and convert through wave."""
+    copied = 0
+    audio_data = b""
+    for chunk in chunks:
+        audio_data += chunk
+        copied += len(audio_data)
+    wav_stream = io.BytesIO()
+    with wave.open(wav_stream, "wb") as wf:
+        wf.setnchannels(CHANNELS)
+        wf.setsampwidth(SAMPLE_WIDTH)
+        wf.setframerate(SAMPLE_RATE)
+        wf.writeframes(audio_data)
+    copied += len(audio_data)
+    wav_data = wav_stream.getvalue()
+    copied += len(wav_data)
+    return copied, len(wav_data)
+
+
+def _buffer(chunks: list[bytes]) -> tuple[int, int]:
+    """Accumulate into AudioBuffer and take the WAV as a memoryview."""
+    audio_data = AudioBuffer()
+    for chunk in chunks:
+        audio_data.append(chunk)
+    wav_data = audio_data.as_wav(SAMPLE_RATE, CHANNELS, SAMPLE_WIDTH)
+    return audio_data.bytes_copied, wav_data.nbytes
+
+
+def _measure(func, chunks: list[bytes], repeat: int) -> tuple[int, int, float]:
+    """Return bytes copied, output size and best time per utterance."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        copied, size = func(chunks)
+        best = min(best, time.perf_counter() - start)
+    return copied, size, best
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--seconds", type=float, nargs="+", default=[2.0, 5.0, 15.0, 60.0]
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(
+        f"{'utterance':>10} {'method':>8} {'copied (MB)':>12} "
+        f"{'x payload':>10} {'time (ms)':>10}"
+    )
+    for seconds in args.seconds:
+        chunks = _chunks(seconds)
+        for name, func in (("legacy", _legacy), ("buffer", _buffer)):
+            copied, size, best = _measure(func, chunks, args.repeat)
+            print(
+                f"{seconds:>9.1f}s {name:>8} {copied / 1e6:>12.2f} "
+                f"{copied / size:>10.1f} {best * 1000:>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""Benchmark end-to-end transcription latency and throughput.
+
+Starts the local OpenAI stand-in (benchmarks.openai_server) in a
+subprocess and drives OpenAIHTTPClient and OpenAIWebSocketClient with
+synthetic PCM streamed at real-time pace, at several levels of
+concurrent utterances. For each protocol and level it reports the
+latency from the end of speech to the transcript (p50/p95/p99), the
+client CPU time per utterance and the process's peak RSS. The server
+runs in its own process, so the CPU figures are the client's alone.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_end_to_end
+    python -m benchmarks.bench_end_to_end --protocol http --streaming-upload
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import AsyncIterator
+import logging
+import math
+import resource
+import sys
+import time
+
+from aiohttp import ClientSession, TCPConnector
+import numpy as np
+
+from homeassistant.components.stt import (
+    AudioBitRates,
+    AudioChannels,
+    AudioCodecs,
+    AudioFormats,
+    AudioSampleRates,
+    SpeechMetadata,
+    SpeechResultState,
+)
+
+from custom_components.openai_stt.http_client import OpenAIHTTPClient
+from custom_components.openai_stt.websocket_client import OpenAIWebSocketClient
+
+SAMPLE_RATE = 16000
+
+# Bytes per chunk delivered by the Assist pipeline (32 ms of 16 kHz PCM16)
+CHUNK_SIZE = 1024
+
+METADATA = SpeechMetadata(
+    language="en-US",
+    format=AudioFormats.WAV,
+    codec=AudioCodecs.PCM,
+    bit_rate=AudioBitRates.BITRATE_16,
+    sample_rate=AudioSampleRates.SAMPLERATE_16000,
+    channel=AudioChannels.CHANNEL_MONO,
+)
+
+
+def _percentile(values: list[float], percentile: float) -> float:
+    """Return the nearest-rank percentile of the values."""
+    if not values:
+        return math.nan
+    ordered = sorted(values)
+    return ordered[max(math.ceil(len(ordered) * percentile / 100) - 1, 0)]
+
+
+def _peak_rss_mb() -> float:
+    """Return the peak resident set size of this process."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in kilobytes on Linux and in bytes on macOS
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+async def _start_server(
+    args: argparse.Namespace,
+) -> tuple[asyncio.subprocess.Process, str]:
+    """Start the stand-in server and return it with its API URL."""
+    process = await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-m",
+        "benchmarks.openai_server",
+        "--port",
+        "0",
+        "--delay",
+        str(args.delay),
+        "--jitter",
+        str(args.jitter),
+        "--error-rate",
+        str(args.error_rate),
+        stdout=asyncio.subprocess.PIPE,
+    )
+    assert process.stdout is not None
+    url = (await process.stdout.readline()).decode().strip()
+    return process, url
+
+
+class Utterance:
+    """A synthetic utterance streamed at real-time pace."""
+
+    def __init__(self, pcm: bytes) -> None:
+        """Initialize the utterance."""
+        self._pcm = pcm
+        self.end: float | None = None
+
+    async def stream(self) -> AsyncIterator[bytes]:
+        """Yield the audio in pipeline-sized chunks as it would be spoken."""
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for offset in range(0, len(self._pcm), CHUNK_SIZE):
+            chunk = self._pcm[offset : offset + CHUNK_SIZE]
+            yield chunk
+            due = start + (offset + len(chunk)) / (2 * SAMPLE_RATE)
+            await asyncio.sleep(max(due - loop.time(), 0.0))
+        self.end = loop.time()
+
+
+async def _run_level(
+    create_client, pcm: bytes, concurrency: int, rounds: int, seconds: float
+) -> tuple[list[float], int, float]:
+    """Run concurrent utterances; return latencies, errors and CPU time."""
+    loop = asyncio.get_running_loop()
+    rng = np.random.default_rng(concurrency)
+    latencies: list[float] = []
+    errors = 0
+
+    async def worker(stagger: float) -> None:
+        nonlocal errors
+        # Spread the first utterances so that they do not run in lockstep
+        await asyncio.sleep(stagger)
+        for _ in range(rounds):
+            utterance = Utterance(pcm)
+            result = await create_client().async_process_audio_stream(
+                METADATA, utterance.stream()
+            )
+            if (
+                result.result != SpeechResultState.SUCCESS
+                or not result.text
+                or utterance.end is None
+            ):
+                errors += 1
+                continue
+            latencies.append(loop.time() - utterance.end)
+
+    cpu_start = time.process_time()
+    await asyncio.gather(
+        *(worker(stagger) for stagger in rng.uniform(0, seconds, concurrency))
+    )
+    return latencies, errors, time.process_time() - cpu_start
+
+
+async def _main(args: argparse.Namespace) -> None:
+    """Run the benchmark against the stand-in server."""
+    rng = np.random.default_rng(0)
+    pcm = rng.integers(
+        -3000, 3000, int(args.seconds * SAMPLE_RATE), dtype=np.int16
+    ).tobytes()
+
+    process, url = await _start_server(args)
+    # Same connection limits as Home Assistant's shared client session
+    session = ClientSession(connector=TCPConnector(limit=4096, limit_per_host=100))
+    try:
+        factories = {
+            "http": lambda: OpenAIHTTPClient(
+                session,
+                "key",
+                url,
+                "gpt-4o-mini-transcribe",
+                "",
+                0.0,
+                args.streaming_upload,
+                upload_codec=args.upload_codec,
+            ),
+            "realtime": lambda: OpenAIWebSocketClient(
+                session,
+                "key",
+                url,
+                "gpt-4o-mini-transcribe",
+                "",
+                "none",
+                frame_ms=args.frame_ms,
+            ),
+        }
+        print(
+            f"{args.seconds:.1f} s utterances, server delay {args.delay * 1000:.0f}"
+            f" ± {args.jitter * 1000:.0f} ms, error rate {args.error_rate:.0%}"
+        )
+        print(
+            f"{'protocol':>9} {'conc':>5} {'utts':>5} {'errors':>6} "
+            f"{'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9} "
+            f"{'cpu/utt (ms)':>13} {'peak rss (MB)':>14}"
+        )
+        for protocol in args.protocol:
+            for concurrency in args.concurrency:
+                latencies, errors, cpu = await _run_level(
+                    factories[protocol], pcm, concurrency, args.rounds, args.seconds
+                )
+                utterances = concurrency * args.rounds
+                print(
+                    f"{protocol:>9} {concurrency:>5} {utterances:>5} {errors:>6} "
+                    f"{_percentile(latencies, 50) * 1000:>9.1f} "
+                    f"{_percentile(latencies, 95) * 1000:>9.1f} "
+                    f"{_percentile(latencies, 99) * 1000:>9.1f} "
+                    f"{cpu / utterances * 1000:>13.2f} {_peak_rss_mb():>14.1f}"
+                )
+    finally:
+        await session.close()
+        process.terminate()
+        await process.wait()
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--protocol",
+        nargs="+",
+        choices=["http", "realtime"],
+        default=["http", "realtime"],
+    )
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument(
+        "--rounds", type=int, default=3, help="utterances per concurrent stream"
+    )
+    parser.add_argument("--seconds", type=float, default=2.0, help="utterance length")
+    parser.add_argument("--delay", type=float, default=0.3, help="server delay (s)")
+    parser.add_argument("--jitter", type=float, default=0.05, help="server jitter (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--streaming-upload", action="store_true")
+    parser.add_argument("--upload-codec", default="wav")
+    parser.add_argument("--frame-ms", type=int, default=100)
+    parser.add_argument("--verbose", action="store_true", help="show client logging")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING if args.verbose else logging.CRITICAL)
+    asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
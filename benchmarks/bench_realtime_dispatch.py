@@ -0,0 +1,96 @@
+"""Benchmark decoding of Realtime API server events.
+
+Replays a realtime event stream (session setup, VAD events, transcription
+deltas and the final transcripts of three utterances) through the
+previous receive path, which parsed every event with json.loads, and
+through decode_event, which only parses the events the receiver acts on.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_realtime_dispatch
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+from pathlib import Path
+import time
+
+from custom_components.openai_stt.events import (
+    BUFFER_COMMITTED,
+    ERROR,
+    TRANSCRIPTION_COMPLETED,
+    TRANSCRIPTION_FAILED,
+    decode_event,
+)
+
+FIXTURE = Path(__file__).parent / "fixtures" / "realtime_events.jsonl"
+
+_LOGGER = logging.getLogger(__name__)
+
+# Events decoded by the single-utterance and persistent session receivers
+RECEIVERS = {
+    "single": frozenset({TRANSCRIPTION_COMPLETED}),
+    "persistent": frozenset(
+        {BUFFER_COMMITTED, TRANSCRIPTION_COMPLETED, TRANSCRIPTION_FAILED, ERROR}
+    ),
+}
+
+
+def _legacy(events: list[str], wanted: frozenset[str]) -> int:
+    """Parse every event and log the decoded dict."""
+    handled = 0
+    for raw in events:
+        data = json.loads(raw)
+        _LOGGER.debug("Received response: %s", data)
+        if data.get("type") in wanted:
+            handled += 1
+    return handled
+
+
+def _fast(events: list[str], wanted: frozenset[str]) -> int:
+    """Classify events from the raw text and parse only wanted ones."""
+    handled = 0
+    for raw in events:
+        _LOGGER.debug("Received response: %s", raw)
+        if decode_event(raw, wanted) is not None:
+            handled += 1
+    return handled
+
+
+def _measure(func, events: list[str], wanted: frozenset[str], repeat: int):
+    """Return the events handled and best time per event."""
+    best = float("inf")
+    handled = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        handled = func(events, wanted)
+        best = min(best, time.perf_counter() - start)
+    return handled, best / len(events)
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--debug", action="store_true", help="enable debug logging")
+    args = parser.parse_args()
+
+    if args.debug:
+        logging.basicConfig(level=logging.DEBUG, handlers=[logging.NullHandler()])
+
+    events = FIXTURE.read_text(encoding="utf-8").splitlines()
+    print(f"{len(events)} events, {sum(map(len, events)) / 1e3:.1f} KB")
+    print(f"{'receiver':>10} {'method':>8} {'handled':>8} {'us / event':>11}")
+    for receiver, wanted in RECEIVERS.items():
+        for name, func in (("legacy", _legacy), ("fast", _fast)):
+            handled, per_event = _measure(func, events, wanted, args.repeat)
+            print(
+                f"{receiver:>10} {name:>8} {handled:>8} {per_event * 1e6:>11.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Benchmark the streaming resampler.
+
+Feeds 20 ms chunks through StreamingResampler for common satellite
+formats and reports the CPU time per second of audio, the real-time
+factor and the size of the audio forwarded to each API.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_resample
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from custom_components.openai_stt.resample import StreamingResampler
+
+CHUNK_MS = 20
+
+# (input rate, channels, output rate)
+CASES = (
+    (48000, 2, 16000),
+    (44100, 2, 16000),
+    (48000, 1, 24000),
+    (16000, 1, 24000),
+    (44100, 2, 24000),
+)
+
+
+def _chunks(rate: int, channels: int, seconds: float) -> list[bytes]:
+    """Return noise PCM chunks the way a satellite delivers them."""
+    samples = np.random.default_rng(0).normal(0, 3000, int(rate * seconds) * channels)
+    pcm = samples.astype(np.int16).tobytes()
+    chunk_size = rate * channels * 2 * CHUNK_MS // 1000
+    return [pcm[i : i + chunk_size] for i in range(0, len(pcm), chunk_size)]
+
+
+def _measure(
+    chunks: list[bytes], rate: int, channels: int, output_rate: int, repeat: int
+) -> tuple[int, float]:
+    """Return the output size and best time for the whole stream."""
+    best = float("inf")
+    size = 0
+    for _ in range(repeat):
+        resampler = StreamingResampler(rate, output_rate, channels)
+        start = time.perf_counter()
+        size = sum(len(resampler.process(chunk)) for chunk in chunks)
+        size += len(resampler.flush())
+        best = min(best, time.perf_counter() - start)
+    return size, best
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(
+        f"{'input':>14} {'output':>8} {'in (KB)':>9} {'out (KB)':>9} "
+        f"{'ms / s audio':>13} {'RTF':>9}"
+    )
+    for rate, channels, output_rate in CASES:
+        chunks = _chunks(rate, channels, args.seconds)
+        size, best = _measure(chunks, rate, channels, output_rate, args.repeat)
+        print(
+            f"{rate:>8} Hz x{channels} {output_rate:>8} "
+            f"{sum(map(len, chunks)) / 1e3:>9.0f} {size / 1e3:>9.0f} "
+            f"{best * 1000 / args.seconds:>13.3f} {best / args.seconds:>9.5f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Benchmark upload codecs for the HTTP transcription path.
+
+Encodes synthetic speech-like PCM with each upload codec and reports the
+encode CPU time against the bytes saved compared to WAV, to help choose
+a codec per host. A codec pays off when the upload time it saves on the
+host's uplink is larger than its encode time.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_upload_codec
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from custom_components.openai_stt.audio import WAV_HEADER_SIZE
+from custom_components.openai_stt.encoding import UPLOAD_FORMATS, encode_pcm
+
+SAMPLE_RATE = 16000
+
+
+def _speech_like(seconds: float) -> bytes:
+    """Return PCM16 with a voiced, syllable-modulated signal over noise."""
+    rng = np.random.default_rng(0)
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    pitch = 140 + 30 * np.sin(2 * np.pi * 0.5 * t)
+    voiced = sum(
+        np.sin(2 * np.pi * harmonic * np.cumsum(pitch) / SAMPLE_RATE) / harmonic
+        for harmonic in range(1, 8)
+    )
+    envelope = np.clip(np.sin(2 * np.pi * 4 * t), 0, None)
+    signal = 6000 * envelope * voiced + 200 * rng.standard_normal(t.size)
+    return np.clip(signal, -32768, 32767).astype(np.int16).tobytes()
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, nargs="+", default=[3.0, 10.0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--uplink-kbps",
+        type=float,
+        default=1000.0,
+        help="uplink speed used to estimate the upload time saved",
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{'audio':>7} {'codec':>6} {'bytes':>9} {'saved':>7} "
+        f"{'cpu (ms)':>9} {'upload saved (ms)':>18}"
+    )
+    for seconds in args.seconds:
+        pcm = _speech_like(seconds)
+        wav_size = len(pcm) + WAV_HEADER_SIZE
+        print(f"{seconds:>6.1f}s {'wav':>6} {wav_size:>9} {0:>6.0%} {0:>9.2f} {0:>18.1f}")
+        for codec in UPLOAD_FORMATS:
+            best = float("inf")
+            for _ in range(args.repeat):
+                start = time.process_time()
+                encoded = encode_pcm(memoryview(pcm), codec, SAMPLE_RATE, 1)
+                best = min(best, time.process_time() - start)
+            if encoded is None:
+                print(f"{seconds:>6.1f}s {codec:>6} PyAV not installed")
+                continue
+            saved = wav_size - len(encoded)
+            upload_saved_ms = saved * 8 / args.uplink_kbps
+            print(
+                f"{seconds:>6.1f}s {codec:>6} {len(encoded):>9} "
+                f"{saved / wav_size:>6.0%} {best * 1000:>9.2f} {upload_saved_ms:>18.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+"""Local stand-in for the OpenAI transcription endpoints.
+
+Implements GET /v1/models, POST /v1/audio/transcriptions and the
+/v1/realtime?intent=transcription WebSocket protocol closely enough for
+the integration's clients, with a configurable processing delay, jitter
+and error rate. Transcripts report the number of audio bytes received,
+so callers can check that nothing was lost. With a VAD silence set,
+realtime sessions imitate server VAD: after speech followed by that much
+silence, the buffer is committed and speech_stopped is sent.
+
+Used by the end-to-end benchmark, or run on its own to point an entry's
+API URL at it:
+
+    python -m benchmarks.openai_server --port 8765 --delay 0.3
+"""
+
+from __future__ import annotations
+
+import argparse
+import array
+import asyncio
+import base64
+from dataclasses import dataclass
+import json
+import random
+import time
+
+from aiohttp import WSMsgType, web
+
+# Realtime input audio: 24 kHz mono PCM16
+REALTIME_BYTES_PER_MS = 48
+
+# Peak sample level above which realtime audio counts as speech
+VAD_SPEECH_LEVEL = 1000
+
+@dataclass
+class ServerStats:
+    """Request counters of the stand-in."""
+
+    requests: int = 0
+    realtime_sessions: int = 0
+    errors: int = 0
+
+
+class OpenAIStandIn:
+    """An aiohttp server imitating the OpenAI transcription API."""
+
+    def __init__(
+        self,
+        delay: float = 0.3,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+        vad_silence_ms: int = 0,
+    ) -> None:
+        """Initialize the server; delay and jitter are in seconds."""
+        self.delay = delay
+        self.vad_silence_ms = vad_silence_ms
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.stats = ServerStats()
+        self._random = random.Random(seed)
+        self._runner: web.AppRunner | None = None
+
+        self.app = web.Application(client_max_size=64 * 1024 * 1024)
+        self.app.router.add_get("/v1/models", self._models)
+        self.app.router.add_post("/v1/audio/transcriptions", self._transcriptions)
+        self.app.router.add_get("/v1/realtime", self._realtime)
+
+    async def async_start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving and return the API URL."""
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        return f"http://{host}:{port}/v1"
+
+    async def async_stop(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _process(self) -> bool:
+        """Wait for the processing delay; return False to inject an error."""
+        delay = self.delay + self._random.uniform(-self.jitter, self.jitter)
+        await asyncio.sleep(max(delay, 0.0))
+        if self._random.random() < self.error_rate:
+            self.stats.errors += 1
+            return False
+        return True
+
+    async def _models(self, request: web.Request) -> web.Response:
+        """List the transcription models."""
+        return web.json_response(
+            {
+                "object": "list",
+                "data": [
+                    {"id": model, "object": "model"}
+                    for model in ("gpt-4o-mini-transcribe", "gpt-4o-transcribe")
+                ],
+            }
+        )
+
+    async def _transcriptions(self, request: web.Request) -> web.Response:
+        """Transcribe an uploaded file."""
+        self.stats.requests += 1
+        size = 0
+        reader = await request.multipart()
+        async for part in reader:
+            if part.name == "file":
+                while chunk := await part.read_chunk():
+                    size += len(chunk)
+            else:
+                await part.release()
+        start = time.perf_counter()
+        if not await self._process():
+            return web.json_response(
+                {"error": {"message": "Injected error", "type": "server_error"}},
+                status=503,
+            )
+        processing_ms = round((time.perf_counter() - start) * 1000)
+        return web.json_response(
+            {"text": f"Received {size} bytes."},
+            headers={"openai-processing-ms": str(processing_ms)},
+        )
+
+    async def _realtime(self, request: web.Request) -> web.WebSocketResponse:
+        """Serve a realtime transcription session."""
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.stats.realtime_sessions += 1
+        size = 0
+        items = 0
+        pending: set[asyncio.Task] = set()
+        # Server VAD state: whether speech was heard, and the silence since
+        speech = False
+        silence = 0
+
+        async def transcribe(item_id: str, size: int) -> None:
+            """Send the transcript of a committed buffer, word by word."""
+            if await self._process():
+                transcript = f"Received {size} bytes."
+                for word in transcript.split(" "):
+                    await ws.send_json(
+                        {
+                            "type": "conversation.item.input_audio_transcription.delta",
+                            "item_id": item_id,
+                            "content_index": 0,
+                            "delta": f"{word} ",
+                        }
+                    )
+                await ws.send_json(
+                    {
+                        "type": "conversation.item.input_audio_transcription.completed",
+                        "item_id": item_id,
+                        "transcript": transcript,
+                    }
+                )
+                return
+            await ws.send_json(
+                {
+                    "type": "conversation.item.input_audio_transcription.failed",
+                    "item_id": item_id,
+                    "error": {"message": "Injected error"},
+                }
+            )
+            await ws.close()
+
+        async def commit() -> None:
+            """Commit the buffer and transcribe it."""
+            nonlocal items, size
+            self.stats.requests += 1
+            items += 1
+            item_id = f"item_{items}"
+            await ws.send_json(
+                {"type": "input_audio_buffer.committed", "item_id": item_id}
+            )
+            task = asyncio.create_task(transcribe(item_id, size))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+            size = 0
+
+        try:
+            async for msg in ws:
+                if msg.type != WSMsgType.TEXT:
+                    break
+                event = json.loads(msg.data)
+                match event["type"]:
+                    case "transcription_session.update":
+                        await ws.send_json({"type": "transcription_session.updated"})
+                    case "input_audio_buffer.append":
+                        audio = base64.b64decode(event["audio"])
+                        size += len(audio)
+                        if not self.vad_silence_ms:
+                            continue
+                        samples = array.array("h", audio[: len(audio) // 2 * 2])
+                        if samples and max(map(abs, samples)) > VAD_SPEECH_LEVEL:
+                            speech, silence = True, 0
+                            continue
+                        silence += len(audio) // REALTIME_BYTES_PER_MS
+                        if speech and silence >= self.vad_silence_ms:
+                            speech, silence = False, 0
+                            await ws.send_json(
+                                {"type": "input_audio_buffer.speech_stopped"}
+                            )
+                            await commit()
+                    case "input_audio_buffer.clear":
+                        size = 0
+                        speech, silence = False, 0
+                        await ws.send_json({"type": "input_audio_buffer.cleared"})
+                    case "input_audio_buffer.commit":
+                        if not size and self.vad_silence_ms:
+                            # Server VAD already committed everything
+                            await ws.send_json(
+                                {
+                                    "type": "error",
+                                    "error": {
+                                        "code": "input_audio_buffer_commit_empty"
+                                    },
+                                }
+                            )
+                            continue
+                        await commit()
+        finally:
+            for task in pending:
+                task.cancel()
+        return ws
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    """Run the stand-in until interrupted."""
+    server = OpenAIStandIn(
+        args.delay, args.jitter, args.error_rate, args.seed, args.vad_silence_ms
+    )
+    url = await server.async_start(args.host, args.port)
+    print(url, flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.async_stop()
+
+
+def main() -> None:
+    """Run the server."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=0.3, help="seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--vad-silence-ms", type=int, default=0, help="0 disables server VAD"
+    )
+    args = parser.parse_args()
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
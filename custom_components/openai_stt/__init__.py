@@ -8,10 +8,12 @@ from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 
 from .const import DOMAIN
+from .transport import OpenAISTTTransport, TransportOptions
+from .views import MetricsView
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS = [Platform.STT]
+PLATFORMS = [Platform.STT, Platform.SENSOR]
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -19,8 +21,17 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     try:
         _LOGGER.debug("Setting up OpenAI STT integration for entry: %s", entry.entry_id)
 
-        hass.data.setdefault(DOMAIN, {})
-        hass.data[DOMAIN][entry.entry_id] = entry.data | entry.options
+        transport = OpenAISTTTransport(
+            hass,
+            entry.entry_id,
+            TransportOptions.from_config(entry.data | entry.options),
+        )
+        await transport.async_start()
+        if DOMAIN not in hass.data:
+            hass.data[DOMAIN] = {}
+            hass.http.register_view(MetricsView(hass))
+        hass.data[DOMAIN][entry.entry_id] = transport
+        entry.async_on_unload(entry.add_update_listener(_async_update_listener))
 
         await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
@@ -34,6 +45,15 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
+        transport: OpenAISTTTransport = hass.data[DOMAIN].pop(entry.entry_id)
+        await transport.async_stop()
 
     return unload_ok
+
+
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed options to the running transport."""
+    transport: OpenAISTTTransport = hass.data[DOMAIN][entry.entry_id]
+    await transport.async_update_options(
+        TransportOptions.from_config(entry.data | entry.options)
+    )
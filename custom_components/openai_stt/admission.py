@@ -0,0 +1,186 @@
+"""Admission control for OpenAI STT requests."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterable
+from dataclasses import dataclass
+import logging
+from typing import Final
+
+from homeassistant.components.stt import (
+    SpeechMetadata,
+    SpeechResult,
+    SpeechResultState,
+)
+
+from .hedging import Transcriber
+from .telemetry import NOOP_TELEMETRY, Telemetry
+
+_LOGGER = logging.getLogger(__name__)
+
+# Weight of the latest request in the average time a request holds a slot
+HOLD_SMOOTHING: Final = 0.2
+
+
+@dataclass
+class AdmissionStats:
+    """Counters of the admission controller."""
+
+    admitted: int = 0
+    queued: int = 0
+    shed_queue_full: int = 0
+    shed_deadline: int = 0
+    queue_time_total: float = 0.0
+    queue_time_max: float = 0.0
+
+    @property
+    def shed(self) -> int:
+        """Return the number of rejected requests."""
+        return self.shed_queue_full + self.shed_deadline
+
+
+class AdmissionController:
+    """Limit the requests of an entry that run at the same time.
+
+    Up to max_in_flight utterances are transcribed at once; the rest wait
+    in a queue of at most max_queue, in arrival order, while their audio
+    is buffered by the pipeline. An utterance is rejected right away with
+    an error when the queue is full or when the expected wait, from the
+    average time a request holds its slot, exceeds queue_timeout. One
+    that still waits longer than queue_timeout is rejected then, so
+    overload fails fast instead of running into the request timeouts.
+    """
+
+    def __init__(
+        self, max_in_flight: int, max_queue: int, queue_timeout: float
+    ) -> None:
+        """Initialize the controller; queue_timeout is in seconds."""
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        # Average seconds from admission to the end of a request
+        self._hold: float | None = None
+        self.stats = AdmissionStats()
+
+    @property
+    def queued(self) -> int:
+        """Return the number of requests waiting for a slot."""
+        return len(self._waiters)
+
+    def update(self, max_in_flight: int, max_queue: int, queue_timeout: float) -> None:
+        """Change the limits, admitting waiters if there is room now."""
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        while self.in_flight < self.max_in_flight and self._wake_next():
+            self.in_flight += 1
+
+    def expected_wait(self) -> float | None:
+        """Return the expected wait of a request joining the queue."""
+        if self._hold is None:
+            return None
+        return (len(self._waiters) + 1) * self._hold / self.max_in_flight
+
+    def _wake_next(self) -> bool:
+        """Admit the longest waiting request; return False if there is none."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return True
+        return False
+
+    def _release(self) -> None:
+        """Hand the slot of a finished request to the next waiter."""
+        if self.in_flight > self.max_in_flight or not self._wake_next():
+            self.in_flight -= 1
+
+    async def _async_acquire(self, telemetry: Telemetry) -> bool:
+        """Wait for a slot; return False if the request is shed."""
+        if not self._waiters and self.in_flight < self.max_in_flight:
+            self.in_flight += 1
+            return True
+
+        if len(self._waiters) >= self.max_queue:
+            self.stats.shed_queue_full += 1
+            telemetry.count("shed_total", 1, {"reason": "queue_full"})
+            _LOGGER.warning(
+                "Rejecting utterance: %d requests in flight and %d queued",
+                self.in_flight,
+                len(self._waiters),
+            )
+            return False
+
+        if (expected := self.expected_wait()) is not None and (
+            expected > self.queue_timeout
+        ):
+            self.stats.shed_deadline += 1
+            telemetry.count("shed_total", 1, {"reason": "deadline"})
+            _LOGGER.warning(
+                "Rejecting utterance: expected wait of %.1f s exceeds %.1f s",
+                expected,
+                self.queue_timeout,
+            )
+            return False
+
+        loop = asyncio.get_running_loop()
+        waiter: asyncio.Future[None] = loop.create_future()
+        self._waiters.append(waiter)
+        start = loop.time()
+        admitted = False
+        try:
+            with telemetry.span("queue", position=len(self._waiters)):
+                async with asyncio.timeout(self.queue_timeout):
+                    await waiter
+            admitted = True
+        except TimeoutError:
+            self.stats.shed_deadline += 1
+            telemetry.count("shed_total", 1, {"reason": "deadline"})
+            _LOGGER.warning(
+                "Rejecting utterance: no request slot within %.1f s",
+                self.queue_timeout,
+            )
+            return False
+        finally:
+            if not waiter.done() or waiter.cancelled():
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+            elif not admitted:
+                # Handed a slot just as the wait ended
+                self._release()
+
+        queue_time = loop.time() - start
+        self.stats.queued += 1
+        self.stats.queue_time_total += queue_time
+        self.stats.queue_time_max = max(self.stats.queue_time_max, queue_time)
+        telemetry.observe("queue_seconds", queue_time, {})
+        return True
+
+    async def async_transcribe(
+        self,
+        metadata: SpeechMetadata,
+        stream: AsyncIterable[bytes],
+        transcribe: Transcriber,
+        telemetry: Telemetry = NOOP_TELEMETRY,
+    ) -> SpeechResult:
+        """Transcribe once a slot is free, or fail if the entry is overloaded."""
+        if not await self._async_acquire(telemetry):
+            return SpeechResult("", SpeechResultState.ERROR)
+
+        loop = asyncio.get_running_loop()
+        self.stats.admitted += 1
+        start = loop.time()
+        try:
+            return await transcribe(metadata, stream)
+        finally:
+            hold = loop.time() - start
+            self._hold = (
+                hold
+                if self._hold is None
+                else self._hold + HOLD_SMOOTHING * (hold - self._hold)
+            )
+            self._release()
@@ -0,0 +1,89 @@
+"""Audio buffering helpers for OpenAI STT."""
+
+from __future__ import annotations
+
+import struct
+from typing import Final
+
+# Size of a canonical PCM RIFF/WAVE header (RIFF + fmt + data chunk headers)
+WAV_HEADER_SIZE: Final = 44
+
+# Data size marker for WAV streams whose length is not known up front
+WAV_UNKNOWN_SIZE: Final = 0xFFFFFFFF
+
+_WAV_HEADER_STRUCT: Final = struct.Struct("<4sI4s4sIHHIIHH4sI")
+_WAVE_FORMAT_PCM: Final = 1
+
+
+def build_wav_header(
+    sample_rate: int, channels: int, sample_width: int, data_size: int
+) -> bytes:
+    """Build a PCM WAV header for the given format and data size.
+
+    Pass WAV_UNKNOWN_SIZE as data_size for a streamed file; both the RIFF
+    and data chunk sizes are then set to the streaming marker.
+    """
+    block_align = channels * sample_width
+    riff_size = (
+        WAV_UNKNOWN_SIZE
+        if data_size == WAV_UNKNOWN_SIZE
+        else WAV_HEADER_SIZE - 8 + data_size
+    )
+    return _WAV_HEADER_STRUCT.pack(
+        b"RIFF",
+        riff_size,
+        b"WAVE",
+        b"fmt ",
+        16,
+        _WAVE_FORMAT_PCM,
+        channels,
+        sample_rate,
+        sample_rate * block_align,
+        block_align,
+        sample_width * 8,
+        b"data",
+        data_size,
+    )
+
+
+class AudioBuffer:
+    """Growable audio buffer with room reserved for a WAV header.
+
+    Chunks are appended to a single bytearray (amortized linear time), and
+    the first WAV_HEADER_SIZE bytes are kept free so the WAV header can be
+    written in place once the size is known. The resulting file is handed
+    out as a memoryview, so neither the PCM nor the WAV is copied again.
+
+    Already compressed audio can be collected the same way and read back
+    through data without a header.
+
+    A bytearray cannot be resized while a memoryview of it is alive, so the
+    buffer must not be appended to after as_wav() or data has been used.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty buffer."""
+        self._buffer = bytearray(WAV_HEADER_SIZE)
+        self.bytes_copied = 0
+
+    def __len__(self) -> int:
+        """Return the number of audio bytes in the buffer."""
+        return len(self._buffer) - WAV_HEADER_SIZE
+
+    def append(self, chunk: bytes) -> None:
+        """Append a chunk of audio."""
+        self._buffer += chunk
+        self.bytes_copied += len(chunk)
+
+    @property
+    def data(self) -> memoryview:
+        """Return a view of the audio data without the header."""
+        return memoryview(self._buffer)[WAV_HEADER_SIZE:]
+
+    def as_wav(self, sample_rate: int, channels: int, sample_width: int) -> memoryview:
+        """Write the WAV header in place and return a view of the whole file."""
+        self._buffer[:WAV_HEADER_SIZE] = build_wav_header(
+            sample_rate, channels, sample_width, len(self)
+        )
+        self.bytes_copied += WAV_HEADER_SIZE
+        return memoryview(self._buffer)
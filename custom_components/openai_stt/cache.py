@@ -0,0 +1,212 @@
+"""Content-addressed transcript cache for OpenAI STT."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from collections.abc import AsyncIterable, AsyncIterator
+from dataclasses import dataclass
+from hashlib import blake2b
+import logging
+import time
+from typing import Any, Final
+
+from homeassistant.components.stt import (
+    SpeechMetadata,
+    SpeechResult,
+    SpeechResultState,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+from .hedging import Transcriber
+from .telemetry import current_span
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION: Final = 1
+
+# Delay before cache changes are written to disk (in seconds)
+DISK_SAVE_DELAY: Final = 30
+
+# Maximum number of transcripts kept on disk
+DISK_MAX_ENTRIES: Final = 1000
+
+
+@dataclass
+class CacheStats:
+    """Hit and miss counters of the transcript cache."""
+
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    stores: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Return the fraction of lookups that were hits."""
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return hits / lookups if lookups else 0.0
+
+
+class TranscriptCache:
+    """Reuse transcripts of audio that has been transcribed before.
+
+    The key is a BLAKE2 hash of the request parameters, the audio format
+    and the audio itself. The audio is hashed as it streams to the API,
+    so the request is not held back. When the audio ends with a cached
+    transcript, the request is stopped and the cached transcript is
+    returned. Only a buffered HTTP upload is stopped before it is sent;
+    with a streaming upload or the Realtime API the audio has already
+    gone out, and is billed, by then, so a hit only saves waiting for
+    the transcript.
+    Recent transcripts are kept in a bounded in-memory LRU; with
+    persistence enabled they are also written to disk, where they expire
+    after the TTL.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        max_entries: int,
+        ttl: float,
+        persistent: bool,
+    ) -> None:
+        """Initialize the cache; ttl is in seconds."""
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._memory: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._disk: dict[str, tuple[str, float]] = {}
+        self._store: Store[dict[str, Any]] | None = (
+            Store(hass, STORAGE_VERSION, f"{DOMAIN}.cache.{entry_id}")
+            if persistent
+            else None
+        )
+        self.stats = CacheStats()
+
+    async def async_load(self) -> None:
+        """Load the transcripts stored on disk."""
+        if self._store is None:
+            return
+        data = await self._store.async_load() or {}
+        now = time.time()
+        self._disk = {
+            key: (text, stored)
+            for key, (text, stored) in data.get("entries", {}).items()
+            if now - stored < self._ttl
+        }
+        _LOGGER.debug("Loaded %d cached transcripts from disk", len(self._disk))
+
+    def get(self, key: str) -> str | None:
+        """Return the cached transcript for a key."""
+        now = time.time()
+        if (entry := self._memory.get(key)) is not None:
+            if now - entry[1] < self._ttl:
+                self._memory.move_to_end(key)
+                self.stats.memory_hits += 1
+                return entry[0]
+            del self._memory[key]
+        if (entry := self._disk.get(key)) is not None:
+            if now - entry[1] < self._ttl:
+                self._remember(key, entry)
+                self.stats.disk_hits += 1
+                return entry[0]
+            del self._disk[key]
+        self.stats.misses += 1
+        return None
+
+    def put(self, key: str, text: str) -> None:
+        """Cache a transcript."""
+        entry = (text, time.time())
+        self._remember(key, entry)
+        self.stats.stores += 1
+        if self._store is not None:
+            self._disk[key] = entry
+            self._store.async_delay_save(self._data_to_save, DISK_SAVE_DELAY)
+
+    def _remember(self, key: str, entry: tuple[str, float]) -> None:
+        """Add an entry to the in-memory LRU."""
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._max_entries:
+            self._memory.popitem(last=False)
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the unexpired, most recent transcripts for the store."""
+        now = time.time()
+        entries = sorted(
+            (
+                (key, entry)
+                for key, entry in self._disk.items()
+                if now - entry[1] < self._ttl
+            ),
+            key=lambda item: item[1][1],
+        )[-DISK_MAX_ENTRIES:]
+        self._disk = dict(entries)
+        return {"entries": self._disk}
+
+    async def async_transcribe(
+        self,
+        metadata: SpeechMetadata,
+        stream: AsyncIterable[bytes],
+        transcribe: Transcriber,
+        params: tuple[Any, ...],
+    ) -> SpeechResult:
+        """Transcribe through the cache.
+
+        params holds the request settings that affect the transcript.
+        """
+        hasher = blake2b(digest_size=16)
+        hasher.update(
+            repr(
+                (
+                    params,
+                    metadata.language,
+                    metadata.format,
+                    metadata.codec,
+                    metadata.bit_rate,
+                    metadata.sample_rate,
+                    metadata.channel,
+                )
+            ).encode()
+        )
+        loop = asyncio.get_running_loop()
+        audio_key: asyncio.Future[str] = loop.create_future()
+        cached: asyncio.Future[str | None] = loop.create_future()
+
+        async def hashed_stream() -> AsyncIterator[bytes]:
+            """Pass the audio through, hashing it on the way."""
+            async for chunk in stream:
+                hasher.update(chunk)
+                yield chunk
+            audio_key.set_result(hasher.hexdigest())
+            cached.set_result(text := self.get(audio_key.result()))
+            if text is not None:
+                # Hold the request back until it is cancelled
+                await loop.create_future()
+
+        task = asyncio.create_task(transcribe(metadata, hashed_stream()))
+        try:
+            await asyncio.wait((task, cached), return_when=asyncio.FIRST_COMPLETED)
+            text = cached.result() if cached.done() else None
+            if (span := current_span()) is not None:
+                span.set_attribute("cache_hit", text is not None)
+            if text is not None:
+                _LOGGER.debug("Transcript cache hit: %s", text)
+                return SpeechResult(text, SpeechResultState.SUCCESS)
+
+            result = await task
+            if (
+                audio_key.done()
+                and result.result == SpeechResultState.SUCCESS
+                and result.text
+            ):
+                self.put(audio_key.result(), result.text)
+            return result
+        finally:
+            if not task.done():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
@@ -14,22 +14,85 @@ from homeassistant.helpers.selector import selector
 import aiohttp
 
 from .const import (
+    CONF_API_KEYS,
     CONF_API_URL,
+    CONF_BACKENDS,
+    CONF_CACHE_PERSISTENT,
+    CONF_CACHE_SIZE,
+    CONF_CACHE_TTL,
+    CONF_EARLY_FINALIZE,
+    CONF_HEDGE_API_URL,
+    CONF_HEDGE_PERCENTILE,
+    CONF_HEDGE_PROTOCOL,
+    CONF_MAX_IN_FLIGHT,
+    CONF_MAX_QUEUE,
+    CONF_MAX_RETRIES,
     CONF_MODEL,
+    CONF_NOISE_REDUCTION,
+    CONF_OTLP_ENDPOINT,
+    CONF_PARTIAL_EVENTS,
+    CONF_PROMETHEUS_METRICS,
     CONF_PROMPT,
-    CONF_TEMPERATURE,
+    CONF_QUEUE_TIMEOUT,
     CONF_REALTIME,
-    CONF_NOISE_REDUCTION,
+    CONF_REALTIME_FRAME_MS,
+    CONF_REALTIME_PERSISTENT,
+    CONF_REALTIME_POOL_SIZE,
+    CONF_SEGMENT_LENGTH,
+    CONF_SEGMENT_WORKERS,
+    CONF_SILENCE_PADDING,
+    CONF_SILENCE_THRESHOLD,
+    CONF_SPECULATIVE_REQUESTS,
+    CONF_STREAMING_UPLOAD,
+    CONF_TEMPERATURE,
+    CONF_TRIM_SILENCE,
+    CONF_UPLOAD_CODEC,
+    CONF_VAD_CALIBRATION,
+    CONF_VAD_PREFIX_PADDING,
+    CONF_VAD_SILENCE_DURATION,
+    CONF_VAD_THRESHOLD,
+    DEFAULT_API_KEYS,
     DEFAULT_API_URL,
+    DEFAULT_BACKENDS,
+    DEFAULT_CACHE_PERSISTENT,
+    DEFAULT_CACHE_SIZE,
+    DEFAULT_CACHE_TTL,
+    DEFAULT_EARLY_FINALIZE,
+    DEFAULT_HEDGE_API_URL,
+    DEFAULT_HEDGE_PERCENTILE,
+    DEFAULT_HEDGE_PROTOCOL,
+    DEFAULT_MAX_IN_FLIGHT,
+    DEFAULT_MAX_QUEUE,
+    DEFAULT_MAX_RETRIES,
     DEFAULT_MODEL,
+    DEFAULT_NOISE_REDUCTION,
+    DEFAULT_OTLP_ENDPOINT,
+    DEFAULT_PARTIAL_EVENTS,
+    DEFAULT_PROMETHEUS_METRICS,
     DEFAULT_PROMPT,
-    DEFAULT_TEMPERATURE,
+    DEFAULT_QUEUE_TIMEOUT,
     DEFAULT_REALTIME,
-    DEFAULT_NOISE_REDUCTION,
+    DEFAULT_REALTIME_FRAME_MS,
+    DEFAULT_REALTIME_PERSISTENT,
+    DEFAULT_REALTIME_POOL_SIZE,
+    DEFAULT_SEGMENT_LENGTH,
+    DEFAULT_SEGMENT_WORKERS,
+    DEFAULT_SILENCE_PADDING,
+    DEFAULT_SILENCE_THRESHOLD,
+    DEFAULT_SPECULATIVE_REQUESTS,
+    DEFAULT_STREAMING_UPLOAD,
+    DEFAULT_TEMPERATURE,
+    DEFAULT_TRIM_SILENCE,
+    DEFAULT_UPLOAD_CODEC,
+    DEFAULT_VAD_CALIBRATION,
+    DEFAULT_VAD_PREFIX_PADDING,
+    DEFAULT_VAD_SILENCE_DURATION,
+    DEFAULT_VAD_THRESHOLD,
     DOMAIN,
     MODELS,
     NOISE_REDUCTION_OPTIONS,
 )
+from .router import parse_backends
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -93,6 +156,37 @@ class OpenAISTTConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                         CONF_TEMPERATURE: DEFAULT_TEMPERATURE,
                         CONF_REALTIME: DEFAULT_REALTIME,
                         CONF_NOISE_REDUCTION: DEFAULT_NOISE_REDUCTION,
+                        CONF_STREAMING_UPLOAD: DEFAULT_STREAMING_UPLOAD,
+                        CONF_REALTIME_POOL_SIZE: DEFAULT_REALTIME_POOL_SIZE,
+                        CONF_REALTIME_PERSISTENT: DEFAULT_REALTIME_PERSISTENT,
+                        CONF_REALTIME_FRAME_MS: DEFAULT_REALTIME_FRAME_MS,
+                        CONF_PARTIAL_EVENTS: DEFAULT_PARTIAL_EVENTS,
+                        CONF_EARLY_FINALIZE: DEFAULT_EARLY_FINALIZE,
+                        CONF_VAD_THRESHOLD: DEFAULT_VAD_THRESHOLD,
+                        CONF_VAD_PREFIX_PADDING: DEFAULT_VAD_PREFIX_PADDING,
+                        CONF_VAD_SILENCE_DURATION: DEFAULT_VAD_SILENCE_DURATION,
+                        CONF_VAD_CALIBRATION: DEFAULT_VAD_CALIBRATION,
+                        CONF_TRIM_SILENCE: DEFAULT_TRIM_SILENCE,
+                        CONF_SILENCE_THRESHOLD: DEFAULT_SILENCE_THRESHOLD,
+                        CONF_SILENCE_PADDING: DEFAULT_SILENCE_PADDING,
+                        CONF_UPLOAD_CODEC: DEFAULT_UPLOAD_CODEC,
+                        CONF_MAX_RETRIES: DEFAULT_MAX_RETRIES,
+                        CONF_SPECULATIVE_REQUESTS: DEFAULT_SPECULATIVE_REQUESTS,
+                        CONF_SEGMENT_LENGTH: DEFAULT_SEGMENT_LENGTH,
+                        CONF_SEGMENT_WORKERS: DEFAULT_SEGMENT_WORKERS,
+                        CONF_MAX_IN_FLIGHT: DEFAULT_MAX_IN_FLIGHT,
+                        CONF_MAX_QUEUE: DEFAULT_MAX_QUEUE,
+                        CONF_QUEUE_TIMEOUT: DEFAULT_QUEUE_TIMEOUT,
+                        CONF_BACKENDS: DEFAULT_BACKENDS,
+                        CONF_API_KEYS: DEFAULT_API_KEYS,
+                        CONF_CACHE_SIZE: DEFAULT_CACHE_SIZE,
+                        CONF_CACHE_PERSISTENT: DEFAULT_CACHE_PERSISTENT,
+                        CONF_CACHE_TTL: DEFAULT_CACHE_TTL,
+                        CONF_HEDGE_PROTOCOL: DEFAULT_HEDGE_PROTOCOL,
+                        CONF_HEDGE_API_URL: DEFAULT_HEDGE_API_URL,
+                        CONF_HEDGE_PERCENTILE: DEFAULT_HEDGE_PERCENTILE,
+                        CONF_OTLP_ENDPOINT: DEFAULT_OTLP_ENDPOINT,
+                        CONF_PROMETHEUS_METRICS: DEFAULT_PROMETHEUS_METRICS,
                     },
                 )
 
@@ -126,7 +220,14 @@ class OpenAISTTOptionsFlow(config_entries.OptionsFlowWithConfigEntry):
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Manage the options."""
+        errors: dict[str, str] = {}
         if user_input is not None:
+            try:
+                parse_backends(user_input.get(CONF_BACKENDS, DEFAULT_BACKENDS))
+            except ValueError:
+                errors[CONF_BACKENDS] = "invalid_backends"
+
+        if user_input is not None and not errors:
             # Update the config entry title if friendly name changed
             if "friendly_name" in user_input:
                 self.hass.config_entries.async_update_entry(
@@ -138,7 +239,8 @@ class OpenAISTTOptionsFlow(config_entries.OptionsFlowWithConfigEntry):
 
             return self.async_create_entry(title="", data=user_input)
 
-        options = self.config_entry.options
+        # Keep the submitted values when the form is shown again with errors
+        options = user_input if user_input is not None else self.config_entry.options
 
         data_schema = vol.Schema(
             {
@@ -193,7 +295,161 @@ class OpenAISTTOptionsFlow(config_entries.OptionsFlowWithConfigEntry):
                         "mode": "dropdown",
                     }
                 }),
+                vol.Optional(
+                    CONF_STREAMING_UPLOAD,
+                    default=options.get(CONF_STREAMING_UPLOAD, DEFAULT_STREAMING_UPLOAD),
+                ): bool,
+                vol.Optional(
+                    CONF_REALTIME_POOL_SIZE,
+                    default=options.get(CONF_REALTIME_POOL_SIZE, DEFAULT_REALTIME_POOL_SIZE),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=5)),
+                vol.Optional(
+                    CONF_REALTIME_PERSISTENT,
+                    default=options.get(CONF_REALTIME_PERSISTENT, DEFAULT_REALTIME_PERSISTENT),
+                ): bool,
+                vol.Optional(
+                    CONF_REALTIME_FRAME_MS,
+                    default=options.get(CONF_REALTIME_FRAME_MS, DEFAULT_REALTIME_FRAME_MS),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=500)),
+                vol.Optional(
+                    CONF_PARTIAL_EVENTS,
+                    default=options.get(CONF_PARTIAL_EVENTS, DEFAULT_PARTIAL_EVENTS),
+                ): bool,
+                vol.Optional(
+                    CONF_EARLY_FINALIZE,
+                    default=options.get(CONF_EARLY_FINALIZE, DEFAULT_EARLY_FINALIZE),
+                ): bool,
+                vol.Optional(
+                    CONF_VAD_THRESHOLD,
+                    default=options.get(CONF_VAD_THRESHOLD, DEFAULT_VAD_THRESHOLD),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0.0, max=1.0)),
+                vol.Optional(
+                    CONF_VAD_PREFIX_PADDING,
+                    default=options.get(CONF_VAD_PREFIX_PADDING, DEFAULT_VAD_PREFIX_PADDING),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=2000)),
+                vol.Optional(
+                    CONF_VAD_SILENCE_DURATION,
+                    default=options.get(CONF_VAD_SILENCE_DURATION, DEFAULT_VAD_SILENCE_DURATION),
+                ): vol.All(vol.Coerce(int), vol.Range(min=200, max=3000)),
+                vol.Optional(
+                    CONF_VAD_CALIBRATION,
+                    default=options.get(CONF_VAD_CALIBRATION, DEFAULT_VAD_CALIBRATION),
+                ): bool,
+                vol.Optional(
+                    CONF_TRIM_SILENCE,
+                    default=options.get(CONF_TRIM_SILENCE, DEFAULT_TRIM_SILENCE),
+                ): bool,
+                vol.Optional(
+                    CONF_SILENCE_THRESHOLD,
+                    default=options.get(CONF_SILENCE_THRESHOLD, DEFAULT_SILENCE_THRESHOLD),
+                ): vol.All(vol.Coerce(float), vol.Range(min=-90.0, max=0.0)),
+                vol.Optional(
+                    CONF_SILENCE_PADDING,
+                    default=options.get(CONF_SILENCE_PADDING, DEFAULT_SILENCE_PADDING),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=2000)),
+                vol.Optional(
+                    CONF_UPLOAD_CODEC,
+                    default=options.get(CONF_UPLOAD_CODEC, DEFAULT_UPLOAD_CODEC),
+                ): selector({
+                    "select": {
+                        "options": [
+                            {"label": "WAV (uncompressed)", "value": "wav"},
+                            {"label": "FLAC (lossless)", "value": "flac"},
+                            {"label": "Opus (lossy)", "value": "opus"},
+                        ],
+                        "mode": "dropdown",
+                    }
+                }),
+                vol.Optional(
+                    CONF_MAX_RETRIES,
+                    default=options.get(CONF_MAX_RETRIES, DEFAULT_MAX_RETRIES),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=5)),
+                vol.Optional(
+                    CONF_SPECULATIVE_REQUESTS,
+                    default=options.get(CONF_SPECULATIVE_REQUESTS, DEFAULT_SPECULATIVE_REQUESTS),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3)),
+                vol.Optional(
+                    CONF_SEGMENT_LENGTH,
+                    default=options.get(CONF_SEGMENT_LENGTH, DEFAULT_SEGMENT_LENGTH),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=600)),
+                vol.Optional(
+                    CONF_SEGMENT_WORKERS,
+                    default=options.get(CONF_SEGMENT_WORKERS, DEFAULT_SEGMENT_WORKERS),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=8)),
+                vol.Optional(
+                    CONF_MAX_IN_FLIGHT,
+                    default=options.get(CONF_MAX_IN_FLIGHT, DEFAULT_MAX_IN_FLIGHT),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=64)),
+                vol.Optional(
+                    CONF_MAX_QUEUE,
+                    default=options.get(CONF_MAX_QUEUE, DEFAULT_MAX_QUEUE),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
+                vol.Optional(
+                    CONF_QUEUE_TIMEOUT,
+                    default=options.get(CONF_QUEUE_TIMEOUT, DEFAULT_QUEUE_TIMEOUT),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0.5, max=10)),
+                vol.Optional(
+                    CONF_BACKENDS,
+                    default=options.get(CONF_BACKENDS, DEFAULT_BACKENDS),
+                ): selector({
+                    "text": {
+                        "multiline": True,
+                    }
+                }),
+                vol.Optional(
+                    CONF_API_KEYS,
+                    default=options.get(CONF_API_KEYS, DEFAULT_API_KEYS),
+                ): selector({
+                    "text": {
+                        "multiline": True,
+                    }
+                }),
+                vol.Optional(
+                    CONF_CACHE_SIZE,
+                    default=options.get(CONF_CACHE_SIZE, DEFAULT_CACHE_SIZE),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=1000)),
+                vol.Optional(
+                    CONF_CACHE_PERSISTENT,
+                    default=options.get(CONF_CACHE_PERSISTENT, DEFAULT_CACHE_PERSISTENT),
+                ): bool,
+                vol.Optional(
+                    CONF_CACHE_TTL,
+                    default=options.get(CONF_CACHE_TTL, DEFAULT_CACHE_TTL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=720)),
+                vol.Optional(
+                    CONF_HEDGE_PROTOCOL,
+                    default=options.get(CONF_HEDGE_PROTOCOL, DEFAULT_HEDGE_PROTOCOL),
+                ): selector({
+                    "select": {
+                        "options": [
+                            {"label": "Off", "value": "off"},
+                            {"label": "Transcription API (HTTP)", "value": "http"},
+                            {"label": "Realtime API", "value": "realtime"},
+                        ],
+                        "mode": "dropdown",
+                    }
+                }),
+                vol.Optional(
+                    CONF_HEDGE_API_URL,
+                    default=options.get(CONF_HEDGE_API_URL, DEFAULT_HEDGE_API_URL),
+                ): str,
+                vol.Optional(
+                    CONF_HEDGE_PERCENTILE,
+                    default=options.get(CONF_HEDGE_PERCENTILE, DEFAULT_HEDGE_PERCENTILE),
+                ): vol.All(vol.Coerce(int), vol.Range(min=50, max=99)),
+                vol.Optional(
+                    CONF_OTLP_ENDPOINT,
+                    default=options.get(CONF_OTLP_ENDPOINT, DEFAULT_OTLP_ENDPOINT),
+                ): str,
+                vol.Optional(
+                    CONF_PROMETHEUS_METRICS,
+                    default=options.get(
+                        CONF_PROMETHEUS_METRICS, DEFAULT_PROMETHEUS_METRICS
+                    ),
+                ): bool,
             }
         )
 
-        return self.async_show_form(step_id="init", data_schema=data_schema)
+        return self.async_show_form(
+            step_id="init", data_schema=data_schema, errors=errors
+        )
@@ -2,6 +2,9 @@
 
 DOMAIN = "openai_stt"
 
+# Fired with the text so far while a realtime utterance is transcribed
+EVENT_PARTIAL_TRANSCRIPT = f"{DOMAIN}_partial_transcript"
+
 # Configuration keys
 CONF_API_URL = "api_url"
 CONF_MODEL = "model"
@@ -9,6 +12,37 @@ CONF_PROMPT = "prompt"
 CONF_TEMPERATURE = "temperature"
 CONF_REALTIME = "realtime"
 CONF_NOISE_REDUCTION = "noise_reduction"
+CONF_STREAMING_UPLOAD = "streaming_upload"
+CONF_REALTIME_POOL_SIZE = "realtime_pool_size"
+CONF_REALTIME_PERSISTENT = "realtime_persistent"
+CONF_TRIM_SILENCE = "trim_silence"
+CONF_SILENCE_THRESHOLD = "silence_threshold"
+CONF_SILENCE_PADDING = "silence_padding"
+CONF_UPLOAD_CODEC = "upload_codec"
+CONF_REALTIME_FRAME_MS = "realtime_frame_ms"
+CONF_HEDGE_PROTOCOL = "hedge_protocol"
+CONF_HEDGE_API_URL = "hedge_api_url"
+CONF_HEDGE_PERCENTILE = "hedge_percentile"
+CONF_MAX_RETRIES = "max_retries"
+CONF_BACKENDS = "backends"
+CONF_CACHE_SIZE = "cache_size"
+CONF_CACHE_PERSISTENT = "cache_persistent"
+CONF_CACHE_TTL = "cache_ttl"
+CONF_OTLP_ENDPOINT = "otlp_endpoint"
+CONF_PROMETHEUS_METRICS = "prometheus_metrics"
+CONF_MAX_IN_FLIGHT = "max_in_flight"
+CONF_MAX_QUEUE = "max_queue"
+CONF_QUEUE_TIMEOUT = "queue_timeout"
+CONF_API_KEYS = "api_keys"
+CONF_PARTIAL_EVENTS = "partial_events"
+CONF_EARLY_FINALIZE = "early_finalize"
+CONF_VAD_THRESHOLD = "vad_threshold"
+CONF_VAD_PREFIX_PADDING = "vad_prefix_padding"
+CONF_VAD_SILENCE_DURATION = "vad_silence_duration"
+CONF_VAD_CALIBRATION = "vad_calibration"
+CONF_SPECULATIVE_REQUESTS = "speculative_requests"
+CONF_SEGMENT_LENGTH = "segment_length"
+CONF_SEGMENT_WORKERS = "segment_workers"
 
 # Default values
 DEFAULT_API_URL = "https://api.openai.com/v1"
@@ -17,6 +51,37 @@ DEFAULT_PROMPT = ""
 DEFAULT_TEMPERATURE = 0.0
 DEFAULT_REALTIME = False
 DEFAULT_NOISE_REDUCTION = "none"
+DEFAULT_STREAMING_UPLOAD = False
+DEFAULT_REALTIME_POOL_SIZE = 0
+DEFAULT_REALTIME_PERSISTENT = False
+DEFAULT_TRIM_SILENCE = False
+DEFAULT_SILENCE_THRESHOLD = -45.0
+DEFAULT_SILENCE_PADDING = 300
+DEFAULT_UPLOAD_CODEC = "wav"
+DEFAULT_REALTIME_FRAME_MS = 100
+DEFAULT_HEDGE_PROTOCOL = "off"
+DEFAULT_HEDGE_API_URL = ""
+DEFAULT_HEDGE_PERCENTILE = 95
+DEFAULT_MAX_RETRIES = 2
+DEFAULT_BACKENDS = ""
+DEFAULT_CACHE_SIZE = 0
+DEFAULT_CACHE_PERSISTENT = False
+DEFAULT_CACHE_TTL = 24
+DEFAULT_OTLP_ENDPOINT = ""
+DEFAULT_PROMETHEUS_METRICS = False
+DEFAULT_MAX_IN_FLIGHT = 0
+DEFAULT_MAX_QUEUE = 8
+DEFAULT_QUEUE_TIMEOUT = 3.0
+DEFAULT_API_KEYS = ""
+DEFAULT_PARTIAL_EVENTS = False
+DEFAULT_EARLY_FINALIZE = False
+DEFAULT_VAD_THRESHOLD = 0.5
+DEFAULT_VAD_PREFIX_PADDING = 300
+DEFAULT_VAD_SILENCE_DURATION = 500
+DEFAULT_VAD_CALIBRATION = False
+DEFAULT_SPECULATIVE_REQUESTS = 0
+DEFAULT_SEGMENT_LENGTH = 0
+DEFAULT_SEGMENT_WORKERS = 3
 
 # Available models
 MODELS = [
@@ -25,6 +90,20 @@ MODELS = [
     "whisper-1",
 ]
 
+# Upload codec options
+UPLOAD_CODECS = [
+    "wav",
+    "flac",
+    "opus",
+]
+
+# Hedge request options
+HEDGE_PROTOCOLS = [
+    "off",
+    "http",
+    "realtime",
+]
+
 # Noise reduction options
 NOISE_REDUCTION_OPTIONS = [
     "none",
@@ -0,0 +1,58 @@
+"""Diagnostics support for OpenAI STT."""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_API_KEY
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_API_KEYS, DOMAIN
+from .transport import OpenAISTTTransport
+
+TO_REDACT = {CONF_API_KEY, CONF_API_KEYS}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    transport: OpenAISTTTransport = hass.data[DOMAIN][entry.entry_id]
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": async_redact_data(entry.options, TO_REDACT),
+        },
+        "timings": transport.timing_stats.as_dict(),
+        "retries": asdict(transport.retry_stats),
+        "speculation": asdict(transport.speculation_stats)
+        | {"hit_rate": transport.speculation_stats.hit_rate},
+        "rate_limits": transport.rate_limiter.as_dict(),
+        "early_finalize": asdict(transport.early_finalize),
+        "turn_detection": (
+            transport.turn_calibrator.as_dict()
+            if transport.turn_calibrator is not None
+            else asdict(transport.options.turn_detection)
+        ),
+        "hedging": (
+            asdict(transport.hedger.stats) if transport.hedger is not None else None
+        ),
+        "admission": (
+            asdict(transport.admission.stats)
+            | {
+                "in_flight": transport.admission.in_flight,
+                "queued": transport.admission.queued,
+            }
+            if transport.admission is not None
+            else None
+        ),
+        "cache": asdict(transport.cache.stats) if transport.cache is not None else None,
+        "backends": (
+            [asdict(backend) for backend in transport.router.backends]
+            if transport.router is not None
+            else None
+        ),
+    }
@@ -0,0 +1,162 @@
+"""Compressed audio encoding and decoding for OpenAI STT."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterable, AsyncIterator, Iterator
+from dataclasses import dataclass
+import io
+import logging
+from typing import Final
+
+import numpy as np
+
+_LOGGER = logging.getLogger(__name__)
+
+# Bit rate used for Opus uploads; plenty for transcription of speech
+OPUS_BIT_RATE: Final = 24000
+
+
+@dataclass(frozen=True)
+class UploadFormat:
+    """Container, encoder and request metadata for an upload codec."""
+
+    container: str
+    encoder: str
+    filename: str
+    content_type: str
+
+
+UPLOAD_FORMATS: Final = {
+    "flac": UploadFormat("flac", "flac", "whisper_audio.flac", "audio/flac"),
+    "opus": UploadFormat("ogg", "libopus", "whisper_audio.ogg", "audio/ogg"),
+}
+
+
+def encode_pcm(
+    pcm: memoryview, codec: str, sample_rate: int, channels: int
+) -> bytes | None:
+    """Encode PCM16 audio for upload.
+
+    This is CPU bound and must run in an executor. Returns None when PyAV
+    is not available, in which case the caller should upload WAV instead.
+    """
+    try:
+        import av  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        _LOGGER.warning(
+            "PyAV is not installed, uploading uncompressed WAV instead of %s", codec
+        )
+        return None
+
+    upload_format = UPLOAD_FORMATS[codec]
+    sample_rate = int(sample_rate)
+    layout = "mono" if channels == 1 else "stereo"
+    samples = np.frombuffer(pcm, dtype=np.int16).reshape(1, -1)
+
+    output = io.BytesIO()
+    with av.open(output, mode="w", format=upload_format.container) as container:
+        stream = container.add_stream(upload_format.encoder, rate=sample_rate)
+        stream.layout = layout
+        if codec == "opus":
+            stream.bit_rate = OPUS_BIT_RATE
+
+        frame = av.AudioFrame.from_ndarray(samples, format="s16", layout=layout)
+        frame.sample_rate = sample_rate
+        for packet in stream.encode(frame):
+            container.mux(packet)
+        for packet in stream.encode(None):
+            container.mux(packet)
+
+    return output.getvalue()
+
+
+class OggOpusDecoder:
+    """Incremental Ogg/Opus to PCM16 decoder.
+
+    Ogg pages are parsed here so that packets can be decoded as soon as
+    they arrive, without the probing delay of opening a container on a
+    live stream. Decoding and resampling is CPU bound; call decode() and
+    flush() from an executor.
+    """
+
+    def __init__(self, sample_rate: int) -> None:
+        """Initialize the decoder; raises ImportError without PyAV."""
+        import av  # pylint: disable=import-outside-toplevel
+
+        self._av = av
+        self._codec = None
+        self._resampler = av.AudioResampler(
+            format="s16", layout="mono", rate=int(sample_rate)
+        )
+        self._buffer = bytearray()
+        self._packet = bytearray()
+
+    def _packets(self) -> Iterator[bytes]:
+        """Yield the complete packets in the buffered Ogg pages."""
+        buffer = self._buffer
+        while len(buffer) >= 27:
+            if buffer[:4] != b"OggS":
+                # Resynchronize on the next page
+                start = buffer.find(b"OggS", 1)
+                del buffer[: start if start > 0 else len(buffer) - 3]
+                continue
+            header_size = 27 + buffer[26]
+            if len(buffer) < header_size:
+                break
+            lacing = buffer[27:header_size]
+            if len(buffer) < header_size + sum(lacing):
+                break
+
+            position = header_size
+            for size in lacing:
+                self._packet += buffer[position : position + size]
+                position += size
+                if size < 255:
+                    yield bytes(self._packet)
+                    self._packet.clear()
+            del buffer[:position]
+
+    def _resample(self, frame) -> bytes:
+        """Convert a decoded frame (or None to flush) to PCM16."""
+        return b"".join(
+            resampled.to_ndarray().tobytes()
+            for resampled in self._resampler.resample(frame)
+        )
+
+    def decode(self, chunk: bytes) -> bytes:
+        """Consume a chunk of the Ogg stream and return the decoded PCM."""
+        self._buffer += chunk
+        pcm = bytearray()
+        for packet in self._packets():
+            if packet.startswith(b"OpusHead"):
+                self._codec = self._av.CodecContext.create("opus", "r")
+                self._codec.extradata = packet
+                continue
+            if self._codec is None or packet.startswith(b"OpusTags"):
+                continue
+            for frame in self._codec.decode(self._av.Packet(packet)):
+                pcm += self._resample(frame)
+        return bytes(pcm)
+
+    def flush(self) -> bytes:
+        """Return any PCM still buffered in the resampler."""
+        return self._resample(None)
+
+
+async def async_decode_ogg_opus(
+    stream: AsyncIterable[bytes], sample_rate: int
+) -> AsyncIterator[bytes]:
+    """Decode an Ogg/Opus stream to mono PCM16 in a worker thread."""
+    loop = asyncio.get_running_loop()
+    try:
+        decoder = await loop.run_in_executor(None, OggOpusDecoder, sample_rate)
+    except ImportError:
+        _LOGGER.error("PyAV is required to stream Opus audio to the Realtime API")
+        raise
+
+    async for chunk in stream:
+        if pcm := await loop.run_in_executor(None, decoder.decode, chunk):
+            yield pcm
+    if pcm := await loop.run_in_executor(None, decoder.flush):
+        yield pcm
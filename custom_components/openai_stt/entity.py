@@ -0,0 +1,18 @@
+"""Shared entity helpers for OpenAI STT."""
+
+from __future__ import annotations
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
+
+from .const import DOMAIN
+
+
+def device_info(config_entry: ConfigEntry) -> DeviceInfo:
+    """Return the service device the entities of a config entry belong to."""
+    return DeviceInfo(
+        identifiers={(DOMAIN, config_entry.entry_id)},
+        name=config_entry.title,
+        manufacturer="OpenAI",
+        entry_type=DeviceEntryType.SERVICE,
+    )
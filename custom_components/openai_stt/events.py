@@ -0,0 +1,51 @@
+"""Realtime API server event decoding for OpenAI STT."""
+
+from __future__ import annotations
+
+from collections.abc import Container
+import re
+from typing import Any, Final
+
+from homeassistant.util.json import json_loads
+
+# Server event types acted upon
+SESSION_UPDATED: Final = "transcription_session.updated"
+SPEECH_STOPPED: Final = "input_audio_buffer.speech_stopped"
+BUFFER_COMMITTED: Final = "input_audio_buffer.committed"
+TRANSCRIPTION_DELTA: Final = "conversation.item.input_audio_transcription.delta"
+TRANSCRIPTION_COMPLETED: Final = (
+    "conversation.item.input_audio_transcription.completed"
+)
+TRANSCRIPTION_FAILED: Final = "conversation.item.input_audio_transcription.failed"
+ERROR: Final = "error"
+
+# The event type when it is the first key of the event, as the server
+# currently writes it; a "type" key further in may belong to a nested object
+_TYPE_PATTERN: Final = re.compile(r'^\s*\{\s*"type"\s*:\s*"([^"\\]*)"')
+
+
+def event_type(raw: str) -> str | None:
+    """Return the type of a raw server event without parsing it.
+
+    Returns None when the type is not the first key, as the key order
+    is not guaranteed.
+    """
+    if match := _TYPE_PATTERN.match(raw):
+        return match[1]
+    return None
+
+
+def decode_event(raw: str, wanted: Container[str]) -> dict[str, Any] | None:
+    """Parse a raw server event if its type is wanted, else return None.
+
+    High-rate events such as transcription deltas are classified from the
+    raw text and skipped without being decoded. Events whose type is not
+    the first key are decoded in full to find it.
+    """
+    msg_type = event_type(raw)
+    if msg_type is not None and msg_type not in wanted:
+        return None
+    data = json_loads(raw)
+    if not isinstance(data, dict) or data.get("type") not in wanted:
+        return None
+    return data
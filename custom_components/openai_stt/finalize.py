@@ -0,0 +1,155 @@
+"""Early finalization of realtime utterances for OpenAI STT."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterable, AsyncIterator
+from dataclasses import dataclass
+import logging
+import time
+from typing import Final
+
+from aiohttp import ClientError
+
+from .telemetry import current_span
+
+_LOGGER = logging.getLogger(__name__)
+
+# Longest time the rest of a cut stream is followed to find where Home
+# Assistant ended the utterance (in seconds). Home Assistant does not
+# report the end of its stream other than by ending it, so it is drained
+# for this long; its voice activity detection ends a stream after at most
+# 1.25 seconds of silence, which this leaves room for.
+LEAD_TIMEOUT: Final = 3.0
+
+
+@dataclass
+class EarlyFinalizeStats:
+    """How often and how far utterances finished ahead of Home Assistant."""
+
+    utterances: int = 0
+    # Utterances cut short at the server's end of speech
+    early: int = 0
+    # Early utterances transcribed before Home Assistant ended the stream
+    ahead: int = 0
+    lead_total: float = 0.0
+    lead_max: float = 0.0
+    lead_last: float | None = None
+    # Early utterances whose stream did not end within LEAD_TIMEOUT
+    unmeasured: int = 0
+
+    def record_lead(self, lead: float) -> None:
+        """Record the time from the transcript to the end of the stream."""
+        self.lead_last = lead
+        if lead > 0:
+            self.ahead += 1
+            self.lead_total += lead
+            self.lead_max = max(self.lead_max, lead)
+
+
+class EarlyFinalizer:
+    """Cut the audio stream of an utterance at the server's end of speech.
+
+    The stream passes through async_gate() until stop() is called, after
+    which the gate ends without waiting for the next chunk, so the audio
+    after the end of speech is neither awaited nor uploaded. The chunk
+    still being waited for is kept, so that async_measure() can follow
+    the rest of the stream to when Home Assistant would have ended it.
+    """
+
+    def __init__(self, stats: EarlyFinalizeStats) -> None:
+        """Initialize the finalizer."""
+        self._stats = stats
+        self._stopped: asyncio.Future[None] = (
+            asyncio.get_running_loop().create_future()
+        )
+        self._iterator: AsyncIterator[bytes] | None = None
+        # Chunk requested from the stream when the gate was stopped
+        self._pending: asyncio.Future[bytes] | None = None
+        self._cut = False
+        self.stopped_at: float | None = None
+
+    @property
+    def stopped(self) -> bool:
+        """Return True once the end of speech was signalled."""
+        return self._stopped.done()
+
+    @property
+    def early(self) -> bool:
+        """Return True if the stream was cut before it ended."""
+        return self._cut
+
+    def stop(self) -> None:
+        """End the stream at the server's end of speech."""
+        if self._stopped.done():
+            return
+        _LOGGER.debug("Server detected the end of speech, finalizing early")
+        self._stopped.set_result(None)
+        self.stopped_at = time.perf_counter()
+        if (span := current_span()) is not None:
+            span.set_attribute("early_finalize", True)
+
+    async def async_gate(self, stream: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+        """Yield the chunks of stream until stopped."""
+        iterator = self._iterator = aiter(stream)
+        pending: asyncio.Future[bytes] | None = None
+        try:
+            while True:
+                if self._stopped.done():
+                    self._cut = True
+                    return
+                pending = asyncio.ensure_future(anext(iterator))
+                await asyncio.wait(
+                    (pending, self._stopped), return_when=asyncio.FIRST_COMPLETED
+                )
+                if not pending.done():
+                    self._pending = pending
+                    self._cut = True
+                    return
+                try:
+                    chunk = pending.result()
+                except StopAsyncIteration:
+                    return
+                pending = None
+                yield chunk
+        finally:
+            if pending is not None and pending is not self._pending:
+                pending.cancel()
+
+    def finish(self) -> None:
+        """Count the utterance once its transcript is in."""
+        self._stats.utterances += 1
+        if self.early:
+            self._stats.early += 1
+
+    async def async_measure(self, finished: float) -> None:
+        """Record how long before the end of the stream the transcript came.
+
+        Drains the rest of a cut stream, for up to LEAD_TIMEOUT, without
+        using it.
+        """
+        if not self._cut or self._iterator is None:
+            return
+        try:
+            async with asyncio.timeout(LEAD_TIMEOUT):
+                try:
+                    if self._pending is not None:
+                        await self._pending
+                    async for _chunk in self._iterator:
+                        pass
+                except StopAsyncIteration:
+                    pass
+        except TimeoutError:
+            self._stats.unmeasured += 1
+            return
+        except (ClientError, OSError) as err:
+            # The audio came from a client connection that went away
+            _LOGGER.debug("Could not follow the rest of the stream: %s", err)
+            self._stats.unmeasured += 1
+            return
+        finally:
+            if self._pending is not None:
+                self._pending.cancel()
+        lead = time.perf_counter() - finished
+        _LOGGER.debug("Transcript finished %.2f seconds ahead of the stream", lead)
+        self._stats.record_lead(lead)
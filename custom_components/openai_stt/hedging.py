@@ -0,0 +1,218 @@
+"""Hedged transcription requests for OpenAI STT."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterable, AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass
+import logging
+from typing import Final
+
+from homeassistant.components.stt import (
+    SpeechMetadata,
+    SpeechResult,
+    SpeechResultState,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Hedge delay used until enough latencies have been observed (in seconds)
+HEDGE_INITIAL_DELAY: Final = 3.0
+
+# Number of recent primary latencies the hedge delay is derived from
+HEDGE_WINDOW: Final = 100
+
+# Latencies needed before the percentile replaces the initial delay
+HEDGE_MIN_SAMPLES: Final = 10
+
+Transcriber = Callable[
+    [SpeechMetadata, AsyncIterable[bytes]], Awaitable[SpeechResult]
+]
+
+
+class AudioTee:
+    """Buffer an audio stream so that it can be read more than once.
+
+    The source is consumed by a background task; every branch replays the
+    audio received so far and then follows the live stream.
+    """
+
+    def __init__(self, stream: AsyncIterable[bytes]) -> None:
+        """Initialize the tee."""
+        self._stream = stream
+        self._chunks: list[bytes] = []
+        loop = asyncio.get_running_loop()
+        self._changed: asyncio.Future[None] = loop.create_future()
+        self.finished: asyncio.Future[None] = loop.create_future()
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Start consuming the source stream."""
+        self._task = asyncio.create_task(self._pump())
+
+    async def async_close(self) -> None:
+        """Stop consuming the source stream."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    def _notify(self) -> None:
+        """Wake up the branches waiting for audio."""
+        self._changed.set_result(None)
+        self._changed = asyncio.get_running_loop().create_future()
+
+    async def _pump(self) -> None:
+        """Read the source stream into the buffer."""
+        try:
+            async for chunk in self._stream:
+                self._chunks.append(chunk)
+                self._notify()
+        except Exception:
+            _LOGGER.exception("Error reading audio stream")
+        finally:
+            self.finished.set_result(None)
+            self._notify()
+
+    async def branch(self) -> AsyncIterator[bytes]:
+        """Yield the whole stream, starting from the first chunk."""
+        index = 0
+        while True:
+            while index < len(self._chunks):
+                yield self._chunks[index]
+                index += 1
+            if self.finished.done():
+                return
+            await asyncio.shield(self._changed)
+
+
+@dataclass
+class HedgeStats:
+    """Outcome counters for hedged transcriptions."""
+
+    requests: int = 0
+    hedged: int = 0
+    primary_wins: int = 0
+    hedge_wins: int = 0
+    failures: int = 0
+
+    @property
+    def hedge_rate(self) -> float:
+        """Return the fraction of requests that sent a hedge."""
+        return self.hedged / self.requests if self.requests else 0.0
+
+    @property
+    def hedge_win_rate(self) -> float:
+        """Return the fraction of hedges that answered first."""
+        return self.hedge_wins / self.hedged if self.hedged else 0.0
+
+
+class HedgedTranscriber:
+    """Send a second request when the primary one is slow.
+
+    The primary request streams the audio as usual. Once the audio has
+    ended, it gets as long as the configured percentile of its recent
+    latencies to answer; after that, or as soon as it fails, the buffered
+    audio is sent through the hedge as well. The first successful result
+    wins and the other request is cancelled. A primary cancelled this way
+    adds the time it had taken as its latency, a lower bound of the time
+    it would have needed.
+    """
+
+    def __init__(self, percentile: int) -> None:
+        """Initialize the transcriber."""
+        self.percentile = percentile
+        self._latencies: deque[float] = deque(maxlen=HEDGE_WINDOW)
+        self.stats = HedgeStats()
+
+    def delay(self) -> float:
+        """Return how long to wait for the primary after the audio ended."""
+        if len(self._latencies) < HEDGE_MIN_SAMPLES:
+            return HEDGE_INITIAL_DELAY
+        latencies = sorted(self._latencies)
+        index = min(len(latencies) * self.percentile // 100, len(latencies) - 1)
+        return latencies[index]
+
+    async def async_transcribe(
+        self,
+        metadata: SpeechMetadata,
+        stream: AsyncIterable[bytes],
+        primary: Transcriber,
+        hedge: Transcriber,
+    ) -> SpeechResult:
+        """Transcribe with the primary, hedging with the second transcriber."""
+        loop = asyncio.get_running_loop()
+        tee = AudioTee(stream)
+        tee.start()
+        self.stats.requests += 1
+
+        primary_task = asyncio.create_task(primary(metadata, tee.branch()))
+        hedge_task: asyncio.Task[SpeechResult] | None = None
+        try:
+            await asyncio.wait(
+                (primary_task, tee.finished), return_when=asyncio.FIRST_COMPLETED
+            )
+            audio_end = loop.time()
+            if not primary_task.done():
+                await asyncio.wait((primary_task,), timeout=self.delay())
+            if primary_task.done():
+                result = self._result(primary_task)
+                if result.result == SpeechResultState.SUCCESS:
+                    self._latencies.append(loop.time() - audio_end)
+                    self.stats.primary_wins += 1
+                    return result
+
+            _LOGGER.debug(
+                "Primary transcription %s, sending hedge request",
+                "failed" if primary_task.done() else "is slow",
+            )
+            self.stats.hedged += 1
+            hedge_task = asyncio.create_task(hedge(metadata, tee.branch()))
+
+            result = SpeechResult("", SpeechResultState.ERROR)
+            pending = {hedge_task}
+            if not primary_task.done():
+                pending.add(primary_task)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    result = self._result(task)
+                    if result.result != SpeechResultState.SUCCESS:
+                        continue
+                    if task is hedge_task:
+                        self.stats.hedge_wins += 1
+                        if not primary_task.done():
+                            # The primary is cancelled, but took at least
+                            # this long; dropping it would bias the delay low
+                            self._latencies.append(loop.time() - audio_end)
+                    else:
+                        self._latencies.append(loop.time() - audio_end)
+                        self.stats.primary_wins += 1
+                    _LOGGER.debug(
+                        "%s request won (hedge rate %.2f, hedge win rate %.2f)",
+                        "Hedge" if task is hedge_task else "Primary",
+                        self.stats.hedge_rate,
+                        self.stats.hedge_win_rate,
+                    )
+                    return result
+
+            self.stats.failures += 1
+            return result
+        finally:
+            for task in (primary_task, hedge_task):
+                if task is not None and not task.done():
+                    task.cancel()
+                    await asyncio.gather(task, return_exceptions=True)
+            await tee.async_close()
+
+    @staticmethod
+    def _result(task: asyncio.Task[SpeechResult]) -> SpeechResult:
+        """Return the result of a finished request task."""
+        if task.cancelled():
+            return SpeechResult("", SpeechResultState.ERROR)
+        if (err := task.exception()) is not None:
+            _LOGGER.error("Transcription request failed: %s", err)
+            return SpeechResult("", SpeechResultState.ERROR)
+        return task.result()
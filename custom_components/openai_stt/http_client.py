@@ -2,18 +2,61 @@
 
 from __future__ import annotations
 
-from collections.abc import AsyncIterable
-import io
+import asyncio
+from collections.abc import AsyncIterable, AsyncIterator, Callable
+from dataclasses import replace
+from http import HTTPStatus
 import logging
 import time
-import wave
+from typing import Final
 
-from aiohttp import ClientError, ClientResponseError, FormData
+from aiohttp import ClientError, ClientResponseError, ClientTimeout, FormData
 
-from homeassistant.components.stt import SpeechMetadata, SpeechResult, SpeechResultState
+from homeassistant.components.stt import (
+    AudioChannels,
+    AudioCodecs,
+    AudioSampleRates,
+    SpeechMetadata,
+    SpeechResult,
+    SpeechResultState,
+)
+
+from .audio import WAV_UNKNOWN_SIZE, AudioBuffer, build_wav_header
+from .const import (
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_SEGMENT_WORKERS,
+    DEFAULT_SILENCE_THRESHOLD,
+)
+from .encoding import UPLOAD_FORMATS, encode_pcm
+from .ratelimit import RateLimiter
+from .resample import StreamingResampler
+from .retry import RetryPolicy, RetryStats, is_retryable
+from .segmenting import SEGMENT_OVERLAP_MS, find_cuts, segment_ranges, stitch
+from .speculation import PauseDetector, SpeculationStats
+from .telemetry import NOOP_TELEMETRY, Telemetry
+from .timing import StageTimings, TimingStats
+from .vad import SilenceTrimConfig, SilenceTrimmer
 
 _LOGGER = logging.getLogger(__name__)
 
+# Maximum time to wait for a response after the audio is complete (in seconds)
+REQUEST_TIMEOUT: Final = 10
+
+# Response header with the server's processing time in milliseconds
+PROCESSING_MS_HEADER: Final = "openai-processing-ms"
+
+# The request deadline is enforced with asyncio.timeout so that a streaming
+# upload is not cut off while the user is still speaking
+_NO_CLIENT_TIMEOUT: Final = ClientTimeout(total=None, sock_connect=REQUEST_TIMEOUT)
+
+WAV_FILENAME: Final = "whisper_audio.wav"
+WAV_CONTENT_TYPE: Final = "audio/wav"
+OGG_FILENAME: Final = "whisper_audio.ogg"
+OGG_CONTENT_TYPE: Final = "audio/ogg"
+
+# PCM is uploaded as 16 kHz mono, the rate the transcription models use
+HTTP_SAMPLE_RATE: Final = AudioSampleRates.SAMPLERATE_16000
+
 
 def _convert_language_code(language: str) -> str:
     """Convert BCP 47 language code to ISO 639-1 code for OpenAI API.
@@ -37,6 +80,18 @@ class OpenAIHTTPClient:
         model: str,
         prompt: str,
         temperature: float,
+        streaming_upload: bool = False,
+        silence_trim: SilenceTrimConfig | None = None,
+        upload_codec: str = "wav",
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        retry_stats: RetryStats | None = None,
+        timing_stats: TimingStats | None = None,
+        telemetry: Telemetry = NOOP_TELEMETRY,
+        rate_limiter: RateLimiter | None = None,
+        speculative_requests: int = 0,
+        speculation_stats: SpeculationStats | None = None,
+        segment_length: int = 0,
+        segment_workers: int = DEFAULT_SEGMENT_WORKERS,
     ) -> None:
         """Initialize the HTTP client."""
         self.client = client
@@ -45,45 +100,305 @@ class OpenAIHTTPClient:
         self.model = model
         self.prompt = prompt
         self.temperature = temperature
+        self.streaming_upload = streaming_upload
+        self.silence_trim = silence_trim
+        self.upload_codec = upload_codec
+        self.retry_policy = RetryPolicy(max_retries)
+        self.retry_stats = retry_stats if retry_stats is not None else RetryStats()
+        self.headers = {"Authorization": f"Bearer {api_key}"}
+        self.rate_limiter = rate_limiter
+        # Request headers by API key, when keys are rotated
+        self._key_headers: dict[str, dict[str, str]] = {}
+        self.timing_stats = timing_stats
+        self.telemetry = telemetry
+        self._labels = {"backend": api_url, "model": model, "protocol": "http"}
+        # Speculative requests per utterance at pauses in speech
+        self.speculative_requests = speculative_requests
+        self.speculation_stats = (
+            speculation_stats if speculation_stats is not None else SpeculationStats()
+        )
+        # Longer PCM recordings are split into segments of this many
+        # seconds, transcribed by up to segment_workers requests at once
+        self.segment_length = segment_length
+        self.segment_workers = segment_workers
 
-    async def _collect_audio_data(self, stream: AsyncIterable[bytes]) -> bytes:
+    async def _collect_audio_data(self, stream: AsyncIterable[bytes]) -> AudioBuffer:
         """Collect all audio data from the stream."""
-        audio_data = b""
+        audio_data = AudioBuffer()
         async for chunk in stream:
-            audio_data += chunk
+            audio_data.append(chunk)
         _LOGGER.debug("Audio data size: %d bytes", len(audio_data))
         return audio_data
 
-    def _convert_to_wav(self, metadata: SpeechMetadata, audio_data: bytes) -> bytes:
-        """Convert raw audio data to WAV format."""
-        wav_stream = io.BytesIO()
-        with wave.open(wav_stream, "wb") as wf:
-            wf.setnchannels(metadata.channel)
-            wf.setsampwidth(metadata.bit_rate // 8)
-            wf.setframerate(metadata.sample_rate)
-            wf.writeframes(audio_data)
-        return wav_stream.getvalue()
+    async def _collect_speculating(
+        self,
+        metadata: SpeechMetadata,
+        stream: AsyncIterable[bytes],
+        detector: PauseDetector,
+    ) -> tuple[AudioBuffer, SpeechResult | None]:
+        """Collect the audio, transcribing what arrived so far at pauses.
+
+        Returns the audio and, if the speculative request at the last
+        pause succeeded and no speech followed, its transcript.
+        """
+        stats = self.speculation_stats
+        stats.utterances += 1
+        bytes_per_second = metadata.sample_rate * metadata.channel * 2
+        audio_data = AudioBuffer()
+        speculation: asyncio.Task[SpeechResult | None] | None = None
+        # Segment and seconds of audio of the latest speculative request
+        segment = 0
+        seconds = 0.0
+        requests = 0
+
+        def speculate() -> None:
+            """Start transcribing the audio received before the pause."""
+            nonlocal speculation, segment, seconds, requests
+            if speculation is not None or requests >= self.speculative_requests:
+                return
+            snapshot = AudioBuffer()
+            snapshot.append(audio_data.data)
+            segment = detector.segment
+            seconds = len(snapshot) / bytes_per_second
+            requests += 1
+            stats.requests += 1
+            stats.audio_sent += seconds
+            speculation = asyncio.create_task(
+                self._async_speculate(metadata, snapshot)
+            )
+
+        # Called from within the stream, as silence trimming downstream
+        # holds the pause back
+        detector.on_pause = speculate
+        try:
+            async for chunk in stream:
+                audio_data.append(chunk)
+                if speculation is not None and detector.segment != segment:
+                    _LOGGER.debug("Speech resumed, discarding speculative request")
+                    speculation.cancel()
+                    speculation = None
+                    stats.discarded += 1
+                    stats.audio_wasted += seconds
+            _LOGGER.debug("Audio data size: %d bytes", len(audio_data))
+
+            if speculation is None:
+                return audio_data, None
+            if (result := await speculation) is not None:
+                _LOGGER.debug("Using the speculative transcript")
+                stats.hits += 1
+                return audio_data, result
+            stats.failed += 1
+            stats.audio_wasted += seconds
+            return audio_data, None
+        finally:
+            if speculation is not None and not speculation.done():
+                speculation.cancel()
+
+    async def _async_speculate(
+        self, metadata: SpeechMetadata, audio_data: AudioBuffer
+    ) -> SpeechResult | None:
+        """Transcribe the audio up to a pause; return None on failure."""
+        url = f"{self.api_url}/audio/transcriptions"
+        try:
+            with self.telemetry.span("speculate", bytes=len(audio_data)):
+                async with asyncio.timeout(REQUEST_TIMEOUT):
+                    audio, filename, content_type = await self._encode_audio(
+                        metadata, audio_data
+                    )
+                    headers, form = self._prepare_request_data(
+                        metadata.language, audio, filename, content_type
+                    )
+                    api_key = None
+                    if self.rate_limiter is not None:
+                        api_key = await self.rate_limiter.async_acquire()
+                        headers = self._headers_for_key(api_key)
+                    self.telemetry.count("bytes_sent_total", len(audio), self._labels)
+                    result = await self._post(
+                        url, headers, form, StageTimings(), api_key
+                    )
+        except (ClientError, TimeoutError) as err:
+            _LOGGER.debug("Speculative transcription failed: %s", err)
+            return None
+        if not (text := result.get("text", "").strip()):
+            return None
+        return SpeechResult(text, SpeechResultState.SUCCESS)
+
+    async def _async_transcribe_segments(
+        self, metadata: SpeechMetadata, audio_data: AudioBuffer, timings: StageTimings
+    ) -> SpeechResult:
+        """Transcribe long PCM audio in overlapping segments.
+
+        The audio is cut at quiet points, the segments are transcribed
+        concurrently, each with its own deadline and retries, and the
+        transcripts are joined without the words the overlaps repeat.
+        The stages of the segment that finished last, which the transcript
+        waited for, go into timings.
+        """
+        pcm = audio_data.data
+        bytes_per_ms = metadata.sample_rate * metadata.channel * 2 // 1000
+        cuts = find_cuts(
+            pcm, metadata.sample_rate, metadata.channel, self.segment_length * 1000
+        )
+        ranges = segment_ranges(
+            len(pcm), cuts, SEGMENT_OVERLAP_MS * bytes_per_ms, metadata.channel * 2
+        )
+        _LOGGER.debug(
+            "Transcribing %d bytes of audio in %d segments", len(pcm), len(ranges)
+        )
+        url = f"{self.api_url}/audio/transcriptions"
+        workers = asyncio.Semaphore(self.segment_workers)
+
+        last: StageTimings | None = None
+
+        async def transcribe(start: int, end: int) -> SpeechResult:
+            """Transcribe one segment."""
+            nonlocal last
+            async with workers:
+                segment = AudioBuffer()
+                segment.append(pcm[start:end])
+                segment_timings = StageTimings()
+                encode_start = time.perf_counter()
+                audio, filename, content_type = await self._encode_audio(
+                    metadata, segment
+                )
+                segment_timings.encode = time.perf_counter() - encode_start
+
+                def form() -> FormData:
+                    """Return a form around the segment."""
+                    self.telemetry.count("bytes_sent_total", len(audio), self._labels)
+                    return self._prepare_request_data(
+                        metadata.language, audio, filename, content_type
+                    )[1]
+
+                result = await self._send_request(
+                    url,
+                    self.headers,
+                    form(),
+                    rebuild_form=form,
+                    timings=segment_timings,
+                )
+                last = segment_timings
+                return result
+
+        with self.telemetry.span("segments", count=len(ranges)) as span:
+            results = await asyncio.gather(
+                *(transcribe(start, end) for start, end in ranges)
+            )
+            if last is not None:
+                timings.encode = last.encode
+                timings.upload = last.upload
+                timings.first_byte = last.first_byte
+                timings.server = last.server
+                timings.parse = last.parse
+            if any(result.result != SpeechResultState.SUCCESS for result in results):
+                _LOGGER.error("Transcription of a segment failed")
+                if span is not None:
+                    span.error = "Segment failed"
+                return SpeechResult("", SpeechResultState.ERROR)
+        text = stitch([result.text for result in results])
+        _LOGGER.debug("Stitched transcription result: %s", text)
+        return SpeechResult(text, SpeechResultState.SUCCESS)
+
+    def _convert_to_wav(
+        self, metadata: SpeechMetadata, audio_data: AudioBuffer
+    ) -> memoryview:
+        """Convert raw audio data to WAV format without copying the PCM."""
+        return audio_data.as_wav(
+            metadata.sample_rate, metadata.channel, metadata.bit_rate // 8
+        )
+
+    async def _encode_audio(
+        self, metadata: SpeechMetadata, audio_data: AudioBuffer
+    ) -> tuple[bytes | memoryview, str, str]:
+        """Encode the collected audio with the configured upload codec.
+
+        Returns the file data, filename and content type. Opus input is
+        uploaded as received. PCM falls back to WAV when the codec is WAV
+        or the encoder is unavailable.
+        """
+        if metadata.codec == AudioCodecs.OPUS:
+            return audio_data.data, OGG_FILENAME, OGG_CONTENT_TYPE
+
+        if (upload_format := UPLOAD_FORMATS.get(self.upload_codec)) is not None:
+            start_time = time.perf_counter()
+            try:
+                encoded = await asyncio.get_running_loop().run_in_executor(
+                    None,
+                    encode_pcm,
+                    audio_data.data,
+                    self.upload_codec,
+                    metadata.sample_rate,
+                    metadata.channel,
+                )
+            except Exception:
+                _LOGGER.exception("Error encoding audio as %s", self.upload_codec)
+                encoded = None
+            if encoded is not None:
+                _LOGGER.debug(
+                    "Encoded %d bytes of audio as %s (%d bytes) in %.3f seconds",
+                    len(audio_data),
+                    self.upload_codec,
+                    len(encoded),
+                    time.perf_counter() - start_time,
+                )
+                return encoded, upload_format.filename, upload_format.content_type
+
+        return (
+            self._convert_to_wav(metadata, audio_data),
+            WAV_FILENAME,
+            WAV_CONTENT_TYPE,
+        )
+
+    async def _stream_audio(
+        self,
+        metadata: SpeechMetadata,
+        stream: AsyncIterable[bytes],
+        request_timeout: asyncio.Timeout,
+        audio_data: AudioBuffer,
+    ) -> AsyncIterator[bytes]:
+        """Yield the upload file while the audio is still arriving.
+
+        PCM is wrapped in a WAV header with the streaming size marker; Opus
+        is passed through as received. The audio is also kept in audio_data
+        for retries. The request deadline only starts once the last chunk
+        has been handed to the transport.
+        """
+        if metadata.codec == AudioCodecs.PCM:
+            yield build_wav_header(
+                metadata.sample_rate,
+                metadata.channel,
+                metadata.bit_rate // 8,
+                WAV_UNKNOWN_SIZE,
+            )
+        async for chunk in stream:
+            audio_data.append(chunk)
+            self.telemetry.count("bytes_sent_total", len(chunk), self._labels)
+            yield chunk
+        _LOGGER.debug("Audio data size: %d bytes (streamed)", len(audio_data))
+        request_timeout.reschedule(
+            asyncio.get_running_loop().time() + REQUEST_TIMEOUT
+        )
 
     def _prepare_request_data(
-        self, language: str, wav_data: bytes
+        self,
+        language: str,
+        audio: bytes | memoryview | AsyncIterable[bytes],
+        filename: str = WAV_FILENAME,
+        content_type: str = WAV_CONTENT_TYPE,
     ) -> tuple[dict, FormData]:
         """Prepare headers and form data for the API request."""
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-        }
-
         # Convert BCP 47 language code to ISO 639-1 for OpenAI API
         openai_language = _convert_language_code(language)
 
+        # The file goes last so that a streamed upload does not hold back
+        # the other fields
         form = FormData()
-        form.add_field(
-            "file", wav_data, filename="whisper_audio.wav", content_type="audio/wav"
-        )
         form.add_field("model", self.model)
         form.add_field("language", openai_language)
         form.add_field("prompt", self.prompt)
         form.add_field("temperature", str(self.temperature))
         form.add_field("response_format", "json")
+        form.add_field("file", audio, filename=filename, content_type=content_type)
 
         _LOGGER.debug(
             "Preparing request to API with parameters: model=%s, language=%s (converted to %s), prompt=%s, temperature=%s",
@@ -94,26 +409,129 @@ class OpenAIHTTPClient:
             self.temperature,
         )
 
-        return headers, form
+        return self.headers, form
+
+    def _headers_for_key(self, api_key: str) -> dict[str, str]:
+        """Return the request headers for a rotated API key."""
+        if (headers := self._key_headers.get(api_key)) is None:
+            headers = self._key_headers[api_key] = {
+                "Authorization": f"Bearer {api_key}"
+            }
+        return headers
+
+    async def _post(
+        self,
+        url: str,
+        headers: dict,
+        form: FormData,
+        timings: StageTimings,
+        api_key: str | None = None,
+    ) -> dict:
+        """Make one request attempt and return the decoded response."""
+        send_time = time.perf_counter()
+        response = await self.client.post(
+            url,
+            headers=headers,
+            data=form,
+            timeout=_NO_CLIENT_TIMEOUT,
+        )
+        response_time = time.perf_counter()
+        # A streamed upload is sent while the audio is still arriving
+        timings.first_byte = response_time - max(
+            send_time, timings.audio_end or send_time
+        )
+        timings.server = timings.upload = None
+        if (processing_ms := response.headers.get(PROCESSING_MS_HEADER)) is not None:
+            try:
+                timings.server = float(processing_ms) / 1000
+            except ValueError:
+                pass
+            else:
+                timings.upload = max(timings.first_byte - timings.server, 0.0)
+        if self.rate_limiter is not None and api_key is not None:
+            self.rate_limiter.update(
+                api_key,
+                response.headers,
+                response.status == HTTPStatus.TOO_MANY_REQUESTS,
+            )
+        response.raise_for_status()
+        result = await response.json()
+        timings.parse = time.perf_counter() - response_time
+        return result
 
     async def _send_request(
         self,
         url: str,
         headers: dict,
         form: FormData,
+        request_timeout: asyncio.Timeout | None = None,
+        rebuild_form: Callable[[], FormData] | None = None,
+        timings: StageTimings | None = None,
     ) -> SpeechResult:
-        """Send HTTP request to the API and process the response."""
+        """Send HTTP request to the API and process the response.
+
+        Transient failures are retried with rebuild_form, which must return
+        a new form around the same audio, as long as the retry can finish
+        before the request deadline.
+        """
+        if request_timeout is None:
+            request_timeout = asyncio.timeout(REQUEST_TIMEOUT)
+        if timings is None:
+            timings = StageTimings()
+        loop = asyncio.get_running_loop()
+        retries = 0
+
         try:
-            start_time = time.perf_counter()
+            start_time = attempt_start = time.perf_counter()
 
-            response = await self.client.post(
-                url,
-                headers=headers,
-                data=form,
-                timeout=10,
-            )
-            response.raise_for_status()
-            result = await response.json()
+            async with request_timeout:
+                while True:
+                    try:
+                        api_key = None
+                        if self.rate_limiter is not None:
+                            api_key = await self.rate_limiter.async_acquire()
+                            headers = self._headers_for_key(api_key)
+                        with self.telemetry.span("request", attempt=retries + 1):
+                            result = await self._post(
+                                url, headers, form, timings, api_key
+                            )
+                        break
+                    except ClientError as err:
+                        delay = None
+                        deadline = request_timeout.when()
+                        if rebuild_form is not None and deadline is not None:
+                            delay = self.retry_policy.delay(
+                                err,
+                                retries,
+                                deadline - loop.time(),
+                                self.retry_stats.attempt_estimate,
+                            )
+                        if delay is None:
+                            # A streamed upload that failed before its audio
+                            # ended has no deadline yet and is not retried
+                            if (
+                                rebuild_form is not None
+                                and deadline is not None
+                                and is_retryable(err)
+                            ):
+                                self.retry_stats.exhausted += 1
+                            raise
+                        retries += 1
+                        _LOGGER.warning(
+                            "Transcription request failed (%s), retry %d in %.2f seconds",
+                            err,
+                            retries,
+                            delay,
+                        )
+                        await asyncio.sleep(delay)
+                        form = rebuild_form()
+                        attempt_start = time.perf_counter()
+            if timings.audio_end is not None:
+                # A streamed upload is opened while the user is speaking;
+                # its attempt only starts once the audio has ended
+                start_time = max(start_time, timings.audio_end)
+                attempt_start = max(attempt_start, timings.audio_end)
+            self.retry_stats.record_attempt(time.perf_counter() - attempt_start)
             _LOGGER.debug("API response: %s", result)
 
             duration = time.perf_counter() - start_time
@@ -138,24 +556,141 @@ class OpenAIHTTPClient:
             else:
                 _LOGGER.error("HTTP error: %s", err)
             return SpeechResult("", SpeechResultState.ERROR)
+        except TimeoutError:
+            _LOGGER.warning("Timeout waiting for transcription response")
+            return SpeechResult("", SpeechResultState.ERROR)
         except Exception:
             _LOGGER.exception("Error sending audio")
             return SpeechResult("", SpeechResultState.ERROR)
+        finally:
+            if timings.audio_end is not None:
+                start_time = max(start_time, timings.audio_end)
+            self.retry_stats.record_request(retries, attempt_start - start_time)
 
     async def async_process_audio_stream(
         self, metadata: SpeechMetadata, stream: AsyncIterable[bytes]
     ) -> SpeechResult:
         """Process audio stream via HTTP POST to OpenAI Transcription API."""
+        timings = StageTimings()
+        with self.telemetry.span("transcribe", **self._labels) as span:
+            result = await self._async_transcribe(
+                metadata, timings.track_audio(stream), timings
+            )
+            if span is not None and result.result != SpeechResultState.SUCCESS:
+                span.error = "Transcription failed"
+        timings.finish()
+        if self.timing_stats is not None:
+            self.timing_stats.record(timings)
+        self.telemetry.record_request(
+            self._labels, result.result == SpeechResultState.SUCCESS, timings.total
+        )
+        return result
+
+    async def _async_transcribe(
+        self,
+        metadata: SpeechMetadata,
+        stream: AsyncIterable[bytes],
+        timings: StageTimings,
+    ) -> SpeechResult:
+        """Upload the audio and return the transcript."""
+        request_timeout: asyncio.Timeout | None = None
+        detector: PauseDetector | None = None
+
+        if metadata.codec == AudioCodecs.PCM:
+            resampler = StreamingResampler(
+                metadata.sample_rate, HTTP_SAMPLE_RATE, metadata.channel
+            )
+            if not resampler.passthrough:
+                stream = resampler.async_resample(stream)
+                metadata = replace(
+                    metadata,
+                    sample_rate=HTTP_SAMPLE_RATE,
+                    channel=AudioChannels.CHANNEL_MONO,
+                )
 
-        # Collect and convert audio data
-        audio_data = await self._collect_audio_data(stream)
-        wav_data = self._convert_to_wav(metadata, audio_data)
+            if self.speculative_requests > 0 and not self.streaming_upload:
+                # Before trimming, which holds pauses back
+                detector = PauseDetector(
+                    metadata.sample_rate,
+                    metadata.channel,
+                    self.silence_trim.threshold_db
+                    if self.silence_trim is not None
+                    else DEFAULT_SILENCE_THRESHOLD,
+                )
+                stream = detector.async_watch(stream)
+
+        if self.silence_trim is not None and metadata.codec == AudioCodecs.PCM:
+            stream = SilenceTrimmer.from_config(
+                self.silence_trim, metadata.sample_rate, metadata.channel
+            ).async_trim(stream)
+
+        if self.streaming_upload:
+            # Open the request right away and upload while audio arrives;
+            # streamed PCM is always sent as WAV
+            request_timeout = asyncio.timeout(None)
+            audio_data = AudioBuffer()
+            audio = self._stream_audio(metadata, stream, request_timeout, audio_data)
+            filename, content_type = (
+                (OGG_FILENAME, OGG_CONTENT_TYPE)
+                if metadata.codec == AudioCodecs.OPUS
+                else (WAV_FILENAME, WAV_CONTENT_TYPE)
+            )
+        else:
+            # Collect and encode audio data
+            if detector is None:
+                audio_data = await self._collect_audio_data(stream)
+            else:
+                audio_data, result = await self._collect_speculating(
+                    metadata, stream, detector
+                )
+                if result is not None:
+                    return result
+
+            # Shorter audio is sent in a single request
+            segment_bytes = (
+                self.segment_length * metadata.sample_rate * metadata.channel * 2
+            )
+            if (
+                self.segment_length > 0
+                and metadata.codec == AudioCodecs.PCM
+                and len(audio_data) > segment_bytes
+            ):
+                return await self._async_transcribe_segments(
+                    metadata, audio_data, timings
+                )
+
+            encode_start = time.perf_counter()
+            with self.telemetry.span("encode", codec=self.upload_codec):
+                audio, filename, content_type = await self._encode_audio(
+                    metadata, audio_data
+                )
+            timings.encode = time.perf_counter() - encode_start
+            self.telemetry.count("bytes_sent_total", len(audio), self._labels)
 
         # Prepare request data
-        headers, form = self._prepare_request_data(metadata.language, wav_data)
+        headers, form = self._prepare_request_data(
+            metadata.language, audio, filename, content_type
+        )
+
+        def rebuild_form() -> FormData:
+            """Return a new form around the audio of the first attempt."""
+            retry_audio = audio
+            if self.streaming_upload:
+                # Retries upload the audio buffered while streaming
+                retry_audio = (
+                    audio_data.data
+                    if metadata.codec == AudioCodecs.OPUS
+                    else self._convert_to_wav(metadata, audio_data)
+                )
+            self.telemetry.count("bytes_sent_total", len(retry_audio), self._labels)
+            return self._prepare_request_data(
+                metadata.language, retry_audio, filename, content_type
+            )[1]
 
         # Send request and get response
         url = f"{self.api_url}/audio/transcriptions"
         _LOGGER.debug("Sending request to API: %s", url)
 
-        return await self._send_request(url, headers, form)
+        return await self._send_request(
+            url, headers, form, request_timeout, rebuild_form, timings
+        )
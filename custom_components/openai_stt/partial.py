@@ -0,0 +1,104 @@
+"""Partial transcripts of realtime utterances for OpenAI STT."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass
+import logging
+from typing import Final
+
+from homeassistant.util.ulid import ulid_now
+
+_LOGGER = logging.getLogger(__name__)
+
+# Partial transcripts buffered for a subscriber that falls behind
+SUBSCRIBER_QUEUE_SIZE: Final = 64
+
+
+@dataclass(frozen=True, slots=True)
+class PartialTranscript:
+    """The text of an utterance so far."""
+
+    utterance_id: str
+    text: str
+    final: bool = False
+
+
+class PartialTranscripts:
+    """Fan out the partial transcripts of utterances as they arrive.
+
+    Subscribers iterate over async_iter(); on_partial, when set, is
+    called for each transcript as well. Deltas are only decoded while
+    the hub is active, so partial transcripts cost nothing when unused.
+    """
+
+    def __init__(
+        self, on_partial: Callable[[PartialTranscript], None] | None = None
+    ) -> None:
+        """Initialize the hub."""
+        self.on_partial = on_partial
+        self._queues: set[asyncio.Queue[PartialTranscript]] = set()
+
+    @property
+    def active(self) -> bool:
+        """Return True if anything receives partial transcripts."""
+        return self.on_partial is not None or bool(self._queues)
+
+    def utterance(self) -> UtteranceText | None:
+        """Start collecting an utterance, or return None when inactive."""
+        if not self.active:
+            return None
+        return UtteranceText(self, ulid_now())
+
+    def publish(self, partial: PartialTranscript) -> None:
+        """Send a partial transcript to the subscribers."""
+        if self.on_partial is not None:
+            self.on_partial(partial)
+        for queue in self._queues:
+            if queue.full():
+                # Keep the newest text for a subscriber that fell behind
+                queue.get_nowait()
+            queue.put_nowait(partial)
+
+    async def async_iter(self) -> AsyncIterator[PartialTranscript]:
+        """Yield the partial transcripts of all utterances from now on."""
+        queue: asyncio.Queue[PartialTranscript] = asyncio.Queue(
+            SUBSCRIBER_QUEUE_SIZE
+        )
+        self._queues.add(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self._queues.discard(queue)
+
+
+class UtteranceText:
+    """Accumulate the transcription deltas of one utterance."""
+
+    def __init__(self, hub: PartialTranscripts, utterance_id: str) -> None:
+        """Initialize the utterance."""
+        self._hub = hub
+        self.utterance_id = utterance_id
+        # Text by item id; server VAD can split an utterance into items
+        self._items: dict[str, str] = {}
+
+    @property
+    def text(self) -> str:
+        """Return the text received so far."""
+        return " ".join(
+            text for item in self._items.values() if (text := item.strip())
+        )
+
+    def add_delta(self, item_id: str, delta: str) -> None:
+        """Add a delta and publish the text so far."""
+        if not delta:
+            return
+        self._items[item_id] = self._items.get(item_id, "") + delta
+        _LOGGER.debug("Partial transcript: %s", self.text)
+        self._hub.publish(PartialTranscript(self.utterance_id, self.text))
+
+    def finish(self, text: str) -> None:
+        """Publish the final transcript."""
+        self._hub.publish(PartialTranscript(self.utterance_id, text, final=True))
@@ -0,0 +1,228 @@
+"""Client-side rate limiting across API keys for OpenAI STT."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+import logging
+import math
+import re
+import time
+from typing import Any, Final
+
+_LOGGER = logging.getLogger(__name__)
+
+LIMIT_REQUESTS_HEADER: Final = "x-ratelimit-limit-requests"
+REMAINING_REQUESTS_HEADER: Final = "x-ratelimit-remaining-requests"
+RESET_REQUESTS_HEADER: Final = "x-ratelimit-reset-requests"
+REMAINING_TOKENS_HEADER: Final = "x-ratelimit-remaining-tokens"
+RESET_TOKENS_HEADER: Final = "x-ratelimit-reset-tokens"
+
+# Window assumed for the request limit until its refill rate is observed
+DEFAULT_LIMIT_WINDOW: Final = 60.0
+
+# Time a key is left alone after a 429 that says nothing else (in seconds)
+DEFAULT_LIMITED_BACKOFF: Final = 1.0
+
+# Longest sleep between checks while all keys are out of budget, so
+# that rate limit updates from other requests are picked up
+MAX_WAIT_STEP: Final = 0.5
+
+# Durations such as "1s", "6m0s" or "20ms" in the reset headers
+_DURATION = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS: Final = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+
+
+def parse_reset(value: str | None) -> float | None:
+    """Return the seconds in a rate limit reset header, if it has any."""
+    if not value:
+        return None
+    seconds = 0.0
+    matched = False
+    for amount, unit in _DURATION.findall(value):
+        seconds += float(amount) * _DURATION_UNITS[unit]
+        matched = True
+    if not matched:
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            return None
+    return seconds
+
+
+def parse_api_keys(text: str) -> list[str]:
+    """Return the API keys in a whitespace or line separated list."""
+    return text.split()
+
+
+def _header_number(headers: Mapping[str, str], name: str) -> float | None:
+    """Return a numeric header value, if present and valid."""
+    if (value := headers.get(name)) is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+@dataclass
+class KeyBudget:
+    """Token bucket of the requests one API key may still make."""
+
+    index: int
+    limit: float | None = None
+    tokens: float = math.inf
+    # Tokens added per second, derived from the reset header
+    rate: float = 0.0
+    updated: float = 0.0
+    # Set by an exhausted token limit or a 429
+    blocked_until: float = 0.0
+    last_used: float = 0.0
+    requests: int = 0
+    limited: int = 0
+
+    def refill(self, now: float) -> None:
+        """Add the tokens replenished since the last update."""
+        if self.limit is not None and self.tokens < self.limit:
+            refilled = self.tokens + self.rate * (now - self.updated)
+            self.tokens = min(self.limit, refilled)
+        self.updated = now
+
+    def wait(self, now: float) -> float:
+        """Return how long until the key can make a request."""
+        blocked = max(self.blocked_until - now, 0.0)
+        if self.tokens >= 1 or self.rate <= 0:
+            return blocked
+        return max(blocked, (1 - self.tokens) / self.rate)
+
+
+class RateLimiter:
+    """Spread requests over API keys within their rate limits.
+
+    Each key has a token bucket that is set from the x-ratelimit-*
+    headers of its responses: the remaining requests become the tokens,
+    and the time to reset gives the refill rate. A key whose token limit
+    is used up, or that got a 429, is left alone until it resets. Each
+    request takes a token from the key that can send soonest, and the
+    least recently used on a tie, so load rotates across keys. While no
+    key has a token left, requests wait for one instead of running into
+    429s. Until a key's limits are known it is not held back.
+    """
+
+    def __init__(self, api_keys: Sequence[str]) -> None:
+        """Initialize the limiter."""
+        self._budgets: dict[str, KeyBudget] = {}
+        self.waits = 0
+        self.wait_time = 0.0
+        self.update_keys(api_keys)
+
+    def update_keys(self, api_keys: Sequence[str]) -> None:
+        """Set the keys, keeping the budgets of those already known."""
+        self._budgets = {
+            key: self._budgets.get(key) or KeyBudget(index)
+            for index, key in enumerate(dict.fromkeys(api_keys))
+        }
+        for index, budget in enumerate(self._budgets.values()):
+            budget.index = index
+
+    def _next(self, now: float) -> tuple[str, float]:
+        """Return the key that can send soonest and its wait."""
+        best: tuple[float, float, str] | None = None
+        for key, budget in self._budgets.items():
+            budget.refill(now)
+            candidate = (budget.wait(now), budget.last_used, key)
+            if best is None or candidate < best:
+                best = candidate
+        assert best is not None
+        return best[2], best[0]
+
+    async def async_acquire(self) -> str:
+        """Wait until a key may send and return it."""
+        start = time.monotonic()
+        waited = False
+        while True:
+            now = time.monotonic()
+            key, wait = self._next(now)
+            if wait <= 0:
+                break
+            _LOGGER.debug("All API keys are rate limited, waiting %.2f seconds", wait)
+            waited = True
+            await asyncio.sleep(min(wait, MAX_WAIT_STEP))
+
+        budget = self._budgets[key]
+        budget.tokens -= 1
+        budget.last_used = now
+        budget.requests += 1
+        if waited:
+            self.waits += 1
+            self.wait_time += now - start
+        return key
+
+    def update(
+        self,
+        api_key: str,
+        headers: Mapping[str, str] | None,
+        limited: bool = False,
+    ) -> None:
+        """Update the budget of a key from the headers of its response."""
+        if (budget := self._budgets.get(api_key)) is None:
+            return
+        headers = headers or {}
+        now = time.monotonic()
+        budget.refill(now)
+
+        limit = _header_number(headers, LIMIT_REQUESTS_HEADER)
+        remaining = _header_number(headers, REMAINING_REQUESTS_HEADER)
+        reset = parse_reset(headers.get(RESET_REQUESTS_HEADER))
+        if limit is not None:
+            budget.limit = limit
+        if remaining is not None:
+            budget.tokens = remaining
+            if budget.limit is not None:
+                if reset and remaining < budget.limit:
+                    budget.rate = (budget.limit - remaining) / reset
+                elif budget.rate <= 0:
+                    budget.rate = budget.limit / DEFAULT_LIMIT_WINDOW
+
+        blocked_for = 0.0
+        if remaining is not None and remaining < 1 and budget.rate <= 0:
+            # Used up, but the refill rate is unknown
+            blocked_for = reset or DEFAULT_LIMITED_BACKOFF
+        if _header_number(headers, REMAINING_TOKENS_HEADER) == 0:
+            blocked_for = max(
+                blocked_for, parse_reset(headers.get(RESET_TOKENS_HEADER)) or 0.0
+            )
+        if limited:
+            budget.limited += 1
+            retry_after = _header_number(headers, "Retry-After")
+            blocked_for = max(
+                blocked_for, retry_after or reset or DEFAULT_LIMITED_BACKOFF
+            )
+        if blocked_for > 0:
+            budget.blocked_until = max(budget.blocked_until, now + blocked_for)
+            _LOGGER.debug(
+                "API key %d is rate limited for %.2f seconds",
+                budget.index,
+                blocked_for,
+            )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the budgets, identifying keys by their position."""
+        now = time.monotonic()
+        return {
+            "waits": self.waits,
+            "wait_time": self.wait_time,
+            "keys": [
+                {
+                    "index": budget.index,
+                    "limit": budget.limit,
+                    "tokens": None if math.isinf(budget.tokens) else budget.tokens,
+                    "rate": budget.rate,
+                    "blocked_for": max(budget.blocked_until - now, 0.0),
+                    "requests": budget.requests,
+                    "limited": budget.limited,
+                }
+                for budget in self._budgets.values()
+            ],
+        }
@@ -0,0 +1,309 @@
+"""Long-lived realtime transcription session for OpenAI STT."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterable
+from dataclasses import dataclass, field
+import logging
+import time
+from typing import TYPE_CHECKING, Final
+
+from aiohttp import ClientError, ClientWebSocketResponse, WSMsgType
+
+from .events import (
+    BUFFER_COMMITTED,
+    ERROR,
+    SPEECH_STOPPED,
+    TRANSCRIPTION_COMPLETED,
+    TRANSCRIPTION_DELTA,
+    TRANSCRIPTION_FAILED,
+    decode_event,
+)
+from .finalize import EarlyFinalizer
+from .partial import UtteranceText
+from .timing import StageTimings
+from .websocket_client import WEBSOCKET_TIMEOUT
+
+if TYPE_CHECKING:
+    from .websocket_client import OpenAIWebSocketClient
+
+_LOGGER = logging.getLogger(__name__)
+
+# Delay before reconnecting after the socket dropped (in seconds)
+RECONNECT_BACKOFF_MIN: Final = 1
+RECONNECT_BACKOFF_MAX: Final = 300
+
+# Error code returned when committing an input buffer that server VAD
+# already committed
+_COMMIT_EMPTY: Final = "input_audio_buffer_commit_empty"
+
+# Server events that affect a turn; the rest are skipped unparsed
+_TURN_EVENTS: Final = frozenset(
+    {BUFFER_COMMITTED, TRANSCRIPTION_COMPLETED, TRANSCRIPTION_FAILED, ERROR}
+)
+_PARTIAL_TURN_EVENTS: Final = _TURN_EVENTS | {TRANSCRIPTION_DELTA}
+
+
+@dataclass
+class _Turn:
+    """Bookkeeping for the utterance currently using the session."""
+
+    future: asyncio.Future[str]
+    timings: StageTimings
+    utterance: UtteranceText | None = None
+    finalizer: EarlyFinalizer | None = None
+    item_ids: list[str] = field(default_factory=list)
+    transcripts: dict[str, str] = field(default_factory=dict)
+    commit_sent: bool = False
+    commit_acked: bool = False
+    # perf_counter time the audio was all sent, or 0 while sending
+    sent_at: float = 0.0
+
+    def maybe_finish(self, received: float) -> None:
+        """Resolve the turn once our commit and all its items are done."""
+        if self.future.done() or not self.commit_acked:
+            return
+        if all(item_id in self.transcripts for item_id in self.item_ids):
+            if self.sent_at:
+                self.timings.server = received - self.sent_at
+            self.timings.parse = time.perf_counter() - received
+            self.future.set_result(
+                " ".join(
+                    text
+                    for item_id in self.item_ids
+                    if (text := self.transcripts[item_id].strip())
+                )
+            )
+
+
+class PersistentRealtimeSession:
+    """Serve consecutive utterances over a single realtime session.
+
+    Each utterance clears the input buffer, appends its audio and commits.
+    A reader task consumes all server events and matches the committed
+    items and their transcripts to the utterance by item id, so late
+    events from an earlier turn cannot leak into the next one. A dropped
+    socket is reconnected in the background.
+    """
+
+    def __init__(self, client: OpenAIWebSocketClient, language: str) -> None:
+        """Initialize the session."""
+        # Replaced when options the socket does not depend on change
+        self.client = client
+        self._language = language
+        # The serialized session configuration the socket was set up with
+        self._config = ""
+        self._ws: ClientWebSocketResponse | None = None
+        self._reader: asyncio.Task | None = None
+        self._connect_task: asyncio.Task | None = None
+        self._turn_lock = asyncio.Lock()
+        self._turn: _Turn | None = None
+        self._backoff = 0.0
+        self._closed = False
+
+    @property
+    def busy(self) -> bool:
+        """Return True while an utterance is using the session."""
+        return self._turn_lock.locked()
+
+    def async_start(self) -> None:
+        """Connect in the background."""
+        self._schedule_connect()
+
+    async def async_close(self) -> None:
+        """Close the session and stop reconnecting."""
+        self._closed = True
+        for task in (self._connect_task, self._reader):
+            if task is not None and not task.done():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        if self._ws is not None and not self._ws.closed:
+            await self._ws.close()
+        self._ws = None
+
+    async def async_transcribe(
+        self,
+        language: str,
+        stream: AsyncIterable[bytes],
+        timings: StageTimings,
+        utterance: UtteranceText | None = None,
+        finalizer: EarlyFinalizer | None = None,
+    ) -> str:
+        """Transcribe one utterance on the shared session.
+
+        The upload, first_byte, server and parse stages are stamped on
+        timings. Transcription deltas are passed to utterance, if given.
+        With a finalizer, the server's end of speech ends the audio, and
+        the commit of server VAD stands in for ours.
+        """
+        async with self._turn_lock:
+            ws = await self._async_get_connection(language)
+
+            turn = _Turn(
+                asyncio.get_running_loop().create_future(),
+                timings,
+                utterance,
+                finalizer,
+            )
+            self._turn = turn
+            try:
+                await ws.send_json({"type": "input_audio_buffer.clear"})
+                sent_at = await self.client._send_audio_stream(ws, stream, commit=False)
+                if not sent_at:
+                    raise ClientError("Realtime session closed while sending audio")
+
+                if finalizer is not None and finalizer.stopped:
+                    assert finalizer.stopped_at is not None
+                    start_time = finalizer.stopped_at
+                else:
+                    # Flag the commit first so its acknowledgement is attributed
+                    turn.commit_sent = True
+                    with self.client.telemetry.span("commit"):
+                        await ws.send_json({"type": "input_audio_buffer.commit"})
+                    sent_at = start_time = time.perf_counter()
+                turn.sent_at = sent_at
+                if timings.audio_end is not None:
+                    timings.upload = sent_at - timings.audio_end
+
+                async with asyncio.timeout(WEBSOCKET_TIMEOUT):
+                    final_text = await turn.future
+                duration = time.perf_counter() - start_time
+                self.client.telemetry.add_span("completion", duration)
+                _LOGGER.debug(
+                    "Transcription processing duration: %.2f seconds", duration
+                )
+                return final_text
+            finally:
+                self._turn = None
+                if not turn.future.done():
+                    turn.future.cancel()
+                elif not turn.future.cancelled():
+                    # Mark a failure that was superseded as retrieved
+                    turn.future.exception()
+
+    async def _async_get_connection(self, language: str) -> ClientWebSocketResponse:
+        """Return the open socket, reconnecting or reconfiguring as needed."""
+        if self._connect_task is not None and not self._connect_task.done():
+            # A background (re)connect is in flight; reuse it
+            await asyncio.gather(self._connect_task, return_exceptions=True)
+
+        if self._ws is None or self._ws.closed:
+            self._language = language
+            await self._async_connect()
+        elif self.client._session_config(language) != self._config:
+            # Another language, or calibrated turn detection settings
+            await self.client.async_configure_session(self._ws, language)
+            self._language = language
+            self._config = self.client._session_config(language)
+
+        assert self._ws is not None
+        return self._ws
+
+    async def _async_connect(self) -> None:
+        """Open and configure the socket and start reading from it."""
+        ws = await self.client.async_connect(self._language, wait_for_update=True)
+        self._ws = ws
+        self._config = self.client._session_config(self._language)
+        self._backoff = 0.0
+        self._reader = asyncio.create_task(self._read(ws))
+        _LOGGER.debug("Persistent realtime session connected")
+
+    def _schedule_connect(self) -> None:
+        """Reconnect in the background unless already connecting."""
+        if self._closed or (self._connect_task and not self._connect_task.done()):
+            return
+        self._connect_task = asyncio.create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        """Reconnect with exponential backoff until it succeeds."""
+        while not self._closed and (self._ws is None or self._ws.closed):
+            try:
+                await self._async_connect()
+            except (ClientError, OSError) as err:
+                self._backoff = min(
+                    max(self._backoff * 2, RECONNECT_BACKOFF_MIN),
+                    RECONNECT_BACKOFF_MAX,
+                )
+                _LOGGER.warning(
+                    "Failed to connect realtime session, retrying in %.0f seconds: %s",
+                    self._backoff,
+                    err,
+                )
+                await asyncio.sleep(self._backoff)
+
+    async def _read(self, ws: ClientWebSocketResponse) -> None:
+        """Dispatch server events to the current turn.
+
+        However reading ends, the current turn fails and the session
+        reconnects unless it is closing.
+        """
+        try:
+            async for msg in ws:
+                if msg.type == WSMsgType.TEXT:
+                    received = time.perf_counter()
+                    _LOGGER.debug("Received response: %s", msg.data)
+                    wanted = _TURN_EVENTS
+                    if (turn := self._turn) is not None:
+                        if turn.sent_at and turn.timings.first_byte is None:
+                            turn.timings.first_byte = received - turn.sent_at
+                        if turn.utterance is not None:
+                            wanted = _PARTIAL_TURN_EVENTS
+                        if turn.finalizer is not None:
+                            wanted = wanted | {SPEECH_STOPPED}
+                    if (data := decode_event(msg.data, wanted)) is not None:
+                        self._dispatch(data, received)
+                elif msg.type == WSMsgType.ERROR:
+                    _LOGGER.error("WebSocket error: %s", ws.exception())
+                    break
+        except (ClientError, OSError) as err:
+            _LOGGER.error("Error reading from realtime session: %s", err)
+        finally:
+            _LOGGER.debug("Persistent realtime session disconnected")
+            if self._turn is not None and not self._turn.future.done():
+                self._turn.future.set_exception(
+                    ClientError("Realtime session closed during transcription")
+                )
+            if not ws.closed:
+                await ws.close()
+            self._schedule_connect()
+
+    def _dispatch(self, data: dict, received: float) -> None:
+        """Apply a server event received at perf_counter time received."""
+        msg_type = data["type"]
+        turn = self._turn
+        if turn is None:
+            return
+
+        if msg_type == SPEECH_STOPPED:
+            if turn.finalizer is not None:
+                turn.finalizer.stop()
+        elif msg_type == BUFFER_COMMITTED:
+            turn.item_ids.append(data["item_id"])
+            if turn.commit_sent or (
+                turn.finalizer is not None and turn.finalizer.stopped
+            ):
+                # Ours, or the commit of server VAD that ended the audio
+                turn.commit_acked = True
+        elif msg_type == TRANSCRIPTION_DELTA:
+            item_id = data.get("item_id")
+            if item_id in turn.item_ids and turn.utterance is not None:
+                turn.utterance.add_delta(item_id, data.get("delta", ""))
+        elif msg_type == TRANSCRIPTION_COMPLETED:
+            item_id = data.get("item_id")
+            if item_id in turn.item_ids:
+                turn.transcripts[item_id] = data.get("transcript", "")
+        elif msg_type == TRANSCRIPTION_FAILED:
+            item_id = data.get("item_id")
+            if item_id in turn.item_ids:
+                _LOGGER.warning("Transcription failed: %s", data.get("error"))
+                turn.transcripts[item_id] = ""
+        elif msg_type == ERROR:
+            error = data.get("error") or {}
+            if error.get("code") == _COMMIT_EMPTY and turn.commit_sent:
+                # Server VAD already committed everything we sent
+                turn.commit_acked = True
+            else:
+                _LOGGER.error("Realtime session error: %s", error)
+
+        turn.maybe_finish(received)
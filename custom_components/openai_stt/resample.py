@@ -0,0 +1,142 @@
+"""Streaming resampling and downmixing for OpenAI STT."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterable, AsyncIterator
+from functools import lru_cache
+from math import ceil, gcd
+from typing import Final
+
+import numpy as np
+
+# Attenuation of everything that would alias into the output (in dB)
+STOPBAND_DB: Final = 60.0
+
+# Fraction of the output Nyquist frequency passed unattenuated; the
+# transition band ends at the Nyquist frequency
+_PASSBAND: Final = 0.9
+
+
+@lru_cache(maxsize=16)
+def _design_filter(up: int, down: int) -> np.ndarray:
+    """Return the polyphase branches of a windowed-sinc low-pass filter.
+
+    Row p holds the taps applied for output phase p, ordered from the
+    newest input sample to the oldest. The Kaiser window is sized for
+    STOPBAND_DB over the transition band, so the number of input samples
+    each output depends on grows with the decimation ratio.
+
+    Filters are shared by all resamplers of a rate pair, so the returned
+    array is read-only.
+    """
+    ratio = max(up, down)
+    # Transition band width in cycles per sample of the upsampled signal
+    transition = (1 - _PASSBAND) / (2 * ratio)
+    length = (STOPBAND_DB - 7.95) / (14.36 * transition)
+    taps_per_phase = ceil(length / up)
+    length = taps_per_phase * up
+    cutoff = (1 + _PASSBAND) / (2 * ratio)
+    beta = 0.1102 * (STOPBAND_DB - 8.7)
+    n = np.arange(length) - (length - 1) / 2
+    prototype = cutoff * np.sinc(cutoff * n) * np.kaiser(length, beta) * up
+    branches = prototype.reshape(taps_per_phase, up).T.astype(np.float32)
+    branches.flags.writeable = False
+    return branches
+
+
+class StreamingResampler:
+    """Convert interleaved PCM16 to mono at another sample rate.
+
+    Chunks are processed as they arrive: every output sample is computed
+    from the most recent input samples using a rational polyphase filter,
+    evaluated for the whole chunk at once with NumPy.
+    Only the filter history is carried over between chunks.
+    """
+
+    def __init__(self, input_rate: int, output_rate: int, channels: int) -> None:
+        """Initialize the resampler."""
+        divisor = gcd(int(input_rate), int(output_rate))
+        self._up = int(output_rate) // divisor
+        self._down = int(input_rate) // divisor
+        self._channels = int(channels)
+        self._frame_bytes = 2 * self._channels
+        self._passthrough = self._up == self._down and self._channels == 1
+        self._branches = _design_filter(self._up, self._down)
+        self._taps_per_phase = self._branches.shape[1]
+        self._taps = np.arange(self._taps_per_phase)
+
+        self._remainder = b""
+        # Input history, starting with zeros so the first outputs are defined
+        self._history = np.zeros(self._taps_per_phase - 1, dtype=np.float32)
+        # Absolute input index of the first history sample
+        self._base = -(self._taps_per_phase - 1)
+        self._inputs = 0
+        self._outputs = 0
+
+    @property
+    def passthrough(self) -> bool:
+        """Return True when the input is already in the output format."""
+        return self._passthrough
+
+    def _downmix(self, chunk: bytes) -> np.ndarray:
+        """Return complete input frames of the chunk as mono float samples."""
+        data = self._remainder + chunk if self._remainder else chunk
+        usable = len(data) - len(data) % self._frame_bytes
+        self._remainder = bytes(data[usable:])
+        samples = np.frombuffer(data, dtype=np.int16, count=usable // 2)
+        if self._channels == 1:
+            return samples.astype(np.float32)
+        return samples.reshape(-1, self._channels).mean(axis=1, dtype=np.float32)
+
+    def _filter(self, samples: np.ndarray, end: int) -> bytes:
+        """Append input samples and compute outputs up to index end."""
+        self._history = np.concatenate((self._history, samples))
+        self._inputs += samples.size
+
+        outputs = np.arange(self._outputs, end)
+        if outputs.size == 0:
+            return b""
+        position = outputs * self._down
+        newest = position // self._up - self._base
+        phase = position % self._up
+
+        window = self._history[newest[:, None] - self._taps]
+        result = np.einsum("ij,ij->i", window, self._branches[phase])
+        self._outputs = end
+
+        # Keep only the history the next output still needs
+        next_newest = self._outputs * self._down // self._up - self._base
+        drop = max(next_newest - (self._taps_per_phase - 1), 0)
+        self._history = self._history[drop:]
+        self._base += drop
+
+        return np.clip(np.rint(result), -32768, 32767).astype(np.int16).tobytes()
+
+    def process(self, chunk: bytes) -> bytes:
+        """Consume a chunk and return the resampled audio available so far."""
+        if self._passthrough:
+            return chunk
+        samples = self._downmix(chunk)
+        available = self._inputs + samples.size
+        # Outputs whose newest input sample has arrived
+        end = ((available - 1) * self._up) // self._down + 1 if available else 0
+        return self._filter(samples, end)
+
+    def flush(self) -> bytes:
+        """Return the remaining output at the end of the stream."""
+        if self._passthrough:
+            return b""
+        total = -(-self._inputs * self._up // self._down)
+        # Pad with silence so the filter reaches the last input samples
+        padding = np.zeros(self._taps_per_phase, dtype=np.float32)
+        return self._filter(padding, max(total, self._outputs))
+
+    async def async_resample(
+        self, stream: AsyncIterable[bytes]
+    ) -> AsyncIterator[bytes]:
+        """Resample an audio stream."""
+        async for chunk in stream:
+            if out := self.process(chunk):
+                yield out
+        if out := self.flush():
+            yield out
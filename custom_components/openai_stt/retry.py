@@ -0,0 +1,102 @@
+"""Retry policy for OpenAI STT HTTP requests."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+import random
+from typing import Final
+
+from aiohttp import ClientConnectionError, ClientResponseError
+
+# Response statuses worth another attempt
+RETRY_STATUSES: Final = frozenset({408, 429, 500, 502, 503, 504})
+
+# Exponential backoff bounds (in seconds)
+RETRY_BACKOFF_MIN: Final = 0.25
+RETRY_BACKOFF_MAX: Final = 2.0
+
+# Assumed duration of an attempt until one has been observed (in seconds)
+RETRY_INITIAL_ATTEMPT_ESTIMATE: Final = 1.0
+
+# Weight of the latest attempt in the attempt duration estimate
+_ESTIMATE_WEIGHT: Final = 0.2
+
+
+def is_retryable(err: BaseException) -> bool:
+    """Return True if a failed request may succeed when retried."""
+    if isinstance(err, ClientResponseError):
+        return err.status in RETRY_STATUSES
+    return isinstance(err, ClientConnectionError)
+
+
+def retry_after(err: BaseException) -> float | None:
+    """Return the delay requested by a Retry-After header, if any."""
+    if not isinstance(err, ClientResponseError) or not err.headers:
+        return None
+    if (value := err.headers.get("Retry-After")) is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max((when - datetime.now(UTC)).total_seconds(), 0.0)
+
+
+@dataclass
+class RetryStats:
+    """Retry counters shared by the requests of an entity."""
+
+    requests: int = 0
+    retried_requests: int = 0
+    retries: int = 0
+    # Retryable failures that were not retried for lack of time or attempts
+    exhausted: int = 0
+    # Time spent on failed attempts and backoff before the final attempt
+    added_latency: float = 0.0
+    last_added_latency: float = 0.0
+    # Moving average of the duration of successful attempts
+    attempt_estimate: float = RETRY_INITIAL_ATTEMPT_ESTIMATE
+
+    def record_attempt(self, duration: float) -> None:
+        """Update the attempt duration estimate."""
+        self.attempt_estimate += _ESTIMATE_WEIGHT * (duration - self.attempt_estimate)
+
+    def record_request(self, retries: int, added_latency: float) -> None:
+        """Record the retries a finished request needed."""
+        self.requests += 1
+        if retries:
+            self.retried_requests += 1
+            self.retries += retries
+            self.added_latency += added_latency
+            self.last_added_latency = added_latency
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Exponential backoff with full jitter, bounded by a deadline."""
+
+    max_retries: int
+
+    def delay(
+        self, err: BaseException, retry: int, remaining: float, attempt_estimate: float
+    ) -> float | None:
+        """Return the delay before retry number retry, or None to give up.
+
+        A retry is only made when the backoff and an attempt of the usual
+        duration fit in the remaining time.
+        """
+        if retry >= self.max_retries or not is_retryable(err):
+            return None
+        backoff = random.uniform(
+            0, min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_MIN * 2**retry)
+        )
+        delay = max(backoff, retry_after(err) or 0.0)
+        if delay + attempt_estimate > remaining:
+            return None
+        return delay
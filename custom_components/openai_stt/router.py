@@ -0,0 +1,235 @@
+"""Latency and health based routing across API backends for OpenAI STT."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterable, AsyncIterator, Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import logging
+from typing import Final
+
+from aiohttp import ClientError, ClientTimeout
+
+from homeassistant.components.stt import (
+    SpeechMetadata,
+    SpeechResult,
+    SpeechResultState,
+)
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_track_time_interval
+
+from .hedging import Transcriber
+
+_LOGGER = logging.getLogger(__name__)
+
+# Weight of the latest request in the latency and success averages
+EWMA_WEIGHT: Final = 0.2
+
+# A backend whose success average drops below this is taken out of rotation
+UNHEALTHY_SUCCESS: Final = 0.5
+
+# Success average given to a backend that answers a probe again
+RECOVERED_SUCCESS: Final = 0.7
+
+# Interval between probes of unhealthy backends
+PROBE_INTERVAL: Final = timedelta(seconds=30)
+
+# Maximum time to wait for a probe response (in seconds)
+PROBE_TIMEOUT: Final = 5
+
+
+@dataclass
+class Backend:
+    """An OpenAI-compatible API endpoint with its observed health."""
+
+    api_url: str
+    model: str
+    weight: float = 1.0
+    # Moving averages of the latency after the end of speech and of success
+    latency: float | None = None
+    success: float = 1.0
+    healthy: bool = True
+    requests: int = 0
+    failures: int = 0
+
+    @property
+    def score(self) -> float:
+        """Return the routing score; lower is better."""
+        if self.latency is None:
+            # Try new backends first so their latency gets measured
+            return 0.0
+        return self.latency / (self.weight * max(self.success, 0.01))
+
+
+def parse_backends(text: str) -> list[Backend]:
+    """Parse backend lines of the form "<api_url> <model> [weight]".
+
+    Empty lines and lines starting with # are ignored. Raises ValueError
+    for malformed lines.
+    """
+    backends = []
+    for line in text.splitlines():
+        if not (line := line.strip()) or line.startswith("#"):
+            continue
+        fields = line.split()
+        if len(fields) not in (2, 3) or not fields[0].startswith(
+            ("http://", "https://")
+        ):
+            raise ValueError(f"Invalid backend: {line}")
+        weight = float(fields[2]) if len(fields) == 3 else 1.0
+        if weight <= 0:
+            raise ValueError(f"Invalid backend weight: {line}")
+        backends.append(Backend(fields[0].rstrip("/"), fields[1], weight))
+    return backends
+
+
+class BackendRouter:
+    """Route each utterance to the best healthy backend.
+
+    Every request updates a moving average of the backend's latency after
+    the end of speech and of its success rate. Requests go to the healthy
+    backend with the lowest latency relative to its weight and success
+    rate. Backends whose success rate drops too low are only probed in the
+    background until they answer again.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, api_key: str, backends: list[Backend]
+    ) -> None:
+        """Initialize the router; the first backend is the primary one."""
+        self._hass = hass
+        self._api_key = api_key
+        self.backends = backends
+        self._unsub_probe: Callable[[], None] | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Start probing unhealthy backends."""
+        self._unsub_probe = async_track_time_interval(
+            self._hass, self._async_probe, PROBE_INTERVAL
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop probing."""
+        if self._unsub_probe is not None:
+            self._unsub_probe()
+            self._unsub_probe = None
+
+    def update(self, api_key: str, backends: list[Backend]) -> None:
+        """Replace the backends, keeping the history of those still present."""
+        self._api_key = api_key
+        known = {(backend.api_url, backend.model): backend for backend in self.backends}
+        updated = []
+        for backend in backends:
+            if (current := known.get((backend.api_url, backend.model))) is not None:
+                current.weight = backend.weight
+                backend = current
+            updated.append(backend)
+        self.backends = updated
+
+    def select(self) -> Backend:
+        """Return the backend to send the next request to."""
+        candidates = [backend for backend in self.backends if backend.healthy]
+        if not candidates:
+            # Everything is failing; use the one failing least
+            return max(self.backends, key=lambda backend: backend.success)
+        return min(candidates, key=lambda backend: backend.score)
+
+    def record(self, backend: Backend, latency: float, success: bool) -> None:
+        """Update a backend's averages with the outcome of a request."""
+        backend.requests += 1
+        if success:
+            self.record_latency(backend, latency)
+        else:
+            backend.failures += 1
+        backend.success += EWMA_WEIGHT * (float(success) - backend.success)
+
+        if backend.healthy and backend.success < UNHEALTHY_SUCCESS:
+            backend.healthy = False
+            _LOGGER.warning(
+                "Backend %s (%s) is failing, routing around it",
+                backend.api_url,
+                backend.model,
+            )
+
+    def record_latency(self, backend: Backend, latency: float) -> None:
+        """Update a backend's latency average alone.
+
+        This is also how a request cancelled after the end of the audio is
+        recorded: the time it had taken is a lower bound of its latency,
+        and it neither succeeded nor failed.
+        """
+        backend.latency = (
+            latency
+            if backend.latency is None
+            else backend.latency + EWMA_WEIGHT * (latency - backend.latency)
+        )
+
+    async def async_transcribe(
+        self,
+        backend: Backend,
+        transcribe: Transcriber,
+        metadata: SpeechMetadata,
+        stream: AsyncIterable[bytes],
+    ) -> SpeechResult:
+        """Transcribe on a backend and record how it did."""
+        loop = asyncio.get_running_loop()
+        audio_end: float | None = None
+
+        async def timed_stream() -> AsyncIterator[bytes]:
+            """Pass the audio through, noting when it ends."""
+            nonlocal audio_end
+            async for chunk in stream:
+                yield chunk
+            audio_end = loop.time()
+
+        try:
+            result = await transcribe(metadata, timed_stream())
+        except asyncio.CancelledError:
+            # Cancelled by a hedge that answered first; the time waited so
+            # far still tells how slow the backend is
+            if audio_end is not None:
+                self.record_latency(backend, loop.time() - audio_end)
+            raise
+        except Exception:
+            self.record(backend, 0.0, False)
+            raise
+        latency = loop.time() - audio_end if audio_end is not None else 0.0
+        self.record(backend, latency, result.result == SpeechResultState.SUCCESS)
+        _LOGGER.debug(
+            "Backend %s answered in %.2f seconds (average %.2f, success %.2f)",
+            backend.api_url,
+            latency,
+            backend.latency or 0.0,
+            backend.success,
+        )
+        return result
+
+    async def _async_probe(self, now: datetime | None = None) -> None:
+        """Check whether unhealthy backends are reachable again."""
+        session = async_get_clientsession(self._hass)
+        for backend in self.backends:
+            if backend.healthy:
+                continue
+            try:
+                response = await session.get(
+                    f"{backend.api_url}/models",
+                    headers={"Authorization": f"Bearer {self._api_key}"},
+                    timeout=ClientTimeout(total=PROBE_TIMEOUT),
+                )
+                response.release()
+            except (ClientError, TimeoutError) as err:
+                _LOGGER.debug("Probe of %s failed: %s", backend.api_url, err)
+                continue
+            # Any answer short of a server error means the server is up
+            if response.status < 500:
+                backend.healthy = True
+                backend.success = RECOVERED_SUCCESS
+                _LOGGER.info(
+                    "Backend %s (%s) is reachable again",
+                    backend.api_url,
+                    backend.model,
+                )
@@ -0,0 +1,99 @@
+"""Splitting long recordings into segments for OpenAI STT."""
+
+from __future__ import annotations
+
+from itertools import pairwise
+import re
+from typing import Final
+
+import numpy as np
+
+from .vad import FRAME_MS, frame_energy_db
+
+# Audio kept on both sides of a cut, so a word at the cut is heard whole
+# by at least one segment (in milliseconds)
+SEGMENT_OVERLAP_MS: Final = 500
+
+# Part of a segment, at its end, searched for the quietest cut point
+CUT_SEARCH_FRACTION: Final = 0.2
+
+# Most words compared when removing the overlap between two transcripts
+MAX_OVERLAP_WORDS: Final = 12
+
+_WORD: Final = re.compile(r"\w+")
+
+
+def find_cuts(
+    pcm: memoryview, sample_rate: int, channels: int, segment_ms: int
+) -> list[int]:
+    """Return the byte offsets at which to cut PCM16 audio into segments.
+
+    Each cut is placed before the quietest FRAME_MS frame in the last
+    CUT_SEARCH_FRACTION of a segment, so segments end at pauses when
+    there are any and are never longer than segment_ms.
+    """
+    frame_samples = sample_rate * FRAME_MS // 1000 * channels
+    frame_bytes = frame_samples * 2
+    count = len(pcm) // frame_bytes
+    levels = frame_energy_db(
+        np.frombuffer(pcm, dtype=np.int16, count=count * frame_samples).reshape(
+            -1, frame_samples
+        )
+    )
+    segment_frames = max(segment_ms // FRAME_MS, 1)
+    search_frames = max(int(segment_frames * CUT_SEARCH_FRACTION), 1)
+
+    cuts: list[int] = []
+    start = 0
+    while count - start > segment_frames:
+        end = start + segment_frames
+        window = levels[end - search_frames : end]
+        cut = end - search_frames + int(np.argmin(window))
+        cuts.append(cut * frame_bytes)
+        start = cut
+    return cuts
+
+
+def segment_ranges(
+    size: int, cuts: list[int], overlap_bytes: int, align: int
+) -> list[tuple[int, int]]:
+    """Return the overlapping byte ranges of the segments between cuts.
+
+    The ranges are aligned to whole sample frames of align bytes.
+    """
+    overlap = overlap_bytes - overlap_bytes % align
+    bounds = [0, *cuts, size]
+    return [
+        (max(start - overlap, 0), min(end + overlap, size))
+        for start, end in pairwise(bounds)
+    ]
+
+
+def _words(text: str) -> list[str]:
+    """Return the words of a text in lower case, without punctuation."""
+    return [word.casefold() for word in _WORD.findall(text)]
+
+
+def stitch(texts: list[str]) -> str:
+    """Join the transcripts of overlapping segments.
+
+    Words a transcript repeats from the end of the previous one, as the
+    segments overlap, are dropped.
+    """
+    result: list[str] = []
+    for text in texts:
+        tokens = text.split()
+        if not tokens:
+            continue
+        if result:
+            tail = _words(" ".join(result[-MAX_OVERLAP_WORDS:]))
+            head_tokens = tokens[:MAX_OVERLAP_WORDS]
+            # Words of each token, so a match maps back to whole tokens
+            head = [_words(token) for token in head_tokens]
+            for count in range(len(head_tokens), 0, -1):
+                words = [word for token in head[:count] for word in token]
+                if words and tail[-len(words) :] == words:
+                    tokens = tokens[count:]
+                    break
+        result.extend(tokens)
+    return " ".join(result)
@@ -0,0 +1,82 @@
+"""Stage timing sensors for OpenAI STT."""
+
+from __future__ import annotations
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DOMAIN
+from .entity import device_info
+from .timing import STAGES, TimingStats
+from .transport import OpenAISTTTransport
+
+STAGE_NAMES = {
+    "collect": "Audio collection",
+    "encode": "Encoding",
+    "upload": "Upload",
+    "first_byte": "Time to first byte",
+    "server": "Server processing",
+    "parse": "Parse",
+    "total": "Latency after speech",
+}
+
+PERCENTILES = (50, 95)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the stage timing sensors of a config entry."""
+    transport: OpenAISTTTransport = hass.data[DOMAIN][config_entry.entry_id]
+    async_add_entities(
+        StageTimingSensor(config_entry, transport.timing_stats, stage, percentile)
+        for stage in STAGES
+        for percentile in PERCENTILES
+    )
+
+
+class StageTimingSensor(SensorEntity):
+    """Rolling percentile of a request stage's duration."""
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_suggested_display_precision = 0
+
+    def __init__(
+        self,
+        config_entry: ConfigEntry,
+        stats: TimingStats,
+        stage: str,
+        percentile: int,
+    ) -> None:
+        """Initialize the sensor."""
+        self._stats = stats
+        self._stage = stage
+        self._percentile = percentile
+        self._attr_name = f"{STAGE_NAMES[stage]} p{percentile}"
+        self._attr_unique_id = f"{config_entry.entry_id}_{stage}_p{percentile}"
+        self._attr_device_info = device_info(config_entry)
+
+    async def async_added_to_hass(self) -> None:
+        """Update the state after each request."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self._stats.async_add_listener(self.async_write_ha_state))
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the percentile in milliseconds."""
+        value = self._stats.percentile(self._stage, self._percentile)
+        return None if value is None else value * 1000
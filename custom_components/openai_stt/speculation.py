@@ -0,0 +1,95 @@
+"""Speculative transcription at pauses in speech for OpenAI STT."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterable, AsyncIterator, Callable
+from dataclasses import dataclass
+from typing import Final
+
+import numpy as np
+
+from .vad import FRAME_MS, frame_energy_db
+
+# Silence after speech at which the audio so far is sent (in milliseconds)
+SPECULATION_PAUSE_MS: Final = 300
+
+
+@dataclass
+class SpeculationStats:
+    """Outcome and cost of speculative transcription requests."""
+
+    utterances: int = 0
+    requests: int = 0
+    # Utterances answered by a speculative request
+    hits: int = 0
+    # Speculative requests dropped because speech resumed
+    discarded: int = 0
+    # Speculative requests that failed or returned no text
+    failed: int = 0
+    # Audio sent in speculative requests, and the part of it not used
+    # (in seconds)
+    audio_sent: float = 0.0
+    audio_wasted: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        """Return the fraction of utterances answered speculatively."""
+        return self.hits / self.utterances if self.utterances else 0.0
+
+
+class PauseDetector:
+    """Follow the speech segments of a PCM16 stream as it arrives.
+
+    Audio is classified in FRAME_MS frames by level. Once speech has been
+    followed by pause_ms of silence, on_pause is called; speech after that
+    starts a new segment. A speculative transcript of the audio up to a
+    pause is complete as long as the segment number has not changed.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        channels: int,
+        threshold_db: float,
+        pause_ms: int = SPECULATION_PAUSE_MS,
+    ) -> None:
+        """Initialize the detector."""
+        self._frame_samples = sample_rate * FRAME_MS // 1000 * channels
+        self._frame_bytes = self._frame_samples * 2
+        self._threshold_db = threshold_db
+        self._pause_frames = max(pause_ms // FRAME_MS, 1)
+        self._remainder = b""
+        # Silent frames since the last speech frame
+        self._silent = 0
+        self.segment = 0
+        self.on_pause: Callable[[], None] | None = None
+
+    def process(self, chunk: bytes) -> None:
+        """Classify the frames of a chunk."""
+        data = self._remainder + chunk if self._remainder else chunk
+        usable = len(data) - len(data) % self._frame_bytes
+        self._remainder = bytes(data[usable:])
+        if not usable:
+            return
+        frames = np.frombuffer(data, dtype=np.int16, count=usable // 2).reshape(
+            -1, self._frame_samples
+        )
+        for speech in (frame_energy_db(frames) >= self._threshold_db).tolist():
+            if speech:
+                if self.segment == 0 or self._silent >= self._pause_frames:
+                    self.segment += 1
+                self._silent = 0
+            else:
+                self._silent += 1
+                if (
+                    self._silent == self._pause_frames
+                    and self.segment > 0
+                    and self.on_pause is not None
+                ):
+                    self.on_pause()
+
+    async def async_watch(self, stream: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+        """Pass the audio through, following its segments."""
+        async for chunk in stream:
+            self.process(chunk)
+            yield chunk
@@ -31,16 +31,19 @@ from .const import (
     CONF_NOISE_REDUCTION,
     CONF_PROMPT,
     CONF_REALTIME,
-    CONF_TEMPERATURE,
+    CONF_STREAMING_UPLOAD,
     DEFAULT_API_URL,
     DEFAULT_MODEL,
     DEFAULT_NOISE_REDUCTION,
     DEFAULT_PROMPT,
     DEFAULT_REALTIME,
+    DEFAULT_STREAMING_UPLOAD,
     DEFAULT_TEMPERATURE,
     DOMAIN,
 )
+from .entity import device_info
 from .http_client import OpenAIHTTPClient
+from .transport import OpenAISTTTransport
 from .websocket_client import OpenAIWebSocketClient
 
 _LOGGER = logging.getLogger(__name__)
@@ -143,6 +146,9 @@ PLATFORM_SCHEMA = cv.PLATFORM_SCHEMA.extend(
         vol.Optional(
             CONF_NOISE_REDUCTION, default=DEFAULT_NOISE_REDUCTION
         ): NOISE_REDUCTION_SCHEMA,
+        vol.Optional(
+            CONF_STREAMING_UPLOAD, default=DEFAULT_STREAMING_UPLOAD
+        ): cv.boolean,
     }
 )
 
@@ -158,9 +164,18 @@ async def async_get_engine(
     temperature = config.get(CONF_TEMP, DEFAULT_TEMP)
     realtime = config.get(CONF_REALTIME, DEFAULT_REALTIME)
     noise_reduction = config.get(CONF_NOISE_REDUCTION, DEFAULT_NOISE_REDUCTION)
+    streaming_upload = config.get(CONF_STREAMING_UPLOAD, DEFAULT_STREAMING_UPLOAD)
 
     return OpenAISTTProvider(
-        hass, api_key, api_url, model, prompt, temperature, realtime, noise_reduction
+        hass,
+        api_key,
+        api_url,
+        model,
+        prompt,
+        temperature,
+        realtime,
+        noise_reduction,
+        streaming_upload,
     )
 
 
@@ -171,34 +186,18 @@ async def async_setup_entry(
 ) -> None:
     """Set up OpenAI STT from a config entry."""
     try:
-        config_data = hass.data[DOMAIN][config_entry.entry_id]
-
-        api_key = config_data[CONF_API_KEY]
-        api_url = config_data.get(CONF_API_URL, DEFAULT_API_URL)
-        model = config_data.get(CONF_MODEL, DEFAULT_MODEL)
-        prompt = config_data.get(CONF_PROMPT, DEFAULT_PROMPT)
-        temperature = config_data.get(CONF_TEMPERATURE, DEFAULT_TEMPERATURE)
-        realtime = config_data.get(CONF_REALTIME, DEFAULT_REALTIME)
-        noise_reduction = config_data.get(CONF_NOISE_REDUCTION, DEFAULT_NOISE_REDUCTION)
+        transport: OpenAISTTTransport = hass.data[DOMAIN][config_entry.entry_id]
+        options = transport.options
 
         _LOGGER.debug(
             "Setting up OpenAI STT entity with: model=%s, api_url=%s, realtime=%s, temperature=%s",
-            model,
-            api_url,
-            realtime,
-            temperature,
+            options.model,
+            options.api_url,
+            options.realtime,
+            options.temperature,
         )
 
-        entity = OpenAISTTEntity(
-            config_entry,
-            api_key,
-            api_url,
-            model,
-            prompt,
-            temperature,
-            realtime,
-            noise_reduction,
-        )
+        entity = OpenAISTTEntity(config_entry, transport)
         async_add_entities([entity])
         _LOGGER.info("OpenAI STT entity setup completed successfully")
     except Exception as err:
@@ -219,6 +218,7 @@ class OpenAISTTProvider(Provider):
         temperature: float,
         realtime: bool,
         noise_reduction: str,
+        streaming_upload: bool,
     ) -> None:
         """Init OpenAI STT service."""
         self.hass = hass
@@ -231,6 +231,7 @@ class OpenAISTTProvider(Provider):
         self._temperature = temperature
         self._realtime = realtime
         self._noise_reduction = noise_reduction
+        self._streaming_upload = streaming_upload
         self._client = self._create_client()
 
     @property
@@ -256,12 +257,12 @@ class OpenAISTTProvider(Provider):
     @property
     def supported_sample_rates(self) -> list[AudioSampleRates]:
         """Return a list of supported samplerates."""
-        return [AudioSampleRates.SAMPLERATE_16000]
+        return list(AudioSampleRates)
 
     @property
     def supported_channels(self) -> list[AudioChannels]:
         """Return a list of supported channels."""
-        return [AudioChannels.CHANNEL_MONO]
+        return [AudioChannels.CHANNEL_MONO, AudioChannels.CHANNEL_STEREO]
 
     def _create_client(self):
         """Create and return the appropriate client based on configuration."""
@@ -284,6 +285,7 @@ class OpenAISTTProvider(Provider):
             self._model,
             self._prompt,
             self._temperature,
+            self._streaming_upload,
         )
 
     async def async_process_audio_stream(
@@ -300,28 +302,15 @@ class OpenAISTTEntity(SpeechToTextEntity):
     """OpenAI STT Entity for config entry support."""
 
     def __init__(
-        self,
-        config_entry: ConfigEntry,
-        api_key: str,
-        api_url: str,
-        model: str,
-        prompt: str,
-        temperature: float,
-        realtime: bool,
-        noise_reduction: str,
+        self, config_entry: ConfigEntry, transport: OpenAISTTTransport
     ) -> None:
         """Initialize OpenAI STT entity."""
         self._config_entry = config_entry
-        self._api_key = api_key
-        self._api_url = api_url
-        self._model = model
-        self._prompt = prompt
-        self._temperature = temperature
-        self._realtime = realtime
-        self._noise_reduction = noise_reduction
+        self._transport = transport
         # Use the config entry title as the entity name
         self._attr_name = config_entry.title
         self._attr_unique_id = config_entry.entry_id
+        self._attr_device_info = device_info(config_entry)
 
     @property
     def supported_languages(self) -> list[str]:
@@ -346,42 +335,15 @@ class OpenAISTTEntity(SpeechToTextEntity):
     @property
     def supported_sample_rates(self) -> list[AudioSampleRates]:
         """Return a list of supported samplerates."""
-        return [AudioSampleRates.SAMPLERATE_16000]
+        return list(AudioSampleRates)
 
     @property
     def supported_channels(self) -> list[AudioChannels]:
         """Return a list of supported channels."""
-        return [AudioChannels.CHANNEL_MONO]
-
-    def _create_client(self):
-        """Create and return the appropriate client based on configuration."""
-        if self._realtime:
-            # Use WebSocket client for OpenAI Realtime API
-            return OpenAIWebSocketClient(
-                async_get_clientsession(self.hass),
-                self._api_key,
-                self._api_url,
-                self._model,
-                self._prompt,
-                self._noise_reduction,
-            )
-
-        # Use HTTP client for OpenAI Transcription API
-        return OpenAIHTTPClient(
-            async_get_clientsession(self.hass),
-            self._api_key,
-            self._api_url,
-            self._model,
-            self._prompt,
-            self._temperature,
-        )
+        return [AudioChannels.CHANNEL_MONO, AudioChannels.CHANNEL_STEREO]
 
     async def async_process_audio_stream(
         self, metadata: SpeechMetadata, stream: AsyncIterable[bytes]
     ) -> SpeechResult:
         """Process audio stream using the configured method (HTTP or WebSocket)."""
-        client = self._create_client()
-        _LOGGER.debug(
-            "Processing audio stream with %s", client.__class__.__name__
-        )
-        return await client.async_process_audio_stream(metadata, stream)
+        return await self._transport.async_process_audio_stream(metadata, stream)
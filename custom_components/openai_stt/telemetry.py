@@ -0,0 +1,394 @@
+"""Tracing spans and metrics for OpenAI STT.
+
+Spans follow the OpenTelemetry data model and are handed to exporters
+when they end; the OTLP exporter sends them to a collector as OTLP/HTTP
+JSON. Metrics are kept in a registry that renders the Prometheus text
+format. When telemetry is disabled the clients get NOOP_TELEMETRY, whose
+methods do nothing.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from datetime import datetime, timedelta
+import logging
+import secrets
+import time
+from typing import Any, Final
+
+from aiohttp import ClientError, ClientSession, ClientTimeout
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+from homeassistant.helpers.event import async_track_time_interval
+
+_LOGGER = logging.getLogger(__name__)
+
+METRIC_PREFIX: Final = "openai_stt_"
+
+# Name, type and help text of the exported metrics
+METRICS: Final = {
+    "latency_seconds": (
+        "histogram",
+        "Time from the end of speech to the transcript.",
+    ),
+    "bytes_sent_total": ("counter", "Audio bytes sent to the API."),
+    "requests_total": ("counter", "Transcription requests."),
+    "errors_total": ("counter", "Transcription requests that failed."),
+    "queue_seconds": (
+        "histogram",
+        "Time utterances waited for a request slot.",
+    ),
+    "shed_total": ("counter", "Utterances rejected because the entry was overloaded."),
+}
+
+# Upper bounds of the latency histogram buckets (in seconds)
+LATENCY_BUCKETS: Final = (0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.5, 5.0, 10.0)
+
+# Interval between span exports
+OTLP_EXPORT_INTERVAL: Final = timedelta(seconds=5)
+
+# Spans kept for export; older ones are dropped when the collector is down
+OTLP_MAX_QUEUE: Final = 2048
+
+OTLP_TIMEOUT: Final = ClientTimeout(total=10)
+
+_STATUS_ERROR: Final = 2
+
+_current_span: ContextVar[Span | None] = ContextVar("openai_stt_span", default=None)
+
+
+class Span:
+    """A timed operation within a trace."""
+
+    __slots__ = (
+        "attributes",
+        "end_time",
+        "error",
+        "name",
+        "parent_id",
+        "span_id",
+        "start_time",
+        "trace_id",
+    )
+
+    def __init__(
+        self, name: str, attributes: dict[str, Any], parent: Span | None
+    ) -> None:
+        """Start the span."""
+        self.name = name
+        self.attributes = attributes
+        self.trace_id = parent.trace_id if parent else secrets.token_hex(16)
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent.span_id if parent else None
+        self.start_time = time.time_ns()
+        self.end_time: int | None = None
+        self.error: str | None = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Set an attribute of the span."""
+        self.attributes[key] = value
+
+    @property
+    def duration(self) -> float | None:
+        """Return the duration in seconds once the span has ended."""
+        if self.end_time is None:
+            return None
+        return (self.end_time - self.start_time) / 1e9
+
+
+def current_span() -> Span | None:
+    """Return the span the running code is part of."""
+    return _current_span.get()
+
+
+class TelemetryExporter:
+    """Receives spans as they end; the base class discards them."""
+
+    def export_span(self, span: Span) -> None:
+        """Take a finished span."""
+
+    def async_start(self, hass: HomeAssistant) -> None:
+        """Start exporting in the background."""
+
+    async def async_close(self) -> None:
+        """Export what is left and stop."""
+
+
+class InMemoryExporter(TelemetryExporter):
+    """Collects finished spans in memory, for inspection and tests."""
+
+    def __init__(self) -> None:
+        """Initialize the collector."""
+        self.spans: list[Span] = []
+
+    def export_span(self, span: Span) -> None:
+        """Keep the span."""
+        self.spans.append(span)
+
+
+def _otlp_value(value: Any) -> dict[str, Any]:
+    """Return an attribute value in OTLP JSON form."""
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_span(span: Span) -> dict[str, Any]:
+    """Return a span in OTLP JSON form."""
+    data: dict[str, Any] = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": 1,
+        "startTimeUnixNano": str(span.start_time),
+        "endTimeUnixNano": str(span.end_time),
+        "attributes": [
+            {"key": key, "value": _otlp_value(value)}
+            for key, value in span.attributes.items()
+        ],
+        "status": {},
+    }
+    if span.parent_id is not None:
+        data["parentSpanId"] = span.parent_id
+    if span.error is not None:
+        data["status"] = {"code": _STATUS_ERROR, "message": span.error}
+    return data
+
+
+class OtlpExporter(TelemetryExporter):
+    """Sends spans to an OpenTelemetry collector over OTLP/HTTP JSON."""
+
+    def __init__(
+        self, session: ClientSession, endpoint: str, service_name: str
+    ) -> None:
+        """Initialize the exporter; endpoint is the collector's base URL."""
+        self._session = session
+        self._url = f"{endpoint.rstrip('/')}/v1/traces"
+        self._resource = {
+            "attributes": [
+                {"key": "service.name", "value": {"stringValue": service_name}}
+            ]
+        }
+        self._queue: deque[Span] = deque(maxlen=OTLP_MAX_QUEUE)
+        self._unsub: CALLBACK_TYPE | None = None
+        self.dropped = 0
+
+    def export_span(self, span: Span) -> None:
+        """Queue the span for the next export."""
+        if len(self._queue) == self._queue.maxlen:
+            self.dropped += 1
+        self._queue.append(span)
+
+    def async_start(self, hass: HomeAssistant) -> None:
+        """Export queued spans periodically."""
+        self._unsub = async_track_time_interval(
+            hass, self._async_export, OTLP_EXPORT_INTERVAL
+        )
+
+    async def async_close(self) -> None:
+        """Stop exporting periodically and send the remaining spans."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+        await self.async_export()
+
+    async def _async_export(self, now: datetime | None = None) -> None:
+        """Export on the timer."""
+        await self.async_export()
+
+    async def async_export(self) -> None:
+        """Send the queued spans to the collector."""
+        if not self._queue:
+            return
+        spans = list(self._queue)
+        self._queue.clear()
+        payload = {
+            "resourceSpans": [
+                {
+                    "resource": self._resource,
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": __package__},
+                            "spans": [_otlp_span(span) for span in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+        try:
+            response = await self._session.post(
+                self._url, json=payload, timeout=OTLP_TIMEOUT
+            )
+            response.release()
+            response.raise_for_status()
+        except (ClientError, TimeoutError) as err:
+            _LOGGER.debug("Exporting %d spans failed: %s", len(spans), err)
+
+
+class MetricsRegistry:
+    """Counters and histograms, rendered in the Prometheus text format."""
+
+    def __init__(self) -> None:
+        """Initialize the registry."""
+        self._counters: dict[tuple[str, tuple], float] = {}
+        # Bucket counts followed by the sum and the count
+        self._histograms: dict[tuple[str, tuple], list[float]] = {}
+
+    def count(self, name: str, value: float, labels: Mapping[str, str]) -> None:
+        """Add to a counter."""
+        key = (name, tuple(labels.items()))
+        self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, labels: Mapping[str, str]) -> None:
+        """Add an observation to a histogram."""
+        key = (name, tuple(labels.items()))
+        if (histogram := self._histograms.get(key)) is None:
+            histogram = self._histograms[key] = [0.0] * (len(LATENCY_BUCKETS) + 2)
+        for index, bound in enumerate(LATENCY_BUCKETS):
+            if value <= bound:
+                histogram[index] += 1
+        histogram[-2] += value
+        histogram[-1] += 1
+
+    def render(self, extra_labels: Mapping[str, str] | None = None) -> list[str]:
+        """Return the samples in the Prometheus text format."""
+        extra = tuple((extra_labels or {}).items())
+        lines = []
+        for name, labels in sorted(self._counters):
+            value = self._counters[name, labels]
+            lines.append(f"{METRIC_PREFIX}{name}{_labels(extra + labels)} {value:g}")
+        for name, labels in sorted(self._histograms):
+            histogram = self._histograms[name, labels]
+            base = f"{METRIC_PREFIX}{name}"
+            bounds = [f"{bound:g}" for bound in LATENCY_BUCKETS] + ["+Inf"]
+            counts = histogram[: len(LATENCY_BUCKETS)] + histogram[-1:]
+            for bound, count in zip(bounds, counts, strict=True):
+                bucket_labels = _labels(extra + labels + (("le", bound),))
+                lines.append(f"{base}_bucket{bucket_labels} {count:g}")
+            lines.append(f"{base}_sum{_labels(extra + labels)} {histogram[-2]:g}")
+            lines.append(f"{base}_count{_labels(extra + labels)} {histogram[-1]:g}")
+        return lines
+
+
+def _labels(labels: tuple[tuple[str, str], ...]) -> str:
+    """Return a Prometheus label set."""
+    if not labels:
+        return ""
+    return (
+        "{"
+        + ",".join(f'{key}="{_escape(value)}"' for key, value in labels)
+        + "}"
+    )
+
+
+def _escape(value: str) -> str:
+    """Escape a Prometheus label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_metrics(samples: list[str]) -> str:
+    """Return a Prometheus exposition with the metric headers."""
+    lines = []
+    for name, (metric_type, help_text) in METRICS.items():
+        lines.append(f"# HELP {METRIC_PREFIX}{name} {help_text}")
+        lines.append(f"# TYPE {METRIC_PREFIX}{name} {metric_type}")
+    lines.extend(samples)
+    return "\n".join(lines) + "\n"
+
+
+class Telemetry:
+    """Creates spans and records metrics for the clients of an entry."""
+
+    enabled = True
+
+    def __init__(
+        self,
+        exporters: list[TelemetryExporter],
+        metrics: MetricsRegistry | None = None,
+    ) -> None:
+        """Initialize telemetry."""
+        self._exporters = exporters
+        self._metrics = metrics
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span | None]:
+        """Time the enclosed block as a child of the current span."""
+        span = Span(name, attributes, _current_span.get())
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as err:
+            span.error = type(err).__name__ if not str(err) else str(err)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end_time = time.time_ns()
+            for exporter in self._exporters:
+                exporter.export_span(span)
+
+    def add_span(self, name: str, duration: float, **attributes: Any) -> None:
+        """Record a child of the current span that ended just now."""
+        span = Span(name, attributes, _current_span.get())
+        span.end_time = time.time_ns()
+        span.start_time = span.end_time - int(duration * 1e9)
+        for exporter in self._exporters:
+            exporter.export_span(span)
+
+    def count(self, name: str, value: float, labels: Mapping[str, str]) -> None:
+        """Add to a counter."""
+        if self._metrics is not None:
+            self._metrics.count(name, value, labels)
+
+    def observe(self, name: str, value: float, labels: Mapping[str, str]) -> None:
+        """Add an observation to a histogram."""
+        if self._metrics is not None:
+            self._metrics.observe(name, value, labels)
+
+    def record_request(
+        self, labels: Mapping[str, str], success: bool, latency: float | None
+    ) -> None:
+        """Count a finished request and record its latency after speech."""
+        self.count("requests_total", 1, labels)
+        if not success:
+            self.count("errors_total", 1, labels)
+        elif latency is not None:
+            self.observe("latency_seconds", latency, labels)
+
+
+class _NoopTelemetry(Telemetry):
+    """Telemetry that records nothing."""
+
+    enabled = False
+
+    def __init__(self) -> None:
+        """Initialize telemetry."""
+        super().__init__([])
+        self._span = nullcontext()
+
+    def span(self, name: str, **attributes: Any) -> Any:
+        """Return a context that does nothing."""
+        return self._span
+
+    def add_span(self, name: str, duration: float, **attributes: Any) -> None:
+        """Do nothing."""
+
+    def count(self, name: str, value: float, labels: Mapping[str, str]) -> None:
+        """Do nothing."""
+
+    def observe(self, name: str, value: float, labels: Mapping[str, str]) -> None:
+        """Do nothing."""
+
+    def record_request(
+        self, labels: Mapping[str, str], success: bool, latency: float | None
+    ) -> None:
+        """Do nothing."""
+
+
+NOOP_TELEMETRY: Final = _NoopTelemetry()
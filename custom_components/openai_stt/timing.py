@@ -0,0 +1,120 @@
+"""Per-request stage timings for OpenAI STT."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import AsyncIterable, AsyncIterator, Callable
+from dataclasses import dataclass, field, fields
+import time
+from typing import Any, Final
+
+from homeassistant.core import CALLBACK_TYPE, callback
+
+# Number of recent requests the rolling percentiles are computed from
+TIMING_WINDOW: Final = 200
+
+# Number of recent requests listed in full in diagnostics
+DIAGNOSTICS_RECENT: Final = 10
+
+
+@dataclass
+class StageTimings:
+    """Stage durations of one request in seconds; None if not measured.
+
+    collect: from the first audio chunk to the end of the audio
+    encode: encoding the upload file
+    upload: sending the audio after it ended, including network time
+    first_byte: from sending the request, or from the end of the audio
+        when it streams, to the first response from the server
+    server: processing time on the server
+    parse: reading and decoding the transcript
+    total: from the end of the audio to the transcript
+    """
+
+    collect: float | None = None
+    encode: float | None = None
+    upload: float | None = None
+    first_byte: float | None = None
+    server: float | None = None
+    parse: float | None = None
+    total: float | None = None
+    # perf_counter time at which the audio ended
+    audio_end: float | None = field(default=None, repr=False, compare=False)
+
+    async def track_audio(self, stream: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+        """Pass the audio through, noting when it starts and ends."""
+        start = None
+        async for chunk in stream:
+            if start is None:
+                start = time.perf_counter()
+            yield chunk
+        self.audio_end = time.perf_counter()
+        if start is not None:
+            self.collect = self.audio_end - start
+
+    def finish(self) -> None:
+        """Set the total from the end of the audio to now."""
+        if self.audio_end is not None:
+            self.total = time.perf_counter() - self.audio_end
+
+
+STAGES: Final = tuple(
+    stage.name for stage in fields(StageTimings) if stage.name != "audio_end"
+)
+
+
+class TimingStats:
+    """Ring buffer of the stage timings of recent requests."""
+
+    def __init__(self, window: int = TIMING_WINDOW) -> None:
+        """Initialize the buffer."""
+        self._timings: deque[StageTimings] = deque(maxlen=window)
+        self._listeners: list[Callable[[], None]] = []
+        self.requests = 0
+
+    def record(self, timings: StageTimings) -> None:
+        """Add the timings of a finished request."""
+        self._timings.append(timings)
+        self.requests += 1
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    @callback
+    def async_add_listener(self, update_callback: Callable[[], None]) -> CALLBACK_TYPE:
+        """Call update_callback after each recorded request."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.remove(update_callback)
+
+        return remove_listener
+
+    def percentile(self, stage: str, percentile: int) -> float | None:
+        """Return a percentile of a stage over the recent requests."""
+        values = sorted(
+            value
+            for timings in self._timings
+            if (value := getattr(timings, stage)) is not None
+        )
+        if not values:
+            return None
+        return values[min(len(values) * percentile // 100, len(values) - 1)]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the percentiles and the most recent timings."""
+        return {
+            "requests": self.requests,
+            "window": len(self._timings),
+            "stages": {
+                stage: {
+                    "p50": self.percentile(stage, 50),
+                    "p95": self.percentile(stage, 95),
+                }
+                for stage in STAGES
+            },
+            "recent": [
+                {stage: getattr(timings, stage) for stage in STAGES}
+                for timings in list(self._timings)[-DIAGNOSTICS_RECENT:]
+            ],
+        }
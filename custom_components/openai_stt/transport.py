@@ -0,0 +1,635 @@
+"""Long-lived per-entry transport for OpenAI STT."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterable, AsyncIterator, Mapping
+from dataclasses import dataclass, replace
+from functools import partial
+import logging
+from typing import Any
+
+from homeassistant.components.stt import (
+    SpeechMetadata,
+    SpeechResult,
+    SpeechResultState,
+)
+from homeassistant.const import CONF_API_KEY
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .admission import AdmissionController
+from .cache import TranscriptCache
+from .const import (
+    CONF_API_KEYS,
+    CONF_API_URL,
+    CONF_BACKENDS,
+    CONF_CACHE_PERSISTENT,
+    CONF_CACHE_SIZE,
+    CONF_CACHE_TTL,
+    CONF_EARLY_FINALIZE,
+    CONF_HEDGE_API_URL,
+    CONF_HEDGE_PERCENTILE,
+    CONF_HEDGE_PROTOCOL,
+    CONF_MAX_IN_FLIGHT,
+    CONF_MAX_QUEUE,
+    CONF_MAX_RETRIES,
+    CONF_MODEL,
+    CONF_NOISE_REDUCTION,
+    CONF_OTLP_ENDPOINT,
+    CONF_PARTIAL_EVENTS,
+    CONF_PROMETHEUS_METRICS,
+    CONF_PROMPT,
+    CONF_QUEUE_TIMEOUT,
+    CONF_REALTIME,
+    CONF_REALTIME_FRAME_MS,
+    CONF_REALTIME_PERSISTENT,
+    CONF_REALTIME_POOL_SIZE,
+    CONF_SEGMENT_LENGTH,
+    CONF_SEGMENT_WORKERS,
+    CONF_SILENCE_PADDING,
+    CONF_SILENCE_THRESHOLD,
+    CONF_SPECULATIVE_REQUESTS,
+    CONF_STREAMING_UPLOAD,
+    CONF_TEMPERATURE,
+    CONF_TRIM_SILENCE,
+    CONF_UPLOAD_CODEC,
+    CONF_VAD_CALIBRATION,
+    CONF_VAD_PREFIX_PADDING,
+    CONF_VAD_SILENCE_DURATION,
+    CONF_VAD_THRESHOLD,
+    DEFAULT_API_KEYS,
+    DEFAULT_API_URL,
+    DEFAULT_BACKENDS,
+    DEFAULT_CACHE_PERSISTENT,
+    DEFAULT_CACHE_SIZE,
+    DEFAULT_CACHE_TTL,
+    DEFAULT_EARLY_FINALIZE,
+    DEFAULT_HEDGE_API_URL,
+    DEFAULT_HEDGE_PERCENTILE,
+    DEFAULT_HEDGE_PROTOCOL,
+    DEFAULT_MAX_IN_FLIGHT,
+    DEFAULT_MAX_QUEUE,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_MODEL,
+    DEFAULT_NOISE_REDUCTION,
+    DEFAULT_OTLP_ENDPOINT,
+    DEFAULT_PARTIAL_EVENTS,
+    DEFAULT_PROMETHEUS_METRICS,
+    DEFAULT_PROMPT,
+    DEFAULT_QUEUE_TIMEOUT,
+    DEFAULT_REALTIME,
+    DEFAULT_REALTIME_FRAME_MS,
+    DEFAULT_REALTIME_PERSISTENT,
+    DEFAULT_REALTIME_POOL_SIZE,
+    DEFAULT_SEGMENT_LENGTH,
+    DEFAULT_SEGMENT_WORKERS,
+    DEFAULT_SILENCE_PADDING,
+    DEFAULT_SILENCE_THRESHOLD,
+    DEFAULT_SPECULATIVE_REQUESTS,
+    DEFAULT_STREAMING_UPLOAD,
+    DEFAULT_TEMPERATURE,
+    DEFAULT_TRIM_SILENCE,
+    DEFAULT_UPLOAD_CODEC,
+    DEFAULT_VAD_CALIBRATION,
+    DEFAULT_VAD_PREFIX_PADDING,
+    DEFAULT_VAD_SILENCE_DURATION,
+    DEFAULT_VAD_THRESHOLD,
+    DOMAIN,
+    EVENT_PARTIAL_TRANSCRIPT,
+)
+from .finalize import EarlyFinalizeStats
+from .hedging import HedgedTranscriber
+from .http_client import OpenAIHTTPClient
+from .partial import PartialTranscript, PartialTranscripts
+from .ratelimit import RateLimiter, parse_api_keys
+from .realtime_session import PersistentRealtimeSession
+from .retry import RetryStats
+from .router import Backend, BackendRouter, parse_backends
+from .speculation import SpeculationStats
+from .telemetry import (
+    NOOP_TELEMETRY,
+    MetricsRegistry,
+    OtlpExporter,
+    Telemetry,
+    TelemetryExporter,
+)
+from .timing import TimingStats
+from .turn_detection import DEFAULT_TURN_DETECTION, TurnCalibrator, TurnDetectionConfig
+from .vad import SilenceTrimConfig
+from .websocket_client import OpenAIWebSocketClient
+from .websocket_pool import POOL_MAX_IDLE, RealtimeSessionPool
+
+_LOGGER = logging.getLogger(__name__)
+
+Client = OpenAIHTTPClient | OpenAIWebSocketClient
+
+
+@dataclass(frozen=True)
+class TransportOptions:
+    """Settings of a config entry that shape its requests."""
+
+    api_key: str
+    # Further keys requests rotate across
+    api_keys: tuple[str, ...] = ()
+    api_url: str = DEFAULT_API_URL
+    model: str = DEFAULT_MODEL
+    prompt: str = DEFAULT_PROMPT
+    temperature: float = DEFAULT_TEMPERATURE
+    realtime: bool = DEFAULT_REALTIME
+    noise_reduction: str = DEFAULT_NOISE_REDUCTION
+    streaming_upload: bool = DEFAULT_STREAMING_UPLOAD
+    realtime_pool_size: int = DEFAULT_REALTIME_POOL_SIZE
+    realtime_persistent: bool = DEFAULT_REALTIME_PERSISTENT
+    silence_trim: SilenceTrimConfig | None = None
+    upload_codec: str = DEFAULT_UPLOAD_CODEC
+    realtime_frame_ms: int = DEFAULT_REALTIME_FRAME_MS
+    partial_events: bool = DEFAULT_PARTIAL_EVENTS
+    early_finalize: bool = DEFAULT_EARLY_FINALIZE
+    turn_detection: TurnDetectionConfig = DEFAULT_TURN_DETECTION
+    vad_calibration: bool = DEFAULT_VAD_CALIBRATION
+    hedge_protocol: str = DEFAULT_HEDGE_PROTOCOL
+    hedge_api_url: str = DEFAULT_API_URL
+    hedge_percentile: int = DEFAULT_HEDGE_PERCENTILE
+    max_retries: int = DEFAULT_MAX_RETRIES
+    speculative_requests: int = DEFAULT_SPECULATIVE_REQUESTS
+    segment_length: int = DEFAULT_SEGMENT_LENGTH
+    segment_workers: int = DEFAULT_SEGMENT_WORKERS
+    backends: tuple[Backend, ...] = ()
+    cache_size: int = DEFAULT_CACHE_SIZE
+    cache_persistent: bool = DEFAULT_CACHE_PERSISTENT
+    cache_ttl: int = DEFAULT_CACHE_TTL
+    otlp_endpoint: str = DEFAULT_OTLP_ENDPOINT
+    prometheus_metrics: bool = DEFAULT_PROMETHEUS_METRICS
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT
+    max_queue: int = DEFAULT_MAX_QUEUE
+    queue_timeout: float = DEFAULT_QUEUE_TIMEOUT
+
+    @classmethod
+    def from_config(cls, config: Mapping[str, Any]) -> TransportOptions:
+        """Create the options from config entry data and options."""
+        api_url = config.get(CONF_API_URL, DEFAULT_API_URL)
+        silence_trim = None
+        if config.get(CONF_TRIM_SILENCE, DEFAULT_TRIM_SILENCE):
+            silence_trim = SilenceTrimConfig(
+                config.get(CONF_SILENCE_THRESHOLD, DEFAULT_SILENCE_THRESHOLD),
+                config.get(CONF_SILENCE_PADDING, DEFAULT_SILENCE_PADDING),
+            )
+        try:
+            backends = parse_backends(config.get(CONF_BACKENDS, DEFAULT_BACKENDS))
+        except ValueError as err:
+            _LOGGER.error("Ignoring additional backends: %s", err)
+            backends = []
+
+        return cls(
+            api_key=config[CONF_API_KEY],
+            api_keys=tuple(parse_api_keys(config.get(CONF_API_KEYS, DEFAULT_API_KEYS))),
+            api_url=api_url,
+            model=config.get(CONF_MODEL, DEFAULT_MODEL),
+            prompt=config.get(CONF_PROMPT, DEFAULT_PROMPT),
+            temperature=config.get(CONF_TEMPERATURE, DEFAULT_TEMPERATURE),
+            realtime=config.get(CONF_REALTIME, DEFAULT_REALTIME),
+            noise_reduction=config.get(CONF_NOISE_REDUCTION, DEFAULT_NOISE_REDUCTION),
+            streaming_upload=config.get(
+                CONF_STREAMING_UPLOAD, DEFAULT_STREAMING_UPLOAD
+            ),
+            realtime_pool_size=config.get(
+                CONF_REALTIME_POOL_SIZE, DEFAULT_REALTIME_POOL_SIZE
+            ),
+            realtime_persistent=config.get(
+                CONF_REALTIME_PERSISTENT, DEFAULT_REALTIME_PERSISTENT
+            ),
+            silence_trim=silence_trim,
+            upload_codec=config.get(CONF_UPLOAD_CODEC, DEFAULT_UPLOAD_CODEC),
+            realtime_frame_ms=config.get(
+                CONF_REALTIME_FRAME_MS, DEFAULT_REALTIME_FRAME_MS
+            ),
+            partial_events=config.get(CONF_PARTIAL_EVENTS, DEFAULT_PARTIAL_EVENTS),
+            early_finalize=config.get(CONF_EARLY_FINALIZE, DEFAULT_EARLY_FINALIZE),
+            turn_detection=TurnDetectionConfig(
+                config.get(CONF_VAD_THRESHOLD, DEFAULT_VAD_THRESHOLD),
+                config.get(CONF_VAD_PREFIX_PADDING, DEFAULT_VAD_PREFIX_PADDING),
+                config.get(CONF_VAD_SILENCE_DURATION, DEFAULT_VAD_SILENCE_DURATION),
+            ),
+            vad_calibration=config.get(CONF_VAD_CALIBRATION, DEFAULT_VAD_CALIBRATION),
+            hedge_protocol=config.get(CONF_HEDGE_PROTOCOL, DEFAULT_HEDGE_PROTOCOL),
+            hedge_api_url=(
+                config.get(CONF_HEDGE_API_URL, DEFAULT_HEDGE_API_URL) or api_url
+            ),
+            hedge_percentile=config.get(
+                CONF_HEDGE_PERCENTILE, DEFAULT_HEDGE_PERCENTILE
+            ),
+            max_retries=config.get(CONF_MAX_RETRIES, DEFAULT_MAX_RETRIES),
+            speculative_requests=config.get(
+                CONF_SPECULATIVE_REQUESTS, DEFAULT_SPECULATIVE_REQUESTS
+            ),
+            segment_length=config.get(CONF_SEGMENT_LENGTH, DEFAULT_SEGMENT_LENGTH),
+            segment_workers=config.get(CONF_SEGMENT_WORKERS, DEFAULT_SEGMENT_WORKERS),
+            backends=tuple(backends),
+            cache_size=config.get(CONF_CACHE_SIZE, DEFAULT_CACHE_SIZE),
+            cache_persistent=config.get(
+                CONF_CACHE_PERSISTENT, DEFAULT_CACHE_PERSISTENT
+            ),
+            cache_ttl=config.get(CONF_CACHE_TTL, DEFAULT_CACHE_TTL),
+            otlp_endpoint=config.get(CONF_OTLP_ENDPOINT, DEFAULT_OTLP_ENDPOINT).strip(),
+            prometheus_metrics=config.get(
+                CONF_PROMETHEUS_METRICS, DEFAULT_PROMETHEUS_METRICS
+            ),
+            max_in_flight=config.get(CONF_MAX_IN_FLIGHT, DEFAULT_MAX_IN_FLIGHT),
+            max_queue=config.get(CONF_MAX_QUEUE, DEFAULT_MAX_QUEUE),
+            queue_timeout=config.get(CONF_QUEUE_TIMEOUT, DEFAULT_QUEUE_TIMEOUT),
+        )
+
+
+def _session_settings(options: TransportOptions) -> tuple:
+    """Return the settings the pre-warmed realtime sessions depend on."""
+    return (
+        options.api_key,
+        options.api_keys,
+        options.api_url,
+        options.model,
+        options.prompt,
+        options.noise_reduction,
+        options.realtime,
+        options.realtime_pool_size,
+        options.realtime_persistent,
+        options.turn_detection,
+        options.vad_calibration,
+    )
+
+
+def _cache_settings(options: TransportOptions) -> tuple:
+    """Return the settings the transcript cache depends on."""
+    return (options.cache_size, options.cache_ttl, options.cache_persistent)
+
+
+def _telemetry_settings(options: TransportOptions) -> tuple:
+    """Return the settings the telemetry depends on."""
+    return (options.otlp_endpoint, options.prometheus_metrics)
+
+
+class OpenAISTTTransport:
+    """The clients and connection state of a config entry.
+
+    The clients, with their precomputed headers and serialized realtime
+    session configurations, are kept across utterances. Changed options
+    are applied in place: clients are replaced for the next utterance,
+    while pre-warmed realtime sessions, backend history, hedge latencies
+    and cached transcripts are only reset when a setting they depend on
+    changed. Requests in flight finish with the clients they started with,
+    and new limits on concurrent requests apply to those already queued.
+    Stage timings of the requests are kept for the sensors and diagnostics,
+    and spans and metrics go to the configured telemetry.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, entry_id: str, options: TransportOptions
+    ) -> None:
+        """Initialize the transport."""
+        self._hass = hass
+        self._entry_id = entry_id
+        self.options = options
+        self.retry_stats = RetryStats()
+        self.speculation_stats = SpeculationStats()
+        self.timing_stats = TimingStats()
+        self.rate_limiter = RateLimiter([options.api_key, *options.api_keys])
+        self.partials = PartialTranscripts()
+        self.early_finalize = EarlyFinalizeStats()
+        self.metrics = MetricsRegistry()
+        self.telemetry: Telemetry = NOOP_TELEMETRY
+        self._exporter: TelemetryExporter | None = None
+        self.hedger: HedgedTranscriber | None = None
+        self.router: BackendRouter | None = None
+        self.cache: TranscriptCache | None = None
+        self.admission: AdmissionController | None = None
+        self.turn_calibrator: TurnCalibrator | None = None
+        self._pool: RealtimeSessionPool | None = None
+        self._session: PersistentRealtimeSession | None = None
+        self._clients: dict[tuple[str, str], Client] = {}
+        self._hedge_client: Client | None = None
+
+    async def async_start(self) -> None:
+        """Create the clients and start pre-warming realtime sessions."""
+        await self._async_apply(None, self.options)
+
+    async def async_stop(self) -> None:
+        """Stop probing backends and close realtime sessions."""
+        if self.router is not None:
+            self.router.async_stop()
+            self.router = None
+        await self._async_close_sessions()
+        await self._async_close_exporter()
+
+    async def async_update_options(self, options: TransportOptions) -> None:
+        """Apply changed options without dropping unaffected state."""
+        if options == self.options:
+            return
+        old, self.options = self.options, options
+        _LOGGER.debug("Applying changed options for entry %s", self._entry_id)
+        await self._async_apply(old, options)
+
+    async def _async_apply(
+        self, old: TransportOptions | None, new: TransportOptions
+    ) -> None:
+        """Bring the transport state in line with the options."""
+        if old is None or _cache_settings(old) != _cache_settings(new):
+            self.cache = None
+            if new.cache_size > 0:
+                cache = TranscriptCache(
+                    self._hass,
+                    self._entry_id,
+                    new.cache_size,
+                    new.cache_ttl * 3600,
+                    new.cache_persistent,
+                )
+                await cache.async_load()
+                self.cache = cache
+
+        if not new.vad_calibration:
+            self.turn_calibrator = None
+        elif self.turn_calibrator is None:
+            calibrator = TurnCalibrator(
+                self._hass, self._entry_id, new.turn_detection
+            )
+            await calibrator.async_load()
+            self.turn_calibrator = calibrator
+        else:
+            # Keep what was learned; only the configured limits change
+            self.turn_calibrator.config = new.turn_detection
+
+        if old is None or _telemetry_settings(old) != _telemetry_settings(new):
+            await self._async_close_exporter()
+            exporters: list[TelemetryExporter] = []
+            if new.otlp_endpoint:
+                self._exporter = OtlpExporter(
+                    async_get_clientsession(self._hass), new.otlp_endpoint, DOMAIN
+                )
+                self._exporter.async_start(self._hass)
+                exporters.append(self._exporter)
+            metrics = self.metrics if new.prometheus_metrics else None
+            self.telemetry = (
+                Telemetry(exporters, metrics)
+                if exporters or metrics is not None
+                else NOOP_TELEMETRY
+            )
+
+        self.rate_limiter.update_keys([new.api_key, *new.api_keys])
+        self.partials.on_partial = (
+            self._async_fire_partial if new.partial_events else None
+        )
+
+        if new.max_in_flight <= 0:
+            self.admission = None
+        elif self.admission is None:
+            self.admission = AdmissionController(
+                new.max_in_flight, new.max_queue, new.queue_timeout
+            )
+        else:
+            self.admission.update(new.max_in_flight, new.max_queue, new.queue_timeout)
+
+        if new.hedge_protocol == "off":
+            self.hedger = None
+        elif self.hedger is None:
+            self.hedger = HedgedTranscriber(new.hedge_percentile)
+        else:
+            self.hedger.percentile = new.hedge_percentile
+
+        if not new.backends:
+            if self.router is not None:
+                self.router.async_stop()
+                self.router = None
+        else:
+            # Copies, so that the options are not changed by the router
+            backends = [
+                Backend(new.api_url, new.model),
+                *(replace(backend) for backend in new.backends),
+            ]
+            if self.router is None:
+                self.router = BackendRouter(self._hass, new.api_key, backends)
+                self.router.async_start()
+            else:
+                self.router.update(new.api_key, backends)
+
+        if old is None or _session_settings(old) != _session_settings(new):
+            await self._async_close_sessions()
+            if new.realtime and new.realtime_persistent:
+                self._session = PersistentRealtimeSession(
+                    self._create_client(new.realtime, new.api_url, new.model),
+                    self._hass.config.language,
+                )
+                self._session.async_start()
+            elif new.realtime and new.realtime_pool_size > 0:
+                self._pool = RealtimeSessionPool(
+                    self._create_client(new.realtime, new.api_url, new.model),
+                    new.realtime_pool_size,
+                    POOL_MAX_IDLE,
+                    self._hass.config.language,
+                )
+                self._pool.async_start()
+        elif self._session is not None or self._pool is not None:
+            # The sockets are kept, but audio goes out in the new frame size
+            # and is reported to the new telemetry
+            client = self._create_client(new.realtime, new.api_url, new.model)
+            if self._session is not None:
+                self._session.client = client
+            if self._pool is not None:
+                self._pool.client = client
+
+        # New clients are created on demand for the next utterance
+        self._clients = {}
+        self._hedge_client = None
+
+    async def _async_close_exporter(self) -> None:
+        """Send the remaining spans and stop exporting."""
+        if self._exporter is not None:
+            await self._exporter.async_close()
+            self._exporter = None
+
+    async def _async_close_sessions(self) -> None:
+        """Close any pre-warmed realtime sessions."""
+        if self._session is not None:
+            await self._session.async_close()
+            self._session = None
+        if self._pool is not None:
+            await self._pool.async_close()
+            self._pool = None
+
+    def _create_client(
+        self, realtime: bool, api_url: str, model: str, shared_sessions: bool = False
+    ) -> Client:
+        """Create a client for an API URL and model.
+
+        With shared_sessions set, the client uses the pre-warmed or
+        persistent realtime sessions.
+        """
+        options = self.options
+        # The key budgets only apply to the API the keys belong to
+        rate_limiter = self.rate_limiter if api_url == options.api_url else None
+        if realtime:
+            # Use WebSocket client for OpenAI Realtime API
+            return OpenAIWebSocketClient(
+                async_get_clientsession(self._hass),
+                options.api_key,
+                api_url,
+                model,
+                options.prompt,
+                options.noise_reduction,
+                self._pool if shared_sessions else None,
+                self._session if shared_sessions else None,
+                silence_trim=options.silence_trim,
+                frame_ms=options.realtime_frame_ms,
+                timing_stats=self.timing_stats,
+                telemetry=self.telemetry,
+                rate_limiter=rate_limiter,
+                partials=self.partials,
+                early_finalize=(
+                    self.early_finalize if options.early_finalize else None
+                ),
+                turn_detection=options.turn_detection,
+                turn_calibrator=self.turn_calibrator,
+            )
+
+        # Use HTTP client for OpenAI Transcription API
+        return OpenAIHTTPClient(
+            async_get_clientsession(self._hass),
+            options.api_key,
+            api_url,
+            model,
+            options.prompt,
+            options.temperature,
+            options.streaming_upload,
+            silence_trim=options.silence_trim,
+            upload_codec=options.upload_codec,
+            max_retries=options.max_retries,
+            retry_stats=self.retry_stats,
+            speculative_requests=options.speculative_requests,
+            speculation_stats=self.speculation_stats,
+            segment_length=options.segment_length,
+            segment_workers=options.segment_workers,
+            timing_stats=self.timing_stats,
+            telemetry=self.telemetry,
+            rate_limiter=rate_limiter,
+        )
+
+    @callback
+    def _async_fire_partial(self, event: PartialTranscript) -> None:
+        """Fire a partial transcript on the event bus."""
+        self._hass.bus.async_fire(
+            EVENT_PARTIAL_TRANSCRIPT,
+            {
+                "entry_id": self._entry_id,
+                "utterance_id": event.utterance_id,
+                "text": event.text,
+                "final": event.final,
+            },
+        )
+
+    async def async_iter_partials(self) -> AsyncIterator[PartialTranscript]:
+        """Yield the partial transcripts of realtime utterances."""
+        async for event in self.partials.async_iter():
+            yield event
+
+    def _client(self, backend: Backend | None = None) -> Client:
+        """Return the client for a backend, or for the main API URL."""
+        options = self.options
+        key = (
+            (backend.api_url, backend.model)
+            if backend is not None
+            else (options.api_url, options.model)
+        )
+        if (client := self._clients.get(key)) is None:
+            client = self._clients[key] = self._create_client(
+                options.realtime,
+                *key,
+                shared_sessions=key == (options.api_url, options.model),
+            )
+        return client
+
+    def _hedge(self) -> Client:
+        """Return the client for hedge requests."""
+        if self._hedge_client is None:
+            options = self.options
+            self._hedge_client = self._create_client(
+                options.hedge_protocol == "realtime",
+                options.hedge_api_url,
+                options.model,
+            )
+        return self._hedge_client
+
+    async def async_process_audio_stream(
+        self, metadata: SpeechMetadata, stream: AsyncIterable[bytes]
+    ) -> SpeechResult:
+        """Transcribe an utterance, subject to admission control."""
+        options = self.options
+        with self.telemetry.span(
+            "utterance",
+            language=metadata.language,
+            protocol="realtime" if options.realtime else "http",
+            model=options.model,
+        ) as span:
+            if (admission := self.admission) is None:
+                result = await self._async_transcribe_cached(metadata, stream)
+            else:
+                result = await admission.async_transcribe(
+                    metadata, stream, self._async_transcribe_cached, self.telemetry
+                )
+            if span is not None and result.result != SpeechResultState.SUCCESS:
+                span.error = "Transcription failed"
+        return result
+
+    async def _async_transcribe_cached(
+        self, metadata: SpeechMetadata, stream: AsyncIterable[bytes]
+    ) -> SpeechResult:
+        """Transcribe through the cache, if enabled.
+
+        The backend is chosen first, as the transcript depends on it.
+        """
+        router = self.router
+        backend = router.select() if router is not None else None
+        transcribe = partial(self._async_transcribe, backend)
+        if (cache := self.cache) is None:
+            return await transcribe(metadata, stream)
+        options = self.options
+        api_url, model = (
+            (backend.api_url, backend.model)
+            if backend is not None
+            else (options.api_url, options.model)
+        )
+        return await cache.async_transcribe(
+            metadata,
+            stream,
+            transcribe,
+            (
+                api_url,
+                model,
+                options.prompt,
+                options.temperature,
+                options.realtime,
+                options.noise_reduction,
+                options.silence_trim,
+                options.upload_codec,
+            ),
+        )
+
+    async def _async_transcribe(
+        self,
+        backend: Backend | None,
+        metadata: SpeechMetadata,
+        stream: AsyncIterable[bytes],
+    ) -> SpeechResult:
+        """Transcribe on a backend with hedging as configured."""
+        router = self.router
+        client = self._client(backend)
+        _LOGGER.debug(
+            "Processing audio stream with %s", client.__class__.__name__
+        )
+        transcribe = client.async_process_audio_stream
+        if router is not None and backend is not None:
+            transcribe = partial(router.async_transcribe, backend, transcribe)
+        if (hedger := self.hedger) is not None:
+            return await hedger.async_transcribe(
+                metadata,
+                stream,
+                transcribe,
+                self._hedge().async_process_audio_stream,
+            )
+        return await transcribe(metadata, stream)
@@ -0,0 +1,205 @@
+"""Server VAD turn detection settings and calibration for OpenAI STT."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import AsyncIterable, AsyncIterator
+from dataclasses import asdict, dataclass, replace
+import logging
+import math
+from typing import Any, Final
+
+import numpy as np
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DEFAULT_VAD_PREFIX_PADDING,
+    DEFAULT_VAD_SILENCE_DURATION,
+    DEFAULT_VAD_THRESHOLD,
+    DOMAIN,
+)
+from .vad import FRAME_MS, frame_energy_db
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION: Final = 1
+
+# Delay before learned parameters are written to disk (in seconds)
+DISK_SAVE_DELAY: Final = 60
+
+# Utterances the pause length is learned from
+RECENT_UTTERANCES: Final = 20
+
+# Utterances needed before the silence duration is tightened
+MIN_UTTERANCES: Final = 5
+
+# Shortest silence duration calibration sets (in milliseconds)
+MIN_SILENCE_MS: Final = 200
+
+# Margin over the longest recent pause within an utterance
+PAUSE_MARGIN: Final = 1.5
+
+# Level above the noise floor at which audio counts as speech (in dB)
+SPEECH_MARGIN_DB: Final = 12.0
+
+# Noise floor above which pauses cannot be told from noise reliably, so
+# the silence duration is left alone (in dBFS)
+MAX_NOISE_FLOOR_DB: Final = -35.0
+
+# Weight of the newest utterance in the noise floor
+NOISE_SMOOTHING: Final = 0.2
+
+# Percentile of an utterance's frame levels taken as its noise floor
+_NOISE_PERCENTILE: Final = 10
+
+
+@dataclass(frozen=True)
+class TurnDetectionConfig:
+    """Server VAD settings of a realtime transcription session."""
+
+    threshold: float
+    prefix_padding_ms: int
+    silence_duration_ms: int
+
+    def as_session_dict(self) -> dict[str, Any]:
+        """Return the turn_detection object of the session configuration."""
+        return {
+            "type": "server_vad",
+            "prefix_padding_ms": self.prefix_padding_ms,
+            "silence_duration_ms": self.silence_duration_ms,
+            "threshold": self.threshold,
+        }
+
+
+DEFAULT_TURN_DETECTION: Final = TurnDetectionConfig(
+    DEFAULT_VAD_THRESHOLD, DEFAULT_VAD_PREFIX_PADDING, DEFAULT_VAD_SILENCE_DURATION
+)
+
+
+def utterance_levels(levels: np.ndarray) -> tuple[float, int] | None:
+    """Return the noise floor and longest pause of an utterance.
+
+    levels holds the dBFS level of each FRAME_MS frame. Pauses are runs
+    of frames near the noise floor between speech; silence before the
+    first and after the last speech frame does not count. Returns None
+    when there was no speech.
+    """
+    if not len(levels):
+        return None
+    noise_floor = float(np.percentile(levels, _NOISE_PERCENTILE))
+    speech = np.flatnonzero(levels >= noise_floor + SPEECH_MARGIN_DB)
+    if not len(speech):
+        return None
+    # Gaps between consecutive speech frames are the pauses
+    gaps = np.diff(speech) - 1
+    longest = int(gaps.max()) * FRAME_MS if len(gaps) else 0
+    return noise_floor, longest
+
+
+class TurnCalibrator:
+    """Learn how long the speakers of an entry pause, and the noise floor.
+
+    Every utterance's audio is measured as it streams: the noise floor
+    and the longest pause within the speech are recorded. Once enough
+    utterances were seen, the silence duration that ends a turn is
+    tightened to a margin over the longest recent pause, but never below
+    MIN_SILENCE_MS nor above the configured value; in a noisy room it is
+    left as configured. The learned values are kept in a store.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, entry_id: str, config: TurnDetectionConfig
+    ) -> None:
+        """Initialize the calibrator."""
+        self.config = config
+        self.noise_floor: float | None = None
+        self.pauses: deque[int] = deque(maxlen=RECENT_UTTERANCES)
+        self.utterances = 0
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.turn_detection.{entry_id}"
+        )
+
+    async def async_load(self) -> None:
+        """Load the learned parameters."""
+        data = await self._store.async_load() or {}
+        self.noise_floor = data.get("noise_floor")
+        self.pauses.extend(data.get("pauses", []))
+        self.utterances = data.get("utterances", 0)
+        _LOGGER.debug(
+            "Loaded turn detection calibration from %d utterances", self.utterances
+        )
+
+    @property
+    def settings(self) -> TurnDetectionConfig:
+        """Return the configured settings, tightened where safe."""
+        if len(self.pauses) < MIN_UTTERANCES or (
+            self.noise_floor is None or self.noise_floor > MAX_NOISE_FLOOR_DB
+        ):
+            return self.config
+        silence = max(MIN_SILENCE_MS, math.ceil(max(self.pauses) * PAUSE_MARGIN))
+        # Whole frames, as the server VAD is not more precise
+        silence = math.ceil(silence / FRAME_MS) * FRAME_MS
+        if silence >= self.config.silence_duration_ms:
+            return self.config
+        return replace(self.config, silence_duration_ms=silence)
+
+    def record(self, noise_floor: float, pause_ms: int) -> None:
+        """Learn from the noise floor and longest pause of an utterance."""
+        if self.noise_floor is None:
+            self.noise_floor = noise_floor
+        else:
+            self.noise_floor += NOISE_SMOOTHING * (noise_floor - self.noise_floor)
+        self.pauses.append(pause_ms)
+        self.utterances += 1
+        _LOGGER.debug(
+            "Utterance noise floor %.1f dBFS, longest pause %d ms",
+            noise_floor,
+            pause_ms,
+        )
+        self._store.async_delay_save(self._data_to_save, DISK_SAVE_DELAY)
+
+    async def async_observe(
+        self, stream: AsyncIterable[bytes], sample_rate: int, channels: int
+    ) -> AsyncIterator[bytes]:
+        """Pass PCM16 audio through, learning from it on the way.
+
+        An utterance that is cut short still counts, as a pause only
+        counts once speech resumed.
+        """
+        frame_bytes = sample_rate * FRAME_MS // 1000 * channels * 2
+        remainder = b""
+        levels: list[np.ndarray] = []
+        try:
+            async for chunk in stream:
+                data = remainder + chunk if remainder else chunk
+                usable = len(data) - len(data) % frame_bytes
+                remainder = data[usable:]
+                if usable:
+                    frames = np.frombuffer(
+                        data, dtype=np.int16, count=usable // 2
+                    ).reshape(-1, frame_bytes // 2)
+                    levels.append(frame_energy_db(frames))
+                yield chunk
+        finally:
+            if levels and (
+                measured := utterance_levels(np.concatenate(levels))
+            ) is not None:
+                self.record(*measured)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the learned parameters and the resulting settings."""
+        return asdict(self.settings) | {
+            "utterances": self.utterances,
+            "noise_floor": self.noise_floor,
+            "pauses": list(self.pauses),
+        }
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the learned parameters for the store."""
+        return {
+            "noise_floor": self.noise_floor,
+            "pauses": list(self.pauses),
+            "utterances": self.utterances,
+        }
@@ -0,0 +1,155 @@
+"""Energy based voice activity helpers for OpenAI STT."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import AsyncIterable, AsyncIterator
+from dataclasses import dataclass
+import logging
+from typing import Final
+
+import numpy as np
+
+_LOGGER = logging.getLogger(__name__)
+
+# Length of the frames energy is computed over (in milliseconds)
+FRAME_MS: Final = 10
+
+# Full scale of 16-bit PCM, used as the dBFS reference
+_FULL_SCALE: Final = 32768.0
+
+
+def frame_energy_db(frames: np.ndarray) -> np.ndarray:
+    """Return the RMS level in dBFS of each row of int16 samples."""
+    samples = frames.astype(np.float32)
+    rms = np.sqrt(np.mean(samples * samples, axis=1))
+    return 20.0 * np.log10(np.maximum(rms, 1.0) / _FULL_SCALE)
+
+
+@dataclass(frozen=True)
+class SilenceTrimConfig:
+    """Settings for trimming silence around an utterance."""
+
+    threshold_db: float
+    padding_ms: int
+
+
+class SilenceTrimmer:
+    """Drop leading and trailing silence from a PCM16 stream.
+
+    Audio is classified in FRAME_MS frames as it arrives. Leading silence
+    is discarded except for padding_ms before the first speech frame.
+    Once speech has started, up to padding_ms of each pause is passed
+    through immediately; anything longer is held back and only released
+    if speech resumes, so the trailing silence can be dropped at the end
+    of the stream without delaying it.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        channels: int,
+        threshold_db: float,
+        padding_ms: int,
+    ) -> None:
+        """Initialize the trimmer."""
+        self._frame_samples = sample_rate * FRAME_MS // 1000 * channels
+        self._frame_bytes = self._frame_samples * 2
+        self._bytes_per_ms = sample_rate * channels * 2 / 1000
+        self._threshold_db = threshold_db
+        self._padding_frames = max(padding_ms // FRAME_MS, 0)
+
+        self._remainder = b""
+        self._speech_started = False
+        # Padding kept in front of the first speech frame
+        self._lead: deque[bytes] = deque(maxlen=self._padding_frames)
+        # Frames of the current pause
+        self._pause_frames = 0
+        self._held: list[bytes] = []
+
+        self.bytes_removed = 0
+
+    @classmethod
+    def from_config(
+        cls, config: SilenceTrimConfig, sample_rate: int, channels: int
+    ) -> SilenceTrimmer:
+        """Create a trimmer for an audio format."""
+        return cls(sample_rate, channels, config.threshold_db, config.padding_ms)
+
+    @property
+    def ms_removed(self) -> float:
+        """Return the duration of the removed audio in milliseconds."""
+        return self.bytes_removed / self._bytes_per_ms
+
+    def process(self, chunk: bytes) -> bytes:
+        """Consume a chunk and return the audio that can be emitted now."""
+        data = self._remainder + chunk if self._remainder else chunk
+        usable = len(data) - len(data) % self._frame_bytes
+        self._remainder = bytes(data[usable:])
+        if not usable:
+            return b""
+
+        frames = np.frombuffer(data, dtype=np.int16, count=usable // 2).reshape(
+            -1, self._frame_samples
+        )
+        is_speech = frame_energy_db(frames) >= self._threshold_db
+
+        out = bytearray()
+        view = memoryview(data)
+        for index, speech in enumerate(is_speech.tolist()):
+            frame = view[index * self._frame_bytes : (index + 1) * self._frame_bytes]
+            if not self._speech_started:
+                if speech:
+                    self._speech_started = True
+                    for lead in self._lead:
+                        out += lead
+                    self._lead.clear()
+                    out += frame
+                else:
+                    if len(self._lead) == self._padding_frames:
+                        # The oldest padding frame falls out of the window
+                        self.bytes_removed += self._frame_bytes
+                    self._lead.append(bytes(frame))
+            elif speech:
+                for held in self._held:
+                    out += held
+                self._held.clear()
+                self._pause_frames = 0
+                out += frame
+            else:
+                self._pause_frames += 1
+                if self._pause_frames <= self._padding_frames:
+                    out += frame
+                else:
+                    self._held.append(bytes(frame))
+        return bytes(out)
+
+    def flush(self) -> bytes:
+        """Finish the stream and return any audio still to be emitted."""
+        if not self._speech_started:
+            # No speech at all; keep the padding so the request stays valid
+            out = b"".join(self._lead) + self._remainder
+            self._lead.clear()
+        else:
+            self.bytes_removed += sum(len(held) for held in self._held)
+            self._held.clear()
+            # A trailing partial frame belongs to the dropped pause when one
+            # was in progress
+            if self._pause_frames > self._padding_frames:
+                self.bytes_removed += len(self._remainder)
+                out = b""
+            else:
+                out = self._remainder
+        self._remainder = b""
+        return out
+
+    async def async_trim(self, stream: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+        """Trim silence from an audio stream."""
+        async for chunk in stream:
+            if out := self.process(chunk):
+                yield out
+        if out := self.flush():
+            yield out
+        _LOGGER.debug(
+            "Trimmed %d bytes (%.0f ms) of silence", self.bytes_removed, self.ms_removed
+        )
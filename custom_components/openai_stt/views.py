@@ -0,0 +1,38 @@
+"""HTTP views for OpenAI STT."""
+
+from __future__ import annotations
+
+from aiohttp import web
+
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .telemetry import render_metrics
+from .transport import OpenAISTTTransport
+
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricsView(HomeAssistantView):
+    """Serve the metrics of all entries in the Prometheus text format."""
+
+    url = "/api/openai_stt/metrics"
+    name = "api:openai_stt:metrics"
+    requires_auth = True
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the view."""
+        self._hass = hass
+
+    async def get(self, request: web.Request) -> web.Response:
+        """Return the metrics of the entries that publish them."""
+        transports: dict[str, OpenAISTTTransport] = self._hass.data.get(DOMAIN, {})
+        samples = []
+        for entry_id, transport in transports.items():
+            if transport.options.prometheus_metrics:
+                samples.extend(transport.metrics.render({"entry": entry_id}))
+        return web.Response(
+            body=render_metrics(samples).encode(),
+            headers={"Content-Type": METRICS_CONTENT_TYPE},
+        )
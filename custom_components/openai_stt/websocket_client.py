@@ -4,21 +4,77 @@ from __future__ import annotations
 
 import asyncio
 import base64
-from collections.abc import AsyncIterable
-import json
+from collections.abc import AsyncIterable, AsyncIterator
+from http import HTTPStatus
 import logging
 import time
-from typing import Final
-
-from aiohttp import ClientError, WSCloseCode, WSMsgType
-
-from homeassistant.components.stt import SpeechMetadata, SpeechResult, SpeechResultState
+from typing import TYPE_CHECKING, Final
+
+from aiohttp import (
+    ClientError,
+    ClientWebSocketResponse,
+    WSCloseCode,
+    WSMsgType,
+    WSServerHandshakeError,
+)
+
+from homeassistant.components.stt import (
+    AudioCodecs,
+    SpeechMetadata,
+    SpeechResult,
+    SpeechResultState,
+)
+from homeassistant.helpers.json import json_dumps
+
+from .const import DEFAULT_REALTIME_FRAME_MS
+from .encoding import async_decode_ogg_opus
+from .events import (
+    ERROR,
+    SESSION_UPDATED,
+    SPEECH_STOPPED,
+    TRANSCRIPTION_COMPLETED,
+    TRANSCRIPTION_DELTA,
+    decode_event,
+)
+from .finalize import EarlyFinalizer, EarlyFinalizeStats
+from .partial import PartialTranscript, PartialTranscripts, UtteranceText
+from .ratelimit import RateLimiter
+from .resample import StreamingResampler
+from .telemetry import NOOP_TELEMETRY, Telemetry
+from .timing import StageTimings, TimingStats
+from .turn_detection import DEFAULT_TURN_DETECTION, TurnCalibrator, TurnDetectionConfig
+from .vad import SilenceTrimConfig, SilenceTrimmer
+
+if TYPE_CHECKING:
+    from .realtime_session import PersistentRealtimeSession
+    from .websocket_pool import RealtimeSessionPool
 
 _LOGGER = logging.getLogger(__name__)
 
 # Maximum time to wait for a response (in seconds)
 WEBSOCKET_TIMEOUT: Final = 30
 
+# Interval between WebSocket pings (in seconds)
+WEBSOCKET_HEARTBEAT: Final = 30
+
+# Sample rate of the Realtime API's pcm16 input format (mono)
+REALTIME_SAMPLE_RATE: Final = 24000
+
+# Append messages are built around the base64 audio directly instead of
+# going through json.dumps
+_APPEND_PREFIX: Final = b'{"type":"input_audio_buffer.append","audio":"'
+_APPEND_SUFFIX: Final = b'"}'
+
+# aiohttp 3.11 and later send the prepared bytes as a text frame as they
+# are; older versions only take str, which they encode again
+_SEND_FRAME: Final = hasattr(ClientWebSocketResponse, "send_frame")
+
+# Server events decoded while waiting for a transcript; the rest are
+# skipped unparsed
+_RECEIVE_EVENTS: Final = frozenset({TRANSCRIPTION_COMPLETED})
+_RECEIVE_PARTIAL_EVENTS: Final = _RECEIVE_EVENTS | {TRANSCRIPTION_DELTA}
+_SESSION_UPDATE_EVENTS: Final = frozenset({SESSION_UPDATED, ERROR})
+
 
 def _convert_language_code(language: str) -> str:
     """Convert BCP 47 language code to ISO 639-1 code for OpenAI API.
@@ -31,6 +87,69 @@ def _convert_language_code(language: str) -> str:
     return language
 
 
+async def _coalesce_frames(
+    stream: AsyncIterable[bytes], frame_ms: int
+) -> AsyncIterator[bytes]:
+    """Regroup 24 kHz PCM16 chunks into frames of frame_ms.
+
+    A partial frame is sent once frame_ms has passed since its first byte
+    arrived, so batching never delays audio by more than one frame. With
+    a frame_ms of 0 chunks are passed through unchanged.
+    """
+    if frame_ms <= 0:
+        async for chunk in stream:
+            yield chunk
+        return
+
+    frame_bytes = REALTIME_SAMPLE_RATE * 2 * frame_ms // 1000
+    max_delay = frame_ms / 1000
+    loop = asyncio.get_running_loop()
+    iterator = aiter(stream)
+    buffer = bytearray()
+    deadline = 0.0
+    # Chunk requested from the stream but not received before the deadline
+    pending: asyncio.Future[bytes] | None = None
+
+    try:
+        while True:
+            if not buffer and pending is None:
+                try:
+                    chunk = await anext(iterator)
+                except StopAsyncIteration:
+                    break
+            else:
+                if pending is None:
+                    pending = asyncio.ensure_future(anext(iterator))
+                timeout = max(deadline - loop.time(), 0) if buffer else None
+                done, _ = await asyncio.wait((pending,), timeout=timeout)
+                if not done:
+                    yield bytes(buffer)
+                    buffer.clear()
+                    continue
+                try:
+                    chunk = pending.result()
+                except StopAsyncIteration:
+                    break
+                finally:
+                    pending = None
+
+            if not buffer:
+                deadline = loop.time() + max_delay
+            buffer += chunk
+            if len(buffer) >= frame_bytes:
+                full = len(buffer) - len(buffer) % frame_bytes
+                for start in range(0, full, frame_bytes):
+                    yield bytes(buffer[start : start + frame_bytes])
+                del buffer[:full]
+                deadline = loop.time() + max_delay
+
+        if buffer:
+            yield bytes(buffer)
+    finally:
+        if pending is not None and not pending.done():
+            pending.cancel()
+
+
 def _convert_noise_reduction(noise_reduction: str) -> str | None:
     """Convert noise reduction value from config to API format.
 
@@ -52,6 +171,17 @@ class OpenAIWebSocketClient:
         model: str,
         prompt: str,
         noise_reduction: str,
+        pool: RealtimeSessionPool | None = None,
+        session: PersistentRealtimeSession | None = None,
+        silence_trim: SilenceTrimConfig | None = None,
+        frame_ms: int = DEFAULT_REALTIME_FRAME_MS,
+        timing_stats: TimingStats | None = None,
+        telemetry: Telemetry = NOOP_TELEMETRY,
+        rate_limiter: RateLimiter | None = None,
+        partials: PartialTranscripts | None = None,
+        early_finalize: EarlyFinalizeStats | None = None,
+        turn_detection: TurnDetectionConfig = DEFAULT_TURN_DETECTION,
+        turn_calibrator: TurnCalibrator | None = None,
     ) -> None:
         """Initialize the WebSocket client."""
         self.client = client
@@ -60,81 +190,149 @@ class OpenAIWebSocketClient:
         self.model = model
         self.prompt = prompt
         self.noise_reduction = noise_reduction
-        self.start_time = 0.0
-        self.ws = None
-
-    async def _send_audio_stream(self, stream: AsyncIterable[bytes]) -> None:
-        """Send audio chunks to WebSocket server."""
+        self.pool = pool
+        self.session = session
+        self.silence_trim = silence_trim
+        self.frame_ms = frame_ms
+        self.timing_stats = timing_stats
+        self.telemetry = telemetry
+        self._labels = {"backend": api_url, "model": model, "protocol": "realtime"}
+        self.headers = {
+            "Authorization": f"Bearer {api_key}",
+            "OpenAI-Beta": "realtime=v1",
+        }
+        self.rate_limiter = rate_limiter
+        self.partials = partials if partials is not None else PartialTranscripts()
+        # Utterances end at the server's end of speech when set
+        self.early_finalize = early_finalize
+        # Background follow-ups of streams cut short
+        self._measurements: set[asyncio.Task] = set()
+        self.turn_detection = turn_detection
+        # Learns from the audio and tightens turn_detection, when set
+        self.turn_calibrator = turn_calibrator
+        # Connection headers by API key, when keys are rotated
+        self._key_headers: dict[str, dict[str, str]] = {}
+        # Serialized session configurations by language and VAD settings
+        self._session_configs: dict[tuple[str, TurnDetectionConfig], str] = {}
+
+    async def _send_audio_stream(
+        self,
+        ws: ClientWebSocketResponse,
+        stream: AsyncIterable[bytes],
+        commit: bool = True,
+        finalizer: EarlyFinalizer | None = None,
+    ) -> float:
+        """Send audio chunks to WebSocket server.
+
+        Returns the time the end-of-stream signal was sent (or the audio
+        ended, when commit is False), or 0 if the socket went away first.
+        No signal is sent once finalizer was stopped, as server VAD
+        commits the audio itself then.
+        """
         try:
-            async for chunk in stream:
-                if not chunk or self.ws.closed:
-                    break
-                # Audio data must be base64 encoded
-                b64 = base64.b64encode(chunk).decode("utf-8")
-                await self.ws.send_json(
-                    {
-                        "type": "input_audio_buffer.append",
-                        "audio": b64,
-                    }
-                )
-                _LOGGER.debug("Audio sent (%d bytes)", len(chunk))
-
-            if not self.ws.closed:
-                # Signal the end of the audio stream to the server
-                _LOGGER.debug("Sending end-of-stream signal")
-                await self.ws.send_json({"type": "input_audio_buffer.commit"})
-
-                # Set start time after sending all audio data
-                self.start_time = time.perf_counter()
+            with self.telemetry.span("append") as span:
+                frames = sent = 0
+                async for frame in _coalesce_frames(stream, self.frame_ms):
+                    if not frame or ws.closed:
+                        break
+                    # Audio data must be base64 encoded
+                    message = _APPEND_PREFIX + base64.b64encode(frame) + _APPEND_SUFFIX
+                    if _SEND_FRAME:
+                        await ws.send_frame(message, WSMsgType.TEXT)
+                    else:
+                        await ws.send_str(message.decode("ascii"))
+                    _LOGGER.debug("Audio sent (%d bytes)", len(frame))
+                    self.telemetry.count("bytes_sent_total", len(frame), self._labels)
+                    frames += 1
+                    sent += len(frame)
+                if span is not None:
+                    span.set_attribute("frames", frames)
+                    span.set_attribute("bytes", sent)
+
+            if not ws.closed:
+                if commit and (finalizer is None or not finalizer.stopped):
+                    # Signal the end of the audio stream to the server
+                    _LOGGER.debug("Sending end-of-stream signal")
+                    with self.telemetry.span("commit"):
+                        await ws.send_json({"type": "input_audio_buffer.commit"})
+
+                # Start time for the processing duration
+                return time.perf_counter()
 
         except asyncio.CancelledError:
             _LOGGER.debug("send_audio() was cancelled")
         except Exception:
             _LOGGER.exception("Error sending audio")
-            if not self.ws.closed:
-                await self.ws.close(
+            if not ws.closed:
+                await ws.close(
                     code=WSCloseCode.INTERNAL_ERROR,
                     message=b"Error sending audio",
                 )
+        return 0.0
 
-    async def _receive_transcription(self, send_task: asyncio.Task) -> str:
-        """Receive transcription results from WebSocket server."""
+    async def _receive_transcription(
+        self,
+        ws: ClientWebSocketResponse,
+        send_task: asyncio.Task,
+        timings: StageTimings,
+        utterance: UtteranceText | None = None,
+        finalizer: EarlyFinalizer | None = None,
+    ) -> str:
+        """Receive transcription results from WebSocket server.
+
+        Transcription deltas are passed to utterance, if given, and the
+        server's end of speech stops finalizer.
+        """
         final_text = ""
+        wanted = _RECEIVE_EVENTS if utterance is None else _RECEIVE_PARTIAL_EVENTS
+        if finalizer is not None:
+            wanted = wanted | {SPEECH_STOPPED}
         try:
             async with asyncio.timeout(WEBSOCKET_TIMEOUT):
-                async for msg in self.ws:
+                async for msg in ws:
                     if msg.type == WSMsgType.TEXT:
-                        data = json.loads(msg.data)
-                        msg_type = data.get("type")
-                        _LOGGER.debug("Received response: %s", data)
-
-                        if (
-                            msg_type
-                            == "conversation.item.input_audio_transcription.delta"
-                        ):
-                            _LOGGER.debug('Partial: "%s"', data.get("delta"))
-                        elif (
-                            msg_type
-                            == "conversation.item.input_audio_transcription.completed"
-                        ):
-                            # Get final transcription
-                            final_text = data.get("transcript", "")
-                            if (
-                                self.start_time > 0
-                            ):  # Only calculate if start_time is set
-                                duration = time.perf_counter() - self.start_time
-                                _LOGGER.debug(
-                                    "Transcription processing duration: %.2f seconds",
-                                    duration,
+                        received = time.perf_counter()
+                        _LOGGER.debug("Received response: %s", msg.data)
+                        commit_time = (
+                            send_task.result()
+                            if send_task.done() and not send_task.cancelled()
+                            else 0.0
+                        )
+                        if commit_time > 0 and timings.first_byte is None:
+                            timings.first_byte = received - commit_time
+                        data = decode_event(msg.data, wanted)
+                        if data is None:
+                            continue
+                        if data["type"] == SPEECH_STOPPED:
+                            if finalizer is not None:
+                                finalizer.stop()
+                            continue
+                        if data["type"] == TRANSCRIPTION_DELTA:
+                            if utterance is not None:
+                                utterance.add_delta(
+                                    data.get("item_id", ""), data.get("delta", "")
                                 )
-                            else:
-                                _LOGGER.debug(
-                                    "Could not calculate processing duration: start_time not set"
-                                )
-                            _LOGGER.debug('Final: "%s"', final_text)
-                            return final_text
+                            continue
+                        timings.parse = time.perf_counter() - received
+                        if commit_time > 0:
+                            timings.server = received - commit_time
+                            self.telemetry.add_span("completion", timings.server)
+
+                        # Get final transcription
+                        final_text = data.get("transcript", "")
+                        if commit_time > 0:  # Only calculate if the commit was sent
+                            _LOGGER.debug(
+                                "Transcription processing duration: %.2f seconds",
+                                timings.server,
+                            )
+                        else:
+                            _LOGGER.debug(
+                                "Could not calculate processing duration: start_time not set"
+                            )
+                        _LOGGER.debug('Final: "%s"', final_text)
+                        return final_text
                     elif msg.type == WSMsgType.ERROR:
-                        _LOGGER.error("WebSocket error: %s", self.ws.exception())
+                        _LOGGER.error("WebSocket error: %s", ws.exception())
                         break
                     elif msg.type == WSMsgType.CLOSED:
                         _LOGGER.debug("WebSocket closed by server")
@@ -165,12 +363,7 @@ class OpenAIWebSocketClient:
                     "prompt": self.prompt,
                     "language": openai_language,
                 },
-                "turn_detection": {
-                    "type": "server_vad",
-                    "prefix_padding_ms": 300,
-                    "silence_duration_ms": 500,
-                    "threshold": 0.5,
-                },
+                "turn_detection": self._turn_detection().as_session_dict(),
             },
         }
 
@@ -185,8 +378,25 @@ class OpenAIWebSocketClient:
 
         return config
 
+    def _turn_detection(self) -> TurnDetectionConfig:
+        """Return the current server VAD settings."""
+        if self.turn_calibrator is not None:
+            return self.turn_calibrator.settings
+        return self.turn_detection
+
+    def _session_config(self, language: str) -> str:
+        """Return the serialized session configuration for a language."""
+        key = (language, self._turn_detection())
+        if (config := self._session_configs.get(key)) is None:
+            config = json_dumps(self._create_session_config(language))
+            self._session_configs[key] = config
+        return config
+
     async def _handle_tasks(
-        self, send_task: asyncio.Task, recv_task: asyncio.Task
+        self,
+        ws: ClientWebSocketResponse,
+        send_task: asyncio.Task,
+        recv_task: asyncio.Task,
     ) -> None:
         """Handle task completion and cancellation logic."""
         try:
@@ -217,57 +427,225 @@ class OpenAIWebSocketClient:
                 if task.exception():
                     _LOGGER.error("Task completed with exception: %s", task.exception())
         finally:
-            if not self.ws.closed:
+            if not ws.closed:
                 try:
-                    await self.ws.close()
+                    await ws.close()
                     _LOGGER.debug("WebSocket closed cleanly")
                 except Exception:
                     _LOGGER.exception("Error closing WebSocket connection")
 
-    async def async_process_audio_stream(
-        self, metadata: SpeechMetadata, stream: AsyncIterable[bytes]
-    ) -> SpeechResult:
-        """Process audio stream via WebSocket to OpenAI Realtime API."""
+    def _headers_for_key(self, api_key: str) -> dict[str, str]:
+        """Return the connection headers for a rotated API key."""
+        if (headers := self._key_headers.get(api_key)) is None:
+            headers = self._key_headers[api_key] = {
+                **self.headers,
+                "Authorization": f"Bearer {api_key}",
+            }
+        return headers
+
+    async def async_iter_partials(self) -> AsyncIterator[PartialTranscript]:
+        """Yield the partial transcripts of utterances as they arrive.
 
+        Each utterance yields its text so far after every delta and ends
+        with a final transcript; iterate until the final one arrives for
+        the utterance of interest.
+        """
+        async for partial in self.partials.async_iter():
+            yield partial
+
+    async def async_configure_session(
+        self, ws: ClientWebSocketResponse, language: str
+    ) -> None:
+        """Send the transcription session configuration for a language."""
+        config = self._session_config(language)
+        _LOGGER.debug("Sending configuration: %s", config)
+        await ws.send_str(config)
+
+    async def async_connect(
+        self, language: str, wait_for_update: bool = False
+    ) -> ClientWebSocketResponse:
+        """Open and configure a realtime transcription session.
+
+        When wait_for_update is set, this only returns once the server has
+        acknowledged the configuration, so the session is ready for audio.
+        """
         uri = f"{self.api_url}/realtime?intent=transcription"
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "OpenAI-Beta": "realtime=v1",
-        }
 
-        try:
-            _LOGGER.debug("Opening WebSocket connection to %s", uri)
-            async with self.client.ws_connect(uri, headers=headers, heartbeat=30) as ws:
-                self.ws = ws
-                self.start_time = 0  # Reset start_time
+        api_key, headers = self.api_key, self.headers
+        if self.rate_limiter is not None:
+            api_key = await self.rate_limiter.async_acquire()
+            headers = self._headers_for_key(api_key)
 
-                # Send initial configuration
-                config = self._create_session_config(metadata.language)
-                _LOGGER.debug("Sending configuration: %s", config)
-                await ws.send_json(config)
+        _LOGGER.debug("Opening WebSocket connection to %s", uri)
+        with self.telemetry.span("connect"):
+            try:
+                ws = await self.client.ws_connect(
+                    uri, headers=headers, heartbeat=WEBSOCKET_HEARTBEAT
+                )
+            except WSServerHandshakeError as err:
+                if self.rate_limiter is not None:
+                    self.rate_limiter.update(
+                        api_key,
+                        err.headers,
+                        err.status == HTTPStatus.TOO_MANY_REQUESTS,
+                    )
+                raise
+        try:
+            with self.telemetry.span("configure", language=language):
+                await self.async_configure_session(ws, language)
+                if wait_for_update:
+                    async with asyncio.timeout(WEBSOCKET_TIMEOUT):
+                        await self._wait_for_session_update(ws)
+        except BaseException:
+            await ws.close()
+            raise
+        return ws
+
+    async def _wait_for_session_update(self, ws: ClientWebSocketResponse) -> None:
+        """Wait until the server acknowledges the session configuration."""
+        async for msg in ws:
+            if msg.type != WSMsgType.TEXT:
+                break
+            data = decode_event(msg.data, _SESSION_UPDATE_EVENTS)
+            if data is None:
+                continue
+            if data["type"] == SESSION_UPDATED:
+                return
+            if data["type"] == ERROR:
+                raise ClientError(f"Session configuration rejected: {data}")
+        raise ClientError("WebSocket closed before session was configured")
+
+    async def _process_on_connection(
+        self,
+        metadata: SpeechMetadata,
+        stream: AsyncIterable[bytes],
+        timings: StageTimings,
+        utterance: UtteranceText | None = None,
+        finalizer: EarlyFinalizer | None = None,
+    ) -> str | None:
+        """Transcribe one utterance on a dedicated connection.
+
+        The connection comes from the pool when one is available and is
+        closed afterwards.
+        """
+        ws = None
+        if self.pool is not None:
+            ws = await self.pool.async_checkout(metadata.language)
+        if ws is None:
+            ws = await self.async_connect(metadata.language)
+
+        # Create and manage concurrent tasks
+        send_task = asyncio.create_task(
+            self._send_audio_stream(ws, stream, finalizer=finalizer)
+        )
+        recv_task = asyncio.create_task(
+            self._receive_transcription(ws, send_task, timings, utterance, finalizer)
+        )
+
+        # Handle tasks completion
+        await self._handle_tasks(ws, send_task, recv_task)
+
+        # Process final result
+        if not recv_task.done():
+            return None
+        if (
+            not send_task.cancelled()
+            and (commit_time := send_task.result()) > 0
+            and timings.audio_end is not None
+        ):
+            timings.upload = commit_time - timings.audio_end
+        return recv_task.result().strip()
 
-                # Create and manage concurrent tasks
-                send_task = asyncio.create_task(self._send_audio_stream(stream))
-                recv_task = asyncio.create_task(self._receive_transcription(send_task))
+    async def async_process_audio_stream(
+        self, metadata: SpeechMetadata, stream: AsyncIterable[bytes]
+    ) -> SpeechResult:
+        """Process audio stream via WebSocket to OpenAI Realtime API."""
+        timings = StageTimings()
+        utterance = self.partials.utterance()
+        finalizer = None
+        if self.early_finalize is not None:
+            # Cut before the timings, so the audio ends where it was cut
+            finalizer = EarlyFinalizer(self.early_finalize)
+            stream = finalizer.async_gate(stream)
+        with self.telemetry.span("transcribe", **self._labels) as span:
+            result = await self._async_transcribe(
+                metadata, timings.track_audio(stream), timings, utterance, finalizer
+            )
+            if span is not None and result.result != SpeechResultState.SUCCESS:
+                span.error = "Transcription failed"
+        if utterance is not None:
+            utterance.finish(result.text)
+        if finalizer is not None:
+            finalizer.finish()
+            if finalizer.early:
+                task = asyncio.create_task(
+                    finalizer.async_measure(time.perf_counter())
+                )
+                self._measurements.add(task)
+                task.add_done_callback(self._measurements.discard)
+        timings.finish()
+        if self.timing_stats is not None:
+            self.timing_stats.record(timings)
+        self.telemetry.record_request(
+            self._labels, result.result == SpeechResultState.SUCCESS, timings.total
+        )
+        return result
+
+    async def _async_transcribe(
+        self,
+        metadata: SpeechMetadata,
+        stream: AsyncIterable[bytes],
+        timings: StageTimings,
+        utterance: UtteranceText | None,
+        finalizer: EarlyFinalizer | None = None,
+    ) -> SpeechResult:
+        """Stream the audio to the Realtime API and return the transcript."""
 
-                # Handle tasks completion
-                await self._handle_tasks(send_task, recv_task)
+        # The Realtime API only accepts 24 kHz mono PCM16
+        if metadata.codec == AudioCodecs.OPUS:
+            stream = async_decode_ogg_opus(stream, REALTIME_SAMPLE_RATE)
+        else:
+            if self.turn_calibrator is not None:
+                stream = self.turn_calibrator.async_observe(
+                    stream, metadata.sample_rate, metadata.channel
+                )
+            resampler = StreamingResampler(
+                metadata.sample_rate, REALTIME_SAMPLE_RATE, metadata.channel
+            )
+            if not resampler.passthrough:
+                stream = resampler.async_resample(stream)
 
-                # Process final result
-                if not recv_task.done():
-                    _LOGGER.warning("Transcription task was not completed")
-                    return SpeechResult("", SpeechResultState.SUCCESS)
+        if self.silence_trim is not None:
+            stream = SilenceTrimmer.from_config(
+                self.silence_trim, REALTIME_SAMPLE_RATE, 1
+            ).async_trim(stream)
 
-                final_text = recv_task.result().strip()
+        try:
+            if self.session is not None and not self.session.busy:
+                final_text = (
+                    await self.session.async_transcribe(
+                        metadata.language, stream, timings, utterance, finalizer
+                    )
+                ).strip()
+            else:
+                final_text = await self._process_on_connection(
+                    metadata, stream, timings, utterance, finalizer
+                )
+            if final_text is None:
+                _LOGGER.warning("Transcription task was not completed")
+                return SpeechResult("", SpeechResultState.SUCCESS)
 
-                _LOGGER.debug('Transcription completed: "%s"', final_text)
+            _LOGGER.debug('Transcription completed: "%s"', final_text)
 
-                if not final_text:
-                    _LOGGER.warning("WebSocket transcription resulted in empty text")
-                    return SpeechResult("", SpeechResultState.SUCCESS)
+            if not final_text:
+                _LOGGER.warning("WebSocket transcription resulted in empty text")
+                return SpeechResult("", SpeechResultState.SUCCESS)
 
-                return SpeechResult(final_text, SpeechResultState.SUCCESS)
+            return SpeechResult(final_text, SpeechResultState.SUCCESS)
 
+        except TimeoutError:
+            _LOGGER.warning("Timeout waiting for transcription response")
+            return SpeechResult("", SpeechResultState.ERROR)
         except ClientError as err:
             _LOGGER.error("WebSocket connection error: %s", err)
             return SpeechResult("", SpeechResultState.ERROR)
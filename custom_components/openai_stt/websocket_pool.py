@@ -0,0 +1,185 @@
+"""Pool of pre-warmed realtime transcription sessions for OpenAI STT."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass, field
+import logging
+import time
+from typing import TYPE_CHECKING, Final
+
+from aiohttp import ClientError, ClientWebSocketResponse, WSMsgType
+
+if TYPE_CHECKING:
+    from .websocket_client import OpenAIWebSocketClient
+
+_LOGGER = logging.getLogger(__name__)
+
+# Time after which an idle session is replaced with a fresh one (in seconds)
+POOL_MAX_IDLE: Final = 300
+
+# Delay before retrying after a failed refill (in seconds)
+REFILL_BACKOFF_MIN: Final = 5
+REFILL_BACKOFF_MAX: Final = 300
+
+
+@dataclass
+class _IdleSession:
+    """An idle, configured realtime session waiting to be checked out."""
+
+    ws: ClientWebSocketResponse
+    # The serialized session configuration the socket was set up with
+    config: str
+    idle_since: float = field(default_factory=time.monotonic)
+    watcher: asyncio.Task | None = None
+
+
+class RealtimeSessionPool:
+    """Keep a number of configured realtime sessions ready for use.
+
+    Every idle session has a watcher task that reads from the socket. This
+    keeps heartbeat pongs flowing, notices sockets closed by the server and
+    evicts sessions that have been idle for longer than max_idle. Sessions
+    are refilled in the background whenever the pool drops below its
+    target size.
+    """
+
+    def __init__(
+        self,
+        client: OpenAIWebSocketClient,
+        size: int,
+        max_idle: float,
+        language: str,
+    ) -> None:
+        """Initialize the pool."""
+        # Replaced when options the sockets do not depend on change
+        self.client = client
+        self._size = size
+        self._max_idle = max_idle
+        self._language = language
+        self._idle: deque[_IdleSession] = deque()
+        self._connecting = 0
+        self._refill_task: asyncio.Task | None = None
+        self._backoff = 0.0
+        self._closed = False
+
+    @property
+    def idle_count(self) -> int:
+        """Return the number of sessions ready to be checked out."""
+        return len(self._idle)
+
+    def async_start(self) -> None:
+        """Start filling the pool in the background."""
+        self._schedule_refill()
+
+    async def async_close(self) -> None:
+        """Close all idle sessions and stop refilling."""
+        self._closed = True
+        if self._refill_task is not None:
+            self._refill_task.cancel()
+            await asyncio.gather(self._refill_task, return_exceptions=True)
+            self._refill_task = None
+        while self._idle:
+            await self._discard(self._idle.popleft())
+
+    async def async_checkout(self, language: str) -> ClientWebSocketResponse | None:
+        """Take a ready session out of the pool.
+
+        Returns None when no healthy session is available, in which case
+        the caller should open a connection itself.
+        """
+        ws = None
+        while self._idle and ws is None:
+            session = self._idle.popleft()
+            await self._stop_watcher(session)
+            if session.ws.closed:
+                _LOGGER.debug("Discarding closed pooled session")
+                continue
+            ws = session.ws
+            if session.config != self.client._session_config(language):
+                # Reconfigure in place; the update is applied before any audio
+                await self.client.async_configure_session(ws, language)
+
+        self._language = language
+        self._schedule_refill()
+
+        if ws is None:
+            _LOGGER.debug("No pooled realtime session available")
+        else:
+            _LOGGER.debug("Using pooled realtime session")
+        return ws
+
+    def _schedule_refill(self) -> None:
+        """Start the refill task if the pool is below its target size."""
+        if self._closed or (self._refill_task and not self._refill_task.done()):
+            return
+        if len(self._idle) + self._connecting < self._size:
+            self._refill_task = asyncio.create_task(self._refill())
+
+    async def _refill(self) -> None:
+        """Open sessions until the pool reaches its target size."""
+        while not self._closed and len(self._idle) + self._connecting < self._size:
+            language = self._language
+            self._connecting += 1
+            try:
+                ws = await self.client.async_connect(language, wait_for_update=True)
+            except (ClientError, OSError) as err:
+                self._backoff = min(
+                    max(self._backoff * 2, REFILL_BACKOFF_MIN), REFILL_BACKOFF_MAX
+                )
+                _LOGGER.warning(
+                    "Failed to pre-warm realtime session, retrying in %.0f seconds: %s",
+                    self._backoff,
+                    err,
+                )
+                await asyncio.sleep(self._backoff)
+                continue
+            finally:
+                self._connecting -= 1
+
+            self._backoff = 0.0
+            session = _IdleSession(ws, self.client._session_config(language))
+            session.watcher = asyncio.create_task(self._watch(session))
+            self._idle.append(session)
+            _LOGGER.debug("Pre-warmed realtime session (%d idle)", len(self._idle))
+
+    async def _watch(self, session: _IdleSession) -> None:
+        """Read from an idle session until it closes or expires."""
+        try:
+            while True:
+                remaining = self._max_idle - (time.monotonic() - session.idle_since)
+                msg = await session.ws.receive(timeout=max(remaining, 0.001))
+                if msg.type in (WSMsgType.CLOSE, WSMsgType.CLOSING, WSMsgType.CLOSED):
+                    _LOGGER.debug("Pooled realtime session closed by server")
+                    break
+                if msg.type == WSMsgType.ERROR:
+                    _LOGGER.debug("Pooled realtime session failed: %s", msg.data)
+                    break
+        except TimeoutError:
+            _LOGGER.debug("Pooled realtime session reached max idle time")
+        except asyncio.CancelledError:
+            # Checked out or pool closing
+            return
+
+        if session in self._idle:
+            self._idle.remove(session)
+        session.watcher = None
+        await self._discard(session)
+        self._schedule_refill()
+
+    async def _stop_watcher(self, session: _IdleSession) -> None:
+        """Stop reading from a session so it can be handed out."""
+        if session.watcher is not None:
+            session.watcher.cancel()
+            await asyncio.gather(session.watcher, return_exceptions=True)
+            session.watcher = None
+
+    async def _discard(self, session: _IdleSession) -> None:
+        """Close a session that is no longer usable."""
+        await self._stop_watcher(session)
+        if not session.ws.closed:
+            try:
+                await session.ws.close()
+            except (ClientError, OSError):
+                _LOGGER.debug("Error closing pooled realtime session", exc_info=True)
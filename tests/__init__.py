@@ -0,0 +1 @@
+"""Tests for the OpenAI STT integration."""
@@ -0,0 +1,157 @@
+"""Test configuration for the OpenAI STT integration."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import json
+from typing import Any
+
+from aiohttp import WSMessage, WSMsgType
+
+# Home Assistant imports its components after bootstrap, which settles the
+# import cycle between stt, http and websocket_api
+import homeassistant.bootstrap  # noqa: F401
+import pytest
+
+from custom_components.openai_stt.events import (
+    BUFFER_COMMITTED,
+    SESSION_UPDATED,
+    TRANSCRIPTION_COMPLETED,
+)
+from custom_components.openai_stt.websocket_client import OpenAIWebSocketClient
+
+
+class FakeWebSocket:
+    """Client side of a realtime socket served by FakeRealtimeServer."""
+
+    def __init__(self, server: FakeRealtimeServer) -> None:
+        """Initialize the socket."""
+        self._server = server
+        self._incoming: asyncio.Queue[WSMessage] = asyncio.Queue()
+        self.sent: list[dict[str, Any]] = []
+        self.closed = False
+
+    async def send_str(self, data: str) -> None:
+        """Send a text message to the server."""
+        await self.send_json(json.loads(data))
+
+    async def send_frame(self, message: bytes, opcode: WSMsgType) -> None:
+        """Send a prepared frame to the server."""
+        assert opcode == WSMsgType.TEXT
+        await self.send_json(json.loads(message))
+
+    async def send_json(self, data: dict[str, Any]) -> None:
+        """Send an event to the server."""
+        if self.closed:
+            raise ConnectionResetError("Cannot write to closing transport")
+        self.sent.append(data)
+        self._server.handle(self, data)
+
+    def push(self, event: dict[str, Any]) -> None:
+        """Deliver a server event."""
+        self._incoming.put_nowait(WSMessage(WSMsgType.TEXT, json.dumps(event), None))
+
+    async def receive(self, timeout: float | None = None) -> WSMessage:
+        """Return the next message."""
+        async with asyncio.timeout(timeout):
+            return await self._incoming.get()
+
+    def __aiter__(self) -> FakeWebSocket:
+        """Iterate over the messages until the socket closes."""
+        return self
+
+    async def __anext__(self) -> WSMessage:
+        """Return the next message until the socket closes."""
+        msg = await self.receive()
+        if msg.type in (WSMsgType.CLOSE, WSMsgType.CLOSING, WSMsgType.CLOSED):
+            raise StopAsyncIteration
+        return msg
+
+    async def close(self) -> None:
+        """Close the socket."""
+        self.drop()
+
+    def drop(self) -> None:
+        """Close the socket from the server side."""
+        if not self.closed:
+            self.closed = True
+            self._incoming.put_nowait(WSMessage(WSMsgType.CLOSED, None, None))
+
+    def exception(self) -> None:
+        """Return the socket error."""
+        return None
+
+
+class FakeRealtimeServer:
+    """Answer realtime transcription sessions the way the API does.
+
+    A commit is acknowledged and its item transcribed as the next entry of
+    transcripts. The on_append and on_commit hooks, if set, run as those
+    events arrive and can push events of their own.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the server."""
+        self.sockets: list[FakeWebSocket] = []
+        self.transcripts: list[str] = []
+        self.audio = bytearray()
+        self.on_append: Callable[[FakeWebSocket], None] | None = None
+        self.on_commit: Callable[[FakeWebSocket], None] | None = None
+        self.connect_error: Exception | None = None
+        self._items = 0
+
+    def new_item(self) -> str:
+        """Return a fresh item id."""
+        self._items += 1
+        return f"item_{self._items}"
+
+    async def ws_connect(self, url: str, **kwargs: Any) -> FakeWebSocket:
+        """Open a socket, like aiohttp.ClientSession.ws_connect."""
+        if self.connect_error is not None:
+            raise self.connect_error
+        ws = FakeWebSocket(self)
+        self.sockets.append(ws)
+        return ws
+
+    def handle(self, ws: FakeWebSocket, event: dict[str, Any]) -> None:
+        """Respond to a client event."""
+        if event["type"] == "transcription_session.update":
+            ws.push({"type": SESSION_UPDATED})
+        elif event["type"] == "input_audio_buffer.append":
+            self.audio += event["audio"].encode()
+            if self.on_append is not None:
+                self.on_append(ws)
+        elif event["type"] == "input_audio_buffer.commit":
+            if self.on_commit is not None:
+                self.on_commit(ws)
+            item_id = self.new_item()
+            ws.push({"type": BUFFER_COMMITTED, "item_id": item_id})
+            ws.push(
+                {
+                    "type": TRANSCRIPTION_COMPLETED,
+                    "item_id": item_id,
+                    "transcript": self.transcripts.pop(0) if self.transcripts else "",
+                }
+            )
+
+
+@pytest.fixture
+def realtime_server() -> FakeRealtimeServer:
+    """Return a realtime API stand-in."""
+    return FakeRealtimeServer()
+
+
+@pytest.fixture
+def realtime_client(realtime_server: FakeRealtimeServer) -> OpenAIWebSocketClient:
+    """Return a realtime client connecting to the stand-in."""
+    return OpenAIWebSocketClient(
+        realtime_server,
+        "sk-test",
+        "wss://api.openai.com/v1",
+        "gpt-4o-transcribe",
+        "",
+        "none",
+        frame_ms=0,
+    )
+
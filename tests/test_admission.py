@@ -0,0 +1,223 @@
+"""Tests for admission control."""
+
+from __future__ import annotations
+
+import asyncio
+
+from homeassistant.components.stt import (
+    AudioBitRates,
+    AudioChannels,
+    AudioCodecs,
+    AudioFormats,
+    AudioSampleRates,
+    SpeechMetadata,
+    SpeechResult,
+    SpeechResultState,
+)
+
+from custom_components.openai_stt.admission import AdmissionController
+from custom_components.openai_stt.telemetry import NOOP_TELEMETRY
+
+METADATA = SpeechMetadata(
+    language="en-US",
+    format=AudioFormats.WAV,
+    codec=AudioCodecs.PCM,
+    bit_rate=AudioBitRates.BITRATE_16,
+    sample_rate=AudioSampleRates.SAMPLERATE_16000,
+    channel=AudioChannels.CHANNEL_MONO,
+)
+
+
+async def empty_stream():
+    """Yield no audio."""
+    return
+    yield
+
+
+class Requests:
+    """Transcriptions that finish when told to, in admission order."""
+
+    def __init__(self) -> None:
+        """Initialize the requests."""
+        self.started: list[asyncio.Future[None]] = []
+
+    async def transcribe(self, metadata, stream) -> SpeechResult:
+        """Wait until released, then succeed."""
+        release = asyncio.get_running_loop().create_future()
+        self.started.append(release)
+        await release
+        return SpeechResult("ok", SpeechResultState.SUCCESS)
+
+    def release(self, index: int) -> None:
+        """Finish a started request."""
+        self.started[index].set_result(None)
+
+
+def submit(
+    controller: AdmissionController, requests: Requests
+) -> asyncio.Task[SpeechResult]:
+    """Start an utterance through the controller."""
+    return asyncio.create_task(
+        controller.async_transcribe(METADATA, empty_stream(), requests.transcribe)
+    )
+
+
+async def settle() -> None:
+    """Let the scheduled tasks run."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def test_queues_in_arrival_order() -> None:
+    """Test that requests beyond the limit wait and start in order."""
+    controller = AdmissionController(2, 10, 5.0)
+    requests = Requests()
+
+    tasks = [submit(controller, requests) for _ in range(4)]
+    await settle()
+
+    assert len(requests.started) == 2
+    assert controller.in_flight == 2
+    assert controller.queued == 2
+
+    requests.release(0)
+    await settle()
+    assert len(requests.started) == 3
+    assert tasks[0].done()
+
+    for index in range(1, 4):
+        requests.release(index)
+        await settle()
+    results = await asyncio.gather(*tasks)
+
+    assert [result.text for result in results] == ["ok"] * 4
+    assert controller.in_flight == 0
+    assert controller.queued == 0
+    assert controller.stats.admitted == 4
+    assert controller.stats.queued == 2
+
+
+async def test_rejects_when_queue_full() -> None:
+    """Test that an utterance is rejected right away when the queue is full."""
+    controller = AdmissionController(1, 1, 5.0)
+    requests = Requests()
+    tasks = [submit(controller, requests) for _ in range(2)]
+    await settle()
+
+    result = await submit(controller, requests)
+
+    assert result.result == SpeechResultState.ERROR
+    assert controller.stats.shed_queue_full == 1
+    requests.release(0)
+    await settle()
+    requests.release(1)
+    await asyncio.gather(*tasks)
+    assert controller.in_flight == 0
+
+
+async def test_rejects_after_queue_timeout() -> None:
+    """Test that a waiter is rejected once it waited for queue_timeout."""
+    controller = AdmissionController(1, 5, 0.05)
+    requests = Requests()
+    holder = submit(controller, requests)
+    await settle()
+
+    result = await submit(controller, requests)
+
+    assert result.result == SpeechResultState.ERROR
+    assert controller.stats.shed_deadline == 1
+    assert controller.queued == 0
+    requests.release(0)
+    await holder
+    assert controller.in_flight == 0
+
+
+async def test_rejects_on_expected_wait() -> None:
+    """Test that an utterance is rejected when the expected wait is too long."""
+    controller = AdmissionController(1, 5, 10.0)
+    requests = Requests()
+    first = submit(controller, requests)
+    await settle()
+    await asyncio.sleep(0.05)
+    requests.release(0)
+    await first
+
+    # Requests hold their slot for about 50 ms
+    controller.update(1, 5, 0.01)
+    holder = submit(controller, requests)
+    await settle()
+    result = await submit(controller, requests)
+
+    assert result.result == SpeechResultState.ERROR
+    assert controller.stats.shed_deadline == 1
+    requests.release(1)
+    await holder
+
+
+async def test_slot_handed_over_as_wait_ends() -> None:
+    """Test that a slot handed to a waiter that stops waiting is passed on."""
+    controller = AdmissionController(1, 5, 5.0)
+    requests = Requests()
+    assert await controller._async_acquire(NOOP_TELEMETRY)
+    waiter = submit(controller, requests)
+    await settle()
+    assert controller.queued == 1
+
+    # The slot is handed to the waiter, which is cancelled before it runs
+    controller._release()
+    waiter.cancel()
+    await asyncio.gather(waiter, return_exceptions=True)
+
+    assert waiter.cancelled()
+    assert not requests.started
+    assert controller.in_flight == 0
+    assert controller.queued == 0
+
+    # The slot is free for the next utterance
+    late = submit(controller, requests)
+    await settle()
+    assert controller.in_flight == 1
+    requests.release(0)
+    assert (await late).text == "ok"
+    assert controller.in_flight == 0
+
+
+async def test_no_slots_leak_under_contention() -> None:
+    """Test that timeouts racing with hand-overs leave the counts consistent."""
+    controller = AdmissionController(2, 20, 0.03)
+
+    async def transcribe(metadata, stream) -> SpeechResult:
+        await asyncio.sleep(0.01)
+        return SpeechResult("ok", SpeechResultState.SUCCESS)
+
+    results = await asyncio.gather(
+        *(
+            controller.async_transcribe(METADATA, empty_stream(), transcribe)
+            for _ in range(30)
+        )
+    )
+
+    succeeded = sum(result.result == SpeechResultState.SUCCESS for result in results)
+    assert succeeded == controller.stats.admitted
+    assert succeeded + controller.stats.shed == 30
+    assert controller.in_flight == 0
+    assert controller.queued == 0
+
+
+async def test_raising_limit_admits_waiters() -> None:
+    """Test that more room admits queued utterances right away."""
+    controller = AdmissionController(1, 5, 5.0)
+    requests = Requests()
+    tasks = [submit(controller, requests) for _ in range(3)]
+    await settle()
+    assert len(requests.started) == 1
+
+    controller.update(3, 5, 5.0)
+    await settle()
+
+    assert len(requests.started) == 3
+    assert controller.in_flight == 3
+    for index in range(3):
+        requests.release(index)
+    await asyncio.gather(*tasks)
+    assert controller.in_flight == 0
@@ -0,0 +1,200 @@
+"""Tests for the transcript cache."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from homeassistant.components.stt import (
+    AudioBitRates,
+    AudioChannels,
+    AudioCodecs,
+    AudioFormats,
+    AudioSampleRates,
+    SpeechMetadata,
+    SpeechResult,
+    SpeechResultState,
+)
+import pytest
+
+from custom_components.openai_stt import cache as cache_module
+from custom_components.openai_stt.cache import TranscriptCache
+
+METADATA = SpeechMetadata(
+    language="en-US",
+    format=AudioFormats.WAV,
+    codec=AudioCodecs.PCM,
+    bit_rate=AudioBitRates.BITRATE_16,
+    sample_rate=AudioSampleRates.SAMPLERATE_16000,
+    channel=AudioChannels.CHANNEL_MONO,
+)
+
+PARAMS = ("https://api.openai.com/v1", "whisper-1")
+
+
+class Clock:
+    """Wall clock the test sets."""
+
+    def __init__(self) -> None:
+        """Initialize the clock."""
+        self.now = 1_700_000_000.0
+
+    def time(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+class FakeStore:
+    """In-memory stand-in for Home Assistant's Store."""
+
+    saved: dict[str, Any] | None = None
+
+    def __init__(self, hass, version: int, key: str) -> None:
+        """Initialize the store."""
+        self._save = None
+
+    async def async_load(self) -> dict[str, Any] | None:
+        """Return the saved data."""
+        return FakeStore.saved
+
+    def async_delay_save(self, data_func, delay: float) -> None:
+        """Remember the data to save."""
+        self._save = data_func
+
+    def flush(self) -> None:
+        """Save the pending data."""
+        FakeStore.saved = self._save()
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    """Return the clock the cache reads."""
+    clock = Clock()
+    monkeypatch.setattr(cache_module, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def store(monkeypatch: pytest.MonkeyPatch) -> type[FakeStore]:
+    """Back persistent caches with an in-memory store."""
+    monkeypatch.setattr(cache_module, "Store", FakeStore)
+    FakeStore.saved = None
+    return FakeStore
+
+
+async def audio(data: bytes):
+    """Yield the audio in two chunks."""
+    yield data[:2]
+    yield data[2:]
+
+
+class Upstream:
+    """A transcription request that consumes the audio."""
+
+    def __init__(self, text: str = "hello") -> None:
+        """Initialize the request."""
+        self.text = text
+        self.calls = 0
+        self.cancelled = 0
+
+    async def transcribe(self, metadata, stream) -> SpeechResult:
+        """Read the audio, then return the transcript."""
+        self.calls += 1
+        try:
+            async for _ in stream:
+                pass
+            await asyncio.sleep(0)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return SpeechResult(self.text, SpeechResultState.SUCCESS)
+
+
+async def run(
+    cache: TranscriptCache, upstream: Upstream, data: bytes, params=PARAMS
+) -> str | None:
+    """Transcribe audio through the cache."""
+    result = await cache.async_transcribe(
+        METADATA, audio(data), upstream.transcribe, params
+    )
+    return result.text
+
+
+async def test_hit_cancels_upstream(clock: Clock) -> None:
+    """Test that a repeated utterance is answered from the cache."""
+    cache = TranscriptCache(None, "entry", 10, 60, False)
+    upstream = Upstream()
+
+    assert await run(cache, upstream, b"turn on") == "hello"
+    upstream.text = "changed"
+    assert await run(cache, upstream, b"turn on") == "hello"
+
+    assert upstream.calls == 2
+    assert upstream.cancelled == 1
+    assert (cache.stats.misses, cache.stats.memory_hits) == (1, 1)
+    assert cache.stats.hit_rate == 0.5
+
+
+async def test_key_covers_audio_and_params(clock: Clock) -> None:
+    """Test that other audio or other settings miss."""
+    cache = TranscriptCache(None, "entry", 10, 60, False)
+    upstream = Upstream()
+    await run(cache, upstream, b"turn on")
+
+    await run(cache, upstream, b"turn off")
+    await run(cache, upstream, b"turn on", ("http://local:8000/v1", "whisper-1"))
+
+    assert cache.stats.misses == 3
+    assert cache.stats.memory_hits == 0
+
+
+async def test_failures_are_not_cached(clock: Clock) -> None:
+    """Test that an empty transcript is not stored."""
+    cache = TranscriptCache(None, "entry", 10, 60, False)
+
+    await run(cache, Upstream(""), b"noise")
+
+    assert cache.stats.stores == 0
+
+
+async def test_entries_expire(clock: Clock) -> None:
+    """Test that a transcript older than the TTL is not used."""
+    cache = TranscriptCache(None, "entry", 10, 60, False)
+    cache.put("key", "hello")
+
+    clock.now += 59
+    assert cache.get("key") == "hello"
+    clock.now += 2
+    assert cache.get("key") is None
+
+
+def test_least_recently_used_evicted(clock: Clock) -> None:
+    """Test that the in-memory cache drops its least recently used entry."""
+    cache = TranscriptCache(None, "entry", 2, 60, False)
+    cache.put("a", "A")
+    cache.put("b", "B")
+    assert cache.get("a") == "A"
+
+    cache.put("c", "C")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    assert cache.get("c") == "C"
+
+
+async def test_persistent_round_trip(clock: Clock, store: type[FakeStore]) -> None:
+    """Test that stored transcripts are loaded again, without expired ones."""
+    cache = TranscriptCache(None, "entry", 10, 60, True)
+    await cache.async_load()
+    cache.put("old", "stale")
+    clock.now += 30
+    cache.put("new", "fresh")
+    cache._store.flush()
+
+    clock.now += 40
+    loaded = TranscriptCache(None, "entry", 10, 60, True)
+    await loaded.async_load()
+
+    assert loaded.get("new") == "fresh"
+    assert loaded.stats.disk_hits == 1
+    assert loaded.get("old") is None
@@ -0,0 +1,124 @@
+"""Tests for compressed audio encoding and decoding."""
+
+from __future__ import annotations
+
+import io
+
+import numpy as np
+import pytest
+
+from custom_components.openai_stt.encoding import OggOpusDecoder, encode_pcm
+
+av = pytest.importorskip("av")
+
+RATE = 16000
+
+
+def tone(seconds: float = 1.0) -> bytes:
+    """Return a 440 Hz tone as PCM16."""
+    t = np.arange(int(RATE * seconds)) / RATE
+    return (np.sin(2 * np.pi * 440 * t) * 10000).astype(np.int16).tobytes()
+
+
+def decode(data: bytes) -> np.ndarray:
+    """Decode a file to 16 kHz mono PCM16 samples."""
+    resampler = av.AudioResampler(format="s16", layout="mono", rate=RATE)
+    with av.open(io.BytesIO(data)) as container:
+        frames = [
+            resampled.to_ndarray().reshape(-1)
+            for frame in container.decode(audio=0)
+            for resampled in resampler.resample(frame)
+        ]
+    return np.concatenate(frames)
+
+
+def test_flac_is_lossless() -> None:
+    """Test that FLAC uploads decode to the exact input."""
+    pcm = tone()
+
+    flac = encode_pcm(memoryview(pcm), "flac", RATE, 1)
+
+    assert flac.startswith(b"fLaC")
+    assert len(flac) < len(pcm)
+    assert decode(flac).tobytes() == pcm
+
+
+def test_opus_in_ogg() -> None:
+    """Test that Opus uploads are Ogg files of the same duration."""
+    pcm = tone()
+
+    ogg = encode_pcm(memoryview(pcm), "opus", RATE, 1)
+
+    assert ogg.startswith(b"OggS")
+    assert len(ogg) < len(pcm) // 5
+    assert abs(len(decode(ogg)) - RATE) < RATE // 20
+
+
+def page(*segments: int, fill: int = 0) -> bytes:
+    """Return an Ogg page with the given lacing values."""
+    header = b"OggS" + bytes(22) + bytes([len(segments)]) + bytes(segments)
+    return header + bytes([fill]) * sum(segments)
+
+
+def packets(decoder: OggOpusDecoder, *chunks: bytes) -> list[bytes]:
+    """Feed chunks to the page parser and return the packets found."""
+    found = []
+    for chunk in chunks:
+        decoder._buffer += chunk
+        found.extend(decoder._packets())
+    return found
+
+
+def test_packets_in_a_page() -> None:
+    """Test that every lacing value below 255 ends a packet."""
+    decoder = OggOpusDecoder(RATE)
+
+    assert packets(decoder, page(3, 0, 10)) == [bytes(3), b"", bytes(10)]
+
+
+def test_packet_across_pages() -> None:
+    """Test that a packet continued on the next page is joined."""
+    decoder = OggOpusDecoder(RATE)
+
+    found = packets(decoder, page(255, 255, fill=1), page(20, 4, fill=2))
+
+    assert found == [b"\x01" * 510 + b"\x02" * 20, b"\x02" * 4]
+
+
+def test_resynchronizes_after_garbage() -> None:
+    """Test that bytes between pages are skipped."""
+    decoder = OggOpusDecoder(RATE)
+
+    found = packets(decoder, b"junk" * 20 + page(5) + b"Og" + page(7))
+
+    assert found == [bytes(5), bytes(7)]
+
+
+def test_waits_for_whole_page() -> None:
+    """Test that pages split across chunks, even byte by byte, are parsed."""
+    data = page(255, 40, 9, fill=3) + page(100)
+    decoder = OggOpusDecoder(RATE)
+
+    found = packets(decoder, *(data[i : i + 1] for i in range(len(data))))
+
+    assert found == [b"\x03" * 295, b"\x03" * 9, bytes(100)]
+    assert not decoder._buffer
+
+
+@pytest.mark.parametrize("chunk_size", [1, 97, 4096])
+def test_opus_round_trip(chunk_size: int) -> None:
+    """Test that encoded Opus decodes to audio of the same duration."""
+    pcm = tone()
+    ogg = encode_pcm(memoryview(pcm), "opus", RATE, 1)
+    decoder = OggOpusDecoder(RATE)
+
+    decoded = b"".join(
+        decoder.decode(ogg[start : start + chunk_size])
+        for start in range(0, len(ogg), chunk_size)
+    )
+    decoded += decoder.flush()
+
+    samples = np.frombuffer(decoded, dtype=np.int16)
+    # Opus pads the start with its pre-skip
+    assert abs(len(samples) - RATE) < RATE // 20
+    assert np.abs(samples).max() > 5000
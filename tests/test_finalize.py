@@ -0,0 +1,68 @@
+"""Tests for early finalization of realtime utterances."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from custom_components.openai_stt import finalize
+from custom_components.openai_stt.finalize import EarlyFinalizer, EarlyFinalizeStats
+
+
+async def stream(chunks: int, delay: float):
+    """Yield chunks of audio spaced by delay seconds."""
+    for _ in range(chunks):
+        await asyncio.sleep(delay)
+        yield b"\0\0"
+
+
+async def cut(finalizer: EarlyFinalizer, audio) -> int:
+    """Read the gated stream, stopping after the first chunk."""
+    received = 0
+    async for _chunk in finalizer.async_gate(audio):
+        received += 1
+        finalizer.stop()
+    return received
+
+
+async def test_gate_stops_at_end_of_speech() -> None:
+    """Test that the stream ends without waiting for the next chunk."""
+    stats = EarlyFinalizeStats()
+    finalizer = EarlyFinalizer(stats)
+
+    async with asyncio.timeout(0.5):
+        assert await cut(finalizer, stream(100, 0.01)) == 1
+    finalizer.finish()
+
+    assert finalizer.early
+    assert (stats.utterances, stats.early) == (1, 1)
+
+
+async def test_lead_measured_at_end_of_stream() -> None:
+    """Test that the lead is the time until Home Assistant ended the stream."""
+    stats = EarlyFinalizeStats()
+    finalizer = EarlyFinalizer(stats)
+    await cut(finalizer, stream(5, 0.02))
+
+    await finalizer.async_measure(time.perf_counter())
+
+    assert stats.ahead == 1
+    # Four more chunks 20 ms apart followed the cut
+    assert stats.lead_last >= 0.06
+    assert stats.unmeasured == 0
+
+
+async def test_drain_is_bounded(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a stream that does not end is followed for LEAD_TIMEOUT only."""
+    monkeypatch.setattr(finalize, "LEAD_TIMEOUT", 0.05)
+    stats = EarlyFinalizeStats()
+    finalizer = EarlyFinalizer(stats)
+    await cut(finalizer, stream(1000, 0.01))
+
+    async with asyncio.timeout(0.5):
+        await finalizer.async_measure(time.perf_counter())
+
+    assert stats.unmeasured == 1
+    assert stats.ahead == 0
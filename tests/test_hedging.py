@@ -0,0 +1,196 @@
+"""Tests for hedged transcription requests."""
+
+from __future__ import annotations
+
+import asyncio
+
+from homeassistant.components.stt import (
+    AudioBitRates,
+    AudioChannels,
+    AudioCodecs,
+    AudioFormats,
+    AudioSampleRates,
+    SpeechMetadata,
+    SpeechResult,
+    SpeechResultState,
+)
+import pytest
+
+from custom_components.openai_stt import hedging
+from custom_components.openai_stt.hedging import AudioTee, HedgedTranscriber
+
+METADATA = SpeechMetadata(
+    language="en-US",
+    format=AudioFormats.WAV,
+    codec=AudioCodecs.PCM,
+    bit_rate=AudioBitRates.BITRATE_16,
+    sample_rate=AudioSampleRates.SAMPLERATE_16000,
+    channel=AudioChannels.CHANNEL_MONO,
+)
+
+AUDIO = [b"one", b"two", b"three"]
+
+
+@pytest.fixture(autouse=True)
+def short_initial_delay(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Hedge after 50 ms instead of seconds."""
+    monkeypatch.setattr(hedging, "HEDGE_INITIAL_DELAY", 0.05)
+
+
+async def audio_stream():
+    """Yield the test audio with a pause between chunks."""
+    for chunk in AUDIO:
+        await asyncio.sleep(0.001)
+        yield chunk
+
+
+def transcriber(text: str, latency: float, calls: list[bytes] | None = None):
+    """Return a transcriber that reads the audio and answers after latency."""
+
+    async def transcribe(metadata, stream) -> SpeechResult:
+        audio = b"".join([chunk async for chunk in stream])
+        if calls is not None:
+            calls.append(audio)
+        await asyncio.sleep(latency)
+        if not text:
+            raise OSError("connection reset")
+        return SpeechResult(text, SpeechResultState.SUCCESS)
+
+    return transcribe
+
+
+async def test_primary_wins_without_hedge() -> None:
+    """Test that a fast primary answers alone."""
+    hedger = HedgedTranscriber(95)
+    hedge_calls: list[bytes] = []
+
+    result = await hedger.async_transcribe(
+        METADATA,
+        audio_stream(),
+        transcriber("primary", 0.001),
+        transcriber("hedge", 0.001, hedge_calls),
+    )
+
+    assert result.text == "primary"
+    assert not hedge_calls
+    assert hedger.stats.requests == 1
+    assert hedger.stats.hedged == 0
+    assert hedger.stats.primary_wins == 1
+
+
+async def test_slow_primary_is_hedged() -> None:
+    """Test that the hedge answers for a slow primary, which is cancelled."""
+    hedger = HedgedTranscriber(95)
+    cancelled = asyncio.Event()
+
+    async def slow(metadata, stream) -> SpeechResult:
+        async for _ in stream:
+            pass
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return SpeechResult("primary", SpeechResultState.SUCCESS)
+
+    hedge_calls: list[bytes] = []
+    result = await hedger.async_transcribe(
+        METADATA, audio_stream(), slow, transcriber("hedge", 0.001, hedge_calls)
+    )
+
+    assert result.text == "hedge"
+    assert cancelled.is_set()
+    assert hedge_calls == [b"".join(AUDIO)]
+    assert hedger.stats.hedged == 1
+    assert hedger.stats.hedge_wins == 1
+    # The cancelled primary took at least the hedge delay
+    assert len(hedger._latencies) == 1
+    assert hedger._latencies[0] >= hedging.HEDGE_INITIAL_DELAY
+
+
+async def test_delay_follows_slow_primaries() -> None:
+    """Test that primaries losing to the hedge raise the hedge delay."""
+    hedger = HedgedTranscriber(50)
+    hedger._latencies.extend([0.01] * hedging.HEDGE_MIN_SAMPLES)
+
+    for _ in range(hedging.HEDGE_MIN_SAMPLES + 1):
+        await hedger.async_transcribe(
+            METADATA,
+            audio_stream(),
+            transcriber("primary", 1),
+            transcriber("hedge", 0.001),
+        )
+
+    assert hedger.stats.hedge_wins == hedging.HEDGE_MIN_SAMPLES + 1
+    assert hedger.delay() > 0.01
+
+
+async def test_failed_primary_is_hedged_right_away(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that a failing primary does not wait for the hedge delay."""
+    monkeypatch.setattr(hedging, "HEDGE_INITIAL_DELAY", 10.0)
+    hedger = HedgedTranscriber(95)
+
+    result = await asyncio.wait_for(
+        hedger.async_transcribe(
+            METADATA,
+            audio_stream(),
+            transcriber("", 0.001),
+            transcriber("hedge", 0.001),
+        ),
+        1,
+    )
+
+    assert result.text == "hedge"
+    assert hedger.stats.hedge_wins == 1
+
+
+async def test_slow_primary_may_still_win() -> None:
+    """Test that the primary wins if it answers before the hedge."""
+    hedger = HedgedTranscriber(95)
+
+    result = await hedger.async_transcribe(
+        METADATA,
+        audio_stream(),
+        transcriber("primary", 0.1),
+        transcriber("hedge", 1),
+    )
+
+    assert result.text == "primary"
+    assert hedger.stats.hedged == 1
+    assert hedger.stats.primary_wins == 1
+
+
+async def test_both_fail() -> None:
+    """Test that an error is returned when neither request succeeds."""
+    hedger = HedgedTranscriber(95)
+
+    result = await hedger.async_transcribe(
+        METADATA, audio_stream(), transcriber("", 0.001), transcriber("", 0.001)
+    )
+
+    assert result.result == SpeechResultState.ERROR
+    assert hedger.stats.failures == 1
+
+
+def test_delay_from_latencies() -> None:
+    """Test that the delay follows the percentile once enough are seen."""
+    hedger = HedgedTranscriber(90)
+    assert hedger.delay() == hedging.HEDGE_INITIAL_DELAY
+
+    hedger._latencies.extend(i / 10 for i in range(1, 21))
+
+    assert hedger.delay() == pytest.approx(1.9)
+
+
+async def test_tee_branches_replay_stream() -> None:
+    """Test that a branch started late still sees the whole stream."""
+    tee = AudioTee(audio_stream())
+    tee.start()
+
+    early = [chunk async for chunk in tee.branch()]
+    late = [chunk async for chunk in tee.branch()]
+
+    assert early == late == AUDIO
+    await tee.async_close()
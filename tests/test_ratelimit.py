@@ -0,0 +1,138 @@
+"""Tests for the rate limiter across API keys."""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from custom_components.openai_stt.ratelimit import (
+    LIMIT_REQUESTS_HEADER,
+    REMAINING_REQUESTS_HEADER,
+    REMAINING_TOKENS_HEADER,
+    RESET_REQUESTS_HEADER,
+    RESET_TOKENS_HEADER,
+    RateLimiter,
+    parse_api_keys,
+    parse_reset,
+)
+
+
+def budget_headers(limit: int, remaining: int, reset: str) -> dict[str, str]:
+    """Return request budget headers."""
+    return {
+        LIMIT_REQUESTS_HEADER: str(limit),
+        REMAINING_REQUESTS_HEADER: str(remaining),
+        RESET_REQUESTS_HEADER: reset,
+    }
+
+
+@pytest.mark.parametrize(
+    ("value", "seconds"),
+    [
+        ("1s", 1.0),
+        ("6m0s", 360.0),
+        ("1h2m3.5s", 3723.5),
+        ("20ms", 0.02),
+        ("2.5", 2.5),
+        ("", None),
+        (None, None),
+        ("soon", None),
+    ],
+)
+def test_parse_reset(value: str | None, seconds: float | None) -> None:
+    """Test parsing the durations of the reset headers."""
+    assert parse_reset(value) == pytest.approx(seconds)
+
+
+def test_parse_api_keys() -> None:
+    """Test that keys may be separated by spaces or lines."""
+    assert parse_api_keys(" sk-a\nsk-b  sk-c\n") == ["sk-a", "sk-b", "sk-c"]
+    assert parse_api_keys("") == []
+
+
+async def test_rotates_across_keys() -> None:
+    """Test that keys with unknown limits are used in turn."""
+    limiter = RateLimiter(["a", "b", "c"])
+
+    keys = [await limiter.async_acquire() for _ in range(6)]
+
+    assert keys == ["a", "b", "c", "a", "b", "c"]
+    assert limiter.waits == 0
+
+
+async def test_exhausted_key_is_skipped() -> None:
+    """Test that a key without tokens is left alone while another has some."""
+    limiter = RateLimiter(["a", "b"])
+    limiter.update("a", budget_headers(100, 0, "30s"))
+
+    keys = [await limiter.async_acquire() for _ in range(3)]
+
+    assert keys == ["b", "b", "b"]
+
+
+async def test_429_blocks_key() -> None:
+    """Test that a 429 leaves the key alone for its Retry-After."""
+    limiter = RateLimiter(["a", "b"])
+    limiter.update("a", {"Retry-After": "20"}, limited=True)
+
+    assert await limiter.async_acquire() == "b"
+    assert await limiter.async_acquire() == "b"
+    stats = limiter.as_dict()["keys"][0]
+    assert stats["limited"] == 1
+    assert 19 < stats["blocked_for"] <= 20
+
+
+async def test_token_limit_blocks_key() -> None:
+    """Test that a used up token budget blocks the key until it resets."""
+    limiter = RateLimiter(["a", "b"])
+    limiter.update("a", {REMAINING_TOKENS_HEADER: "0", RESET_TOKENS_HEADER: "10s"})
+
+    assert await limiter.async_acquire() == "b"
+
+
+async def test_waits_for_refill() -> None:
+    """Test that a request waits for a token instead of running into a 429."""
+    limiter = RateLimiter(["a"])
+    # 10 requests per 100 ms, all used up
+    limiter.update("a", budget_headers(10, 0, "100ms"))
+
+    start = time.monotonic()
+    assert await limiter.async_acquire() == "a"
+
+    waited = time.monotonic() - start
+    assert 0.005 <= waited < 0.5
+    assert limiter.waits == 1
+
+
+async def test_refill_rate_from_reset() -> None:
+    """Test that the refill rate is derived from the reset time."""
+    limiter = RateLimiter(["a"])
+    limiter.update("a", budget_headers(60, 30, "30s"))
+
+    key = limiter.as_dict()["keys"][0]
+    assert key["limit"] == 60
+    assert key["rate"] == pytest.approx(1.0)
+    assert key["tokens"] == pytest.approx(30, abs=0.1)
+
+
+def test_update_keys_keeps_budgets() -> None:
+    """Test that keys kept across an update keep what was learned."""
+    limiter = RateLimiter(["a", "b"])
+    limiter.update("b", budget_headers(100, 40, "1m"))
+
+    limiter.update_keys(["b", "c"])
+
+    keys = limiter.as_dict()["keys"]
+    assert [key["index"] for key in keys] == [0, 1]
+    assert keys[0]["limit"] == 100
+    assert keys[1]["limit"] is None
+
+
+def test_update_unknown_key_is_ignored() -> None:
+    """Test that headers for a key that was removed are ignored."""
+    limiter = RateLimiter(["a"])
+
+    limiter.update("gone", budget_headers(1, 0, "1s"), limited=True)
+
+    assert limiter.as_dict()["keys"][0]["limited"] == 0
@@ -0,0 +1,202 @@
+"""Tests for the persistent realtime session."""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+
+from aiohttp import ClientError
+from homeassistant.components.stt import (
+    AudioBitRates,
+    AudioChannels,
+    AudioCodecs,
+    AudioFormats,
+    AudioSampleRates,
+    SpeechMetadata,
+    SpeechResultState,
+)
+import pytest
+
+from custom_components.openai_stt import realtime_session
+from custom_components.openai_stt.events import (
+    BUFFER_COMMITTED,
+    TRANSCRIPTION_COMPLETED,
+)
+from custom_components.openai_stt.realtime_session import PersistentRealtimeSession
+from custom_components.openai_stt.timing import StageTimings
+from custom_components.openai_stt.websocket_client import OpenAIWebSocketClient
+
+from .conftest import FakeRealtimeServer, FakeWebSocket
+
+METADATA = SpeechMetadata(
+    language="en-US",
+    format=AudioFormats.WAV,
+    codec=AudioCodecs.PCM,
+    bit_rate=AudioBitRates.BITRATE_16,
+    sample_rate=AudioSampleRates.SAMPLERATE_16000,
+    channel=AudioChannels.CHANNEL_MONO,
+)
+
+CHUNK = bytes(960)
+
+
+async def audio(chunks: int = 3):
+    """Yield a few chunks of PCM16."""
+    for _ in range(chunks):
+        await asyncio.sleep(0)
+        yield CHUNK
+
+
+@pytest.fixture
+async def session(realtime_client: OpenAIWebSocketClient):
+    """Return a persistent session, closed after the test."""
+    session = PersistentRealtimeSession(realtime_client, "en-US")
+    realtime_client.session = session
+    yield session
+    await session.async_close()
+
+
+async def test_turns_share_one_socket(
+    session: PersistentRealtimeSession, realtime_server: FakeRealtimeServer
+) -> None:
+    """Test that consecutive utterances use the same configured socket."""
+    realtime_server.transcripts = ["first", "second"]
+
+    first = await session.async_transcribe("en-US", audio(), StageTimings())
+    second = await session.async_transcribe("en-US", audio(), StageTimings())
+
+    assert (first, second) == ("first", "second")
+    assert len(realtime_server.sockets) == 1
+    sent = [event["type"] for event in realtime_server.sockets[0].sent]
+    assert sent.count("transcription_session.update") == 1
+    assert sent.count("input_audio_buffer.clear") == 2
+    assert sent.count("input_audio_buffer.commit") == 2
+    assert base64.b64decode(bytes(realtime_server.audio[: len(CHUNK) * 4 // 3])) == (
+        CHUNK
+    )
+
+
+async def test_stage_timings_are_stamped(
+    session: PersistentRealtimeSession, realtime_server: FakeRealtimeServer
+) -> None:
+    """Test that a turn reports its upload, server and parse stages."""
+    realtime_server.transcripts = ["hello"]
+    timings = StageTimings()
+
+    await session.async_transcribe("en-US", timings.track_audio(audio()), timings)
+
+    assert timings.collect is not None
+    assert timings.upload is not None and timings.upload >= 0
+    assert timings.first_byte is not None and timings.first_byte >= 0
+    assert timings.server is not None and timings.server >= timings.first_byte
+    assert timings.parse is not None
+
+
+async def test_late_events_of_earlier_turn_are_ignored(
+    session: PersistentRealtimeSession, realtime_server: FakeRealtimeServer
+) -> None:
+    """Test that a transcript for an item of another turn is not taken."""
+    realtime_server.transcripts = ["mine"]
+
+    def late_transcript(ws: FakeWebSocket) -> None:
+        ws.push(
+            {
+                "type": TRANSCRIPTION_COMPLETED,
+                "item_id": "item_earlier",
+                "transcript": "stale",
+            }
+        )
+
+    realtime_server.on_commit = late_transcript
+
+    assert await session.async_transcribe("en-US", audio(), StageTimings()) == "mine"
+
+
+async def test_items_committed_by_server_vad_are_joined(
+    session: PersistentRealtimeSession, realtime_server: FakeRealtimeServer
+) -> None:
+    """Test that all items committed during the turn make up its transcript."""
+    realtime_server.transcripts = ["and the rest"]
+
+    def vad_commit(ws: FakeWebSocket) -> None:
+        realtime_server.on_append = None
+        item_id = realtime_server.new_item()
+        ws.push({"type": BUFFER_COMMITTED, "item_id": item_id})
+        ws.push(
+            {
+                "type": TRANSCRIPTION_COMPLETED,
+                "item_id": item_id,
+                "transcript": "The first part",
+            }
+        )
+
+    realtime_server.on_append = vad_commit
+
+    assert await session.async_transcribe("en-US", audio(), StageTimings()) == (
+        "The first part and the rest"
+    )
+
+
+async def test_drop_fails_turn_and_reconnects(
+    session: PersistentRealtimeSession,
+    realtime_server: FakeRealtimeServer,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that a dropped socket fails the turn and the next one reconnects."""
+    monkeypatch.setattr(realtime_session, "RECONNECT_BACKOFF_MIN", 0.01)
+    realtime_server.transcripts = ["", "again"]
+    realtime_server.on_commit = FakeWebSocket.drop
+
+    with pytest.raises(ClientError):
+        await session.async_transcribe("en-US", audio(), StageTimings())
+
+    realtime_server.on_commit = None
+    assert await session.async_transcribe("en-US", audio(), StageTimings()) == "again"
+    assert len(realtime_server.sockets) == 2
+
+
+async def test_language_change_reconfigures(
+    session: PersistentRealtimeSession, realtime_server: FakeRealtimeServer
+) -> None:
+    """Test that another language updates the socket instead of replacing it."""
+    await session.async_transcribe("en-US", audio(), StageTimings())
+    await session.async_transcribe("de-DE", audio(), StageTimings())
+
+    assert len(realtime_server.sockets) == 1
+    updates = [
+        event["session"]["input_audio_transcription"]["language"]
+        for event in realtime_server.sockets[0].sent
+        if event["type"] == "transcription_session.update"
+    ]
+    assert updates == ["en", "de"]
+
+
+async def test_busy_session_falls_back_to_own_connection(
+    session: PersistentRealtimeSession,
+    realtime_server: FakeRealtimeServer,
+    realtime_client: OpenAIWebSocketClient,
+) -> None:
+    """Test that an utterance overlapping another opens a connection of its own."""
+    realtime_server.transcripts = ["overlap", "held"]
+    release = asyncio.Event()
+
+    async def held_audio():
+        yield CHUNK
+        await release.wait()
+
+    held = asyncio.create_task(
+        realtime_client.async_process_audio_stream(METADATA, held_audio())
+    )
+    while not session.busy:
+        await asyncio.sleep(0)
+
+    result = await realtime_client.async_process_audio_stream(METADATA, audio())
+    release.set()
+
+    assert result.text == "overlap"
+    assert (await held).text == "held"
+    assert len(realtime_server.sockets) == 2
+    # The connection of its own is closed after the utterance
+    assert realtime_server.sockets[1].closed
+    assert not realtime_server.sockets[0].closed
+    assert result.result == SpeechResultState.SUCCESS
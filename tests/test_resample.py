@@ -0,0 +1,133 @@
+"""Tests for the streaming resampler."""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+import pytest
+
+from custom_components.openai_stt.resample import STOPBAND_DB, StreamingResampler
+
+AMPLITUDE = 10000
+
+
+def tone(rate: int, frequency: float, seconds: float, channels: int = 1) -> bytes:
+    """Return a sine tone as interleaved PCM16."""
+    t = np.arange(int(rate * seconds)) / rate
+    samples = (np.sin(2 * np.pi * frequency * t) * AMPLITUDE).astype(np.int16)
+    return np.repeat(samples, channels).tobytes()
+
+
+def resample(
+    resampler: StreamingResampler, data: bytes, chunk_size: int | None = None
+) -> bytes:
+    """Run data through the resampler, whole or in chunks."""
+    if chunk_size is None:
+        return resampler.process(data) + resampler.flush()
+    out = b"".join(
+        resampler.process(data[start : start + chunk_size])
+        for start in range(0, len(data), chunk_size)
+    )
+    return out + resampler.flush()
+
+
+def level_db(pcm: bytes) -> float:
+    """Return the level of the middle half of PCM16 relative to the tone."""
+    samples = np.frombuffer(pcm, dtype=np.int16).astype(np.float64)
+    middle = samples[len(samples) // 4 : -len(samples) // 4]
+    rms = np.sqrt(np.mean(middle**2))
+    return 20 * math.log10(max(rms, 1e-9) / (AMPLITUDE / math.sqrt(2)))
+
+
+@pytest.mark.parametrize(
+    ("input_rate", "output_rate", "channels"),
+    [
+        (48000, 16000, 1),
+        (48000, 16000, 2),
+        (44100, 16000, 2),
+        (16000, 24000, 1),
+        (22000, 24000, 1),
+        (8000, 24000, 2),
+    ],
+)
+@pytest.mark.parametrize("chunk_size", [1, 333, 4096])
+def test_chunked_matches_whole(
+    input_rate: int, output_rate: int, channels: int, chunk_size: int
+) -> None:
+    """Test that chunk boundaries, even within a sample, do not change the output."""
+    data = tone(input_rate, 440, 0.25, channels)
+
+    whole = resample(StreamingResampler(input_rate, output_rate, channels), data)
+    chunked = resample(
+        StreamingResampler(input_rate, output_rate, channels), data, chunk_size
+    )
+
+    assert chunked == whole
+
+
+@pytest.mark.parametrize(
+    ("input_rate", "output_rate"),
+    [(48000, 16000), (44100, 16000), (16000, 24000), (11000, 16000), (37800, 24000)],
+)
+def test_output_length(input_rate: int, output_rate: int) -> None:
+    """Test that the output covers exactly the duration of the input."""
+    samples = input_rate // 3 + 7
+    data = bytes(samples * 2)
+
+    out = resample(StreamingResampler(input_rate, output_rate, 1), data)
+
+    assert len(out) // 2 == math.ceil(samples * output_rate / input_rate)
+
+
+def test_filter_is_shared() -> None:
+    """Test that resamplers of a rate pair share one read-only filter."""
+    first = StreamingResampler(44100, 16000, 2)
+    second = StreamingResampler(44100, 16000, 1)
+
+    assert first._branches is second._branches
+    assert not first._branches.flags.writeable
+
+
+def test_passthrough() -> None:
+    """Test that mono audio at the output rate is passed through untouched."""
+    resampler = StreamingResampler(16000, 16000, 1)
+    data = tone(16000, 440, 0.1)
+
+    assert resampler.passthrough
+    assert resample(resampler, data, 100) == data
+
+
+def test_stereo_is_downmixed() -> None:
+    """Test that the channels are averaged into mono."""
+    left = np.frombuffer(tone(16000, 440, 0.2), dtype=np.int16)
+    stereo = np.column_stack((left, -left)).astype(np.int16).tobytes()
+
+    resampler = StreamingResampler(16000, 16000, 2)
+    out = np.frombuffer(resample(resampler, stereo), dtype=np.int16)
+
+    assert not resampler.passthrough
+    assert len(out) == len(left)
+    assert np.abs(out).max() <= 1
+
+
+@pytest.mark.parametrize("input_rate", [48000, 44100])
+@pytest.mark.parametrize("frequency", [1000, 6000, 7000])
+def test_passband_is_flat(input_rate: int, frequency: int) -> None:
+    """Test that speech frequencies pass at their level."""
+    out = resample(
+        StreamingResampler(input_rate, 16000, 1), tone(input_rate, frequency, 0.5)
+    )
+
+    assert abs(level_db(out)) < 0.5
+
+
+@pytest.mark.parametrize("input_rate", [48000, 44100, 37800])
+@pytest.mark.parametrize("frequency", [8800, 10000, 15000])
+def test_aliases_are_attenuated(input_rate: int, frequency: int) -> None:
+    """Test that frequencies above the output Nyquist do not fold back."""
+    out = resample(
+        StreamingResampler(input_rate, 16000, 1), tone(input_rate, frequency, 0.5)
+    )
+
+    assert level_db(out) < -STOPBAND_DB
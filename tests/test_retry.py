@@ -0,0 +1,127 @@
+"""Tests for the retry policy."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime
+
+from aiohttp import (
+    ClientConnectionError,
+    ClientPayloadError,
+    ClientResponseError,
+    RequestInfo,
+)
+from multidict import CIMultiDict, CIMultiDictProxy
+import pytest
+from yarl import URL
+
+from custom_components.openai_stt.retry import (
+    RETRY_BACKOFF_MAX,
+    RETRY_INITIAL_ATTEMPT_ESTIMATE,
+    RetryPolicy,
+    RetryStats,
+    is_retryable,
+    retry_after,
+)
+
+
+def response_error(
+    status: int, headers: dict[str, str] | None = None
+) -> ClientResponseError:
+    """Return the error raised for a response status."""
+    url = URL("https://api.openai.com/v1/audio/transcriptions")
+    return ClientResponseError(
+        RequestInfo(url, "POST", CIMultiDictProxy(CIMultiDict()), url),
+        (),
+        status=status,
+        headers=CIMultiDictProxy(CIMultiDict(headers or {})),
+    )
+
+
+@pytest.mark.parametrize(
+    ("err", "retryable"),
+    [
+        (response_error(429), True),
+        (response_error(503), True),
+        (response_error(408), True),
+        (response_error(400), False),
+        (response_error(401), False),
+        (ClientConnectionError(), True),
+        (ClientPayloadError(), False),
+        (ValueError(), False),
+    ],
+)
+def test_is_retryable(err: BaseException, retryable: bool) -> None:
+    """Test which failures are worth another attempt."""
+    assert is_retryable(err) is retryable
+
+
+def test_retry_after_seconds() -> None:
+    """Test a Retry-After header in seconds."""
+    assert retry_after(response_error(429, {"Retry-After": "1.5"})) == 1.5
+    assert retry_after(response_error(429, {"Retry-After": "-3"})) == 0.0
+
+
+def test_retry_after_date() -> None:
+    """Test a Retry-After header with an HTTP date."""
+    when = datetime.now(UTC) + timedelta(seconds=30)
+    err = response_error(503, {"Retry-After": format_datetime(when, usegmt=True)})
+
+    assert 28 < retry_after(err) <= 30
+
+
+@pytest.mark.parametrize(
+    "err",
+    [
+        response_error(429),
+        response_error(429, {"Retry-After": "later"}),
+        ClientConnectionError(),
+    ],
+)
+def test_retry_after_missing(err: BaseException) -> None:
+    """Test errors without a usable Retry-After header."""
+    assert retry_after(err) is None
+
+
+def test_delay_backs_off_within_bounds() -> None:
+    """Test that delays are jittered up to the capped exponential backoff."""
+    policy = RetryPolicy(10)
+    err = response_error(503)
+
+    for retry, cap in ((0, 0.25), (1, 0.5), (2, 1.0), (5, RETRY_BACKOFF_MAX)):
+        delays = [policy.delay(err, retry, 60, 1) for _ in range(50)]
+        assert all(0 <= delay <= cap for delay in delays)
+
+
+def test_delay_honours_retry_after() -> None:
+    """Test that the server's Retry-After is waited for."""
+    err = response_error(429, {"Retry-After": "3"})
+
+    assert RetryPolicy(2).delay(err, 0, 60, 1) == 3
+
+
+def test_delay_gives_up() -> None:
+    """Test the cases where no retry is made."""
+    policy = RetryPolicy(2)
+
+    # Out of attempts
+    assert policy.delay(response_error(503), 2, 60, 1) is None
+    # Not retryable
+    assert policy.delay(response_error(400), 0, 60, 1) is None
+    # The attempt would not finish before the deadline
+    assert policy.delay(response_error(503), 0, 1.0, 1.5) is None
+    assert policy.delay(response_error(429, {"Retry-After": "5"}), 0, 5.5, 1) is None
+
+
+def test_stats() -> None:
+    """Test the retry counters and the attempt duration estimate."""
+    stats = RetryStats()
+    stats.record_attempt(2.0)
+    stats.record_request(0, 0.0)
+    stats.record_request(2, 0.75)
+
+    assert RETRY_INITIAL_ATTEMPT_ESTIMATE < stats.attempt_estimate < 2.0
+    assert stats.requests == 2
+    assert stats.retried_requests == 1
+    assert stats.retries == 2
+    assert stats.added_latency == stats.last_added_latency == 0.75
@@ -0,0 +1,242 @@
+"""Tests for routing across backends."""
+
+from __future__ import annotations
+
+import asyncio
+
+from aiohttp import ClientConnectionError
+from homeassistant.components.stt import (
+    AudioBitRates,
+    AudioChannels,
+    AudioCodecs,
+    AudioFormats,
+    AudioSampleRates,
+    SpeechMetadata,
+    SpeechResult,
+    SpeechResultState,
+)
+import pytest
+
+from custom_components.openai_stt import router as router_module
+from custom_components.openai_stt.router import (
+    EWMA_WEIGHT,
+    RECOVERED_SUCCESS,
+    Backend,
+    BackendRouter,
+    parse_backends,
+)
+
+METADATA = SpeechMetadata(
+    language="en-US",
+    format=AudioFormats.WAV,
+    codec=AudioCodecs.PCM,
+    bit_rate=AudioBitRates.BITRATE_16,
+    sample_rate=AudioSampleRates.SAMPLERATE_16000,
+    channel=AudioChannels.CHANNEL_MONO,
+)
+
+
+async def audio_stream():
+    """Yield a little audio."""
+    yield bytes(320)
+
+
+def make_router(*backends: Backend) -> BackendRouter:
+    """Return a router over the backends; probing needs no hass here."""
+    return BackendRouter(None, "sk-test", list(backends))
+
+
+def test_parse_backends() -> None:
+    """Test parsing backend lines."""
+    backends = parse_backends(
+        "# fallback last\nhttps://a.example/v1/ whisper-1\n\nhttp://b:8000/v1 m 2.5\n"
+    )
+
+    assert [(b.api_url, b.model, b.weight) for b in backends] == [
+        ("https://a.example/v1", "whisper-1", 1.0),
+        ("http://b:8000/v1", "m", 2.5),
+    ]
+
+
+@pytest.mark.parametrize(
+    "text", ["a.example whisper-1", "https://a.example", "https://a m 0"]
+)
+def test_parse_backends_invalid(text: str) -> None:
+    """Test that malformed lines are rejected."""
+    with pytest.raises(ValueError):
+        parse_backends(text)
+
+
+def test_select_unmeasured_first() -> None:
+    """Test that a backend without latency is tried before measured ones."""
+    fast = Backend("https://a", "m", latency=0.5)
+    new = Backend("https://b", "m")
+
+    assert make_router(fast, new).select() is new
+
+
+def test_select_weighs_latency() -> None:
+    """Test that weights scale the latency a backend is compared by."""
+    slow = Backend("https://a", "m", weight=4.0, latency=1.0)
+    fast = Backend("https://b", "m", weight=1.0, latency=0.5)
+    router = make_router(slow, fast)
+
+    assert router.select() is slow
+    slow.weight = 1.0
+    assert router.select() is fast
+
+
+def test_select_penalizes_failures() -> None:
+    """Test that a lower success average makes a backend less preferred."""
+    flaky = Backend("https://a", "m", latency=0.5, success=0.6)
+    steady = Backend("https://b", "m", latency=0.8)
+
+    assert make_router(flaky, steady).select() is steady
+
+
+def test_record_moving_averages() -> None:
+    """Test that requests update the latency and success averages."""
+    backend = Backend("https://a", "m")
+    router = make_router(backend)
+
+    router.record(backend, 1.0, True)
+    router.record(backend, 2.0, True)
+    assert backend.latency == pytest.approx(1.0 + EWMA_WEIGHT * 1.0)
+    assert backend.success == 1.0
+
+    router.record(backend, 0.0, False)
+    assert backend.latency == pytest.approx(1.0 + EWMA_WEIGHT * 1.0)
+    assert backend.success == pytest.approx(1 - EWMA_WEIGHT)
+    assert (backend.requests, backend.failures) == (3, 1)
+
+
+def test_failing_backend_is_ejected() -> None:
+    """Test that a backend is routed around once its success rate drops."""
+    primary = Backend("https://a", "m", latency=0.2)
+    fallback = Backend("https://b", "m", latency=1.0)
+    router = make_router(primary, fallback)
+
+    for _ in range(3):
+        router.record(primary, 0.0, False)
+    assert primary.healthy
+
+    router.record(primary, 0.0, False)
+    assert not primary.healthy
+    assert router.select() is fallback
+
+
+def test_all_failing_uses_least_failing() -> None:
+    """Test that a backend is still chosen when all are unhealthy."""
+    worse = Backend("https://a", "m", success=0.1, healthy=False)
+    bad = Backend("https://b", "m", success=0.3, healthy=False)
+
+    assert make_router(worse, bad).select() is bad
+
+
+class FakeResponse:
+    """A response to a probe."""
+
+    def __init__(self, status: int) -> None:
+        """Initialize the response."""
+        self.status = status
+
+    def release(self) -> None:
+        """Release the connection."""
+
+
+async def test_probe_recovers_backend(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that an unhealthy backend is used again once it answers."""
+    down = Backend("https://a", "m", success=0.2, healthy=False)
+    erroring = Backend("https://b", "m", success=0.2, healthy=False)
+    unreachable = Backend("https://c", "m", success=0.2, healthy=False)
+    statuses = {"https://a/models": 401, "https://b/models": 503}
+
+    class FakeSession:
+        async def get(self, url: str, **kwargs) -> FakeResponse:
+            if url not in statuses:
+                raise ClientConnectionError("Connection refused")
+            return FakeResponse(statuses[url])
+
+    monkeypatch.setattr(
+        router_module, "async_get_clientsession", lambda hass: FakeSession()
+    )
+
+    await make_router(down, erroring, unreachable)._async_probe()
+
+    assert down.healthy
+    assert down.success == RECOVERED_SUCCESS
+    assert not erroring.healthy
+    assert not unreachable.healthy
+
+
+def test_update_keeps_history() -> None:
+    """Test that backends kept across an update keep their averages."""
+    kept = Backend("https://a", "m", latency=0.7, success=0.9)
+    router = make_router(kept, Backend("https://b", "m"))
+
+    router.update(
+        "sk-new", [Backend("https://a", "m", 3.0), Backend("https://c", "m")]
+    )
+
+    assert router.backends[0] is kept
+    assert kept.weight == 3.0
+    assert [backend.api_url for backend in router.backends] == [
+        "https://a",
+        "https://c",
+    ]
+
+
+async def test_transcribe_records_latency_after_audio() -> None:
+    """Test that the latency is measured from the end of the audio."""
+    backend = Backend("https://a", "m")
+    router = make_router(backend)
+
+    async def transcribe(metadata, stream) -> SpeechResult:
+        async for _ in stream:
+            await asyncio.sleep(0.05)
+        await asyncio.sleep(0.02)
+        return SpeechResult("ok", SpeechResultState.SUCCESS)
+
+    await router.async_transcribe(backend, transcribe, METADATA, audio_stream())
+
+    assert 0.01 < backend.latency < 0.05
+    assert backend.requests == 1
+
+
+async def test_transcribe_records_failure() -> None:
+    """Test that a raising request counts as a failure."""
+    backend = Backend("https://a", "m")
+    router = make_router(backend)
+
+    async def transcribe(metadata, stream) -> SpeechResult:
+        raise ClientConnectionError
+
+    with pytest.raises(ClientConnectionError):
+        await router.async_transcribe(backend, transcribe, METADATA, audio_stream())
+
+    assert backend.failures == 1
+    assert backend.latency is None
+
+
+async def test_cancelled_request_is_a_latency_bound() -> None:
+    """Test that a request cancelled after the audio only adds its latency."""
+    backend = Backend("https://a", "m", success=0.6)
+    router = make_router(backend)
+
+    async def transcribe(metadata, stream) -> SpeechResult:
+        async for _ in stream:
+            pass
+        await asyncio.sleep(10)
+        return SpeechResult("late", SpeechResultState.SUCCESS)
+
+    task = asyncio.create_task(
+        router.async_transcribe(backend, transcribe, METADATA, audio_stream())
+    )
+    await asyncio.sleep(0.05)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert backend.latency >= 0.04
+    assert backend.success == 0.6
+    assert (backend.requests, backend.failures) == (0, 0)
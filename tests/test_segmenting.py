@@ -0,0 +1,96 @@
+"""Tests for splitting long recordings into segments."""
+
+from __future__ import annotations
+
+from itertools import pairwise
+
+import numpy as np
+
+from custom_components.openai_stt.segmenting import find_cuts, segment_ranges, stitch
+from custom_components.openai_stt.vad import FRAME_MS
+
+RATE = 16000
+FRAME_BYTES = RATE * FRAME_MS // 1000 * 2
+
+
+def recording(pattern: list[tuple[int, bool]]) -> bytes:
+    """Return audio of (milliseconds, speech) parts."""
+    rng = np.random.default_rng(0)
+    parts = [
+        rng.normal(0, 5000 if loud else 5, RATE * ms // 1000).astype(np.int16)
+        for ms, loud in pattern
+    ]
+    return np.concatenate(parts).tobytes()
+
+
+def test_find_cuts_at_pauses() -> None:
+    """Test that a segment ends at a pause near its end."""
+    audio = recording([(4300, True), (300, False), (3000, True)])
+
+    cuts = find_cuts(memoryview(audio), RATE, 1, 5000)
+
+    assert len(cuts) == 1
+    assert cuts[0] % FRAME_BYTES == 0
+    assert 4300 <= cuts[0] // (RATE * 2 // 1000) < 4600
+
+
+def test_find_cuts_short_audio() -> None:
+    """Test that audio shorter than a segment is not cut."""
+    audio = recording([(3000, True)])
+
+    assert find_cuts(memoryview(audio), RATE, 1, 5000) == []
+
+
+def test_find_cuts_without_pauses() -> None:
+    """Test that audio without pauses is still cut within the segment length."""
+    audio = recording([(12000, True)])
+
+    cuts = find_cuts(memoryview(audio), RATE, 1, 5000)
+
+    bounds = [0, *cuts, len(audio)]
+    assert len(cuts) == 2
+    assert all(
+        end - start <= 5000 * RATE // 1000 * 2 for start, end in pairwise(bounds)
+    )
+
+
+def test_segment_ranges_overlap() -> None:
+    """Test that ranges overlap around the cuts and stay within the audio."""
+    assert segment_ranges(1000, [300, 700], 50, 2) == [
+        (0, 350),
+        (250, 750),
+        (650, 1000),
+    ]
+    assert segment_ranges(1000, [], 50, 2) == [(0, 1000)]
+
+
+def test_segment_ranges_aligned() -> None:
+    """Test that the overlap is rounded down to whole sample frames."""
+    ranges = segment_ranges(1000, [400], 50, 4)
+
+    assert ranges == [(0, 448), (352, 1000)]
+
+
+def test_stitch_removes_overlap() -> None:
+    """Test that words repeated by the overlap are dropped."""
+    assert (
+        stitch(["The quick brown fox jumps", "fox jumps over the lazy dog."])
+        == "The quick brown fox jumps over the lazy dog."
+    )
+
+
+def test_stitch_ignores_case_and_punctuation() -> None:
+    """Test that the overlap matches despite case and punctuation."""
+    assert stitch(["Turn on the kitchen light.", "Light, please"]) == (
+        "Turn on the kitchen light. please"
+    )
+
+
+def test_stitch_without_overlap() -> None:
+    """Test that transcripts without repeated words are joined whole."""
+    assert stitch(["Hello there", "general Kenobi"]) == "Hello there general Kenobi"
+
+
+def test_stitch_skips_empty() -> None:
+    """Test that empty segment transcripts are skipped."""
+    assert stitch(["", "one two", "  ", "two three"]) == "one two three"
@@ -0,0 +1,180 @@
+"""Tests for tracing spans and metrics."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from homeassistant.components.stt import (
+    AudioBitRates,
+    AudioChannels,
+    AudioCodecs,
+    AudioFormats,
+    AudioSampleRates,
+    SpeechMetadata,
+)
+import pytest
+
+from custom_components.openai_stt.telemetry import (
+    InMemoryExporter,
+    MetricsRegistry,
+    OtlpExporter,
+    Telemetry,
+    current_span,
+    render_metrics,
+)
+from custom_components.openai_stt.websocket_client import OpenAIWebSocketClient
+
+from .conftest import FakeRealtimeServer
+
+METADATA = SpeechMetadata(
+    language="en-US",
+    format=AudioFormats.WAV,
+    codec=AudioCodecs.PCM,
+    bit_rate=AudioBitRates.BITRATE_16,
+    sample_rate=AudioSampleRates.SAMPLERATE_16000,
+    channel=AudioChannels.CHANNEL_MONO,
+)
+
+
+async def audio():
+    """Yield a few chunks of PCM16."""
+    for _ in range(3):
+        await asyncio.sleep(0)
+        yield bytes(960)
+
+
+class FakeResponse:
+    """A collector's response."""
+
+    def release(self) -> None:
+        """Release the connection."""
+
+    def raise_for_status(self) -> None:
+        """Accept the export."""
+
+
+class FakeSession:
+    """Records the requests made to a collector."""
+
+    def __init__(self) -> None:
+        """Initialize the session."""
+        self.posts: list[tuple[str, dict[str, Any]]] = []
+
+    async def post(self, url: str, json: dict[str, Any], **kwargs) -> FakeResponse:
+        """Record the request."""
+        self.posts.append((url, json))
+        return FakeResponse()
+
+
+async def test_transcribe_span_tree(
+    realtime_client: OpenAIWebSocketClient, realtime_server: FakeRealtimeServer
+) -> None:
+    """Test that a transcription is one trace with a span per stage."""
+    exporter = InMemoryExporter()
+    metrics = MetricsRegistry()
+    realtime_client.telemetry = Telemetry([exporter], metrics)
+    realtime_server.transcripts = ["hello"]
+
+    result = await realtime_client.async_process_audio_stream(METADATA, audio())
+
+    assert result.text == "hello"
+    root = exporter.spans[-1]
+    assert root.name == "transcribe"
+    assert root.parent_id is None
+    assert root.error is None
+    assert root.duration is not None
+    children = {span.name for span in exporter.spans[:-1]}
+    assert {"connect", "configure", "append", "commit", "completion"} <= children
+    for span in exporter.spans[:-1]:
+        assert span.trace_id == root.trace_id
+        assert span.start_time >= root.start_time
+        assert span.end_time <= root.end_time
+    assert {span.parent_id for span in exporter.spans[:-1]} == {root.span_id}
+    assert any(
+        line.startswith("openai_stt_requests_total{") and line.endswith(" 1")
+        for line in metrics.render()
+    )
+
+
+def test_span_records_error() -> None:
+    """Test that an exception marks the span as failed and is raised."""
+    exporter = InMemoryExporter()
+    telemetry = Telemetry([exporter])
+
+    with pytest.raises(ValueError), telemetry.span("outer"):
+        with telemetry.span("inner") as inner:
+            assert current_span() is inner
+        raise ValueError("Bad audio")
+
+    inner, outer = exporter.spans
+    assert inner.error is None
+    assert outer.error == "Bad audio"
+    assert current_span() is None
+
+
+async def test_otlp_export_body() -> None:
+    """Test that spans are sent to the collector as OTLP JSON."""
+    session = FakeSession()
+    exporter = OtlpExporter(session, "http://collector:4318/", "openai_stt")
+    telemetry = Telemetry([exporter])
+
+    with pytest.raises(TimeoutError), telemetry.span("transcribe", model="m"):
+        telemetry.add_span("completion", 0.25, cached=False, bytes=3, ratio=0.5)
+        raise TimeoutError
+    await exporter.async_export()
+    await exporter.async_export()
+
+    assert len(session.posts) == 1
+    url, body = session.posts[0]
+    assert url == "http://collector:4318/v1/traces"
+    (resource_spans,) = body["resourceSpans"]
+    assert resource_spans["resource"]["attributes"] == [
+        {"key": "service.name", "value": {"stringValue": "openai_stt"}}
+    ]
+    (scope_spans,) = resource_spans["scopeSpans"]
+    child, root = scope_spans["spans"]
+    assert root["name"] == "transcribe"
+    assert "parentSpanId" not in root
+    assert root["status"] == {"code": 2, "message": "TimeoutError"}
+    assert root["attributes"] == [{"key": "model", "value": {"stringValue": "m"}}]
+    assert child["traceId"] == root["traceId"]
+    assert child["parentSpanId"] == root["spanId"]
+    assert child["status"] == {}
+    assert child["attributes"] == [
+        {"key": "cached", "value": {"boolValue": False}},
+        {"key": "bytes", "value": {"intValue": "3"}},
+        {"key": "ratio", "value": {"doubleValue": 0.5}},
+    ]
+    assert (
+        int(child["endTimeUnixNano"]) - int(child["startTimeUnixNano"])
+        == 250_000_000
+    )
+
+
+def test_prometheus_rendering() -> None:
+    """Test the text format of counters and histograms."""
+    metrics = MetricsRegistry()
+    labels = {"protocol": "http", "model": 'whisper "1"'}
+    metrics.count("bytes_sent_total", 100, labels)
+    metrics.count("bytes_sent_total", 28, labels)
+    metrics.observe("latency_seconds", 0.3, labels)
+    metrics.observe("latency_seconds", 20, labels)
+
+    text = render_metrics(metrics.render({"entry": "Kitchen"}))
+
+    lines = text.splitlines()
+    assert "# TYPE openai_stt_latency_seconds histogram" in lines
+    assert "# TYPE openai_stt_bytes_sent_total counter" in lines
+    label_set = 'entry="Kitchen",protocol="http",model="whisper \\"1\\""'
+    assert f"openai_stt_bytes_sent_total{{{label_set}}} 128" in lines
+    buckets = [line for line in lines if "_bucket{" in line]
+    assert buckets[0] == f'openai_stt_latency_seconds_bucket{{{label_set},le="0.1"}} 0'
+    assert f'openai_stt_latency_seconds_bucket{{{label_set},le="0.5"}} 1' in lines
+    assert f'openai_stt_latency_seconds_bucket{{{label_set},le="10"}} 1' in lines
+    assert buckets[-1] == (
+        f'openai_stt_latency_seconds_bucket{{{label_set},le="+Inf"}} 2'
+    )
+    assert f"openai_stt_latency_seconds_sum{{{label_set}}} 20.3" in lines
+    assert f"openai_stt_latency_seconds_count{{{label_set}}} 2" in lines
+    assert text.endswith("\n")
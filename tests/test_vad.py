@@ -0,0 +1,86 @@
+"""Tests for the silence trimmer."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from custom_components.openai_stt.vad import SilenceTrimmer
+
+RATE = 16000
+# Bytes of one millisecond of 16 kHz mono PCM16
+MS = RATE // 1000 * 2
+
+
+def speech(ms: int) -> bytes:
+    """Return loud noise standing in for speech."""
+    rng = np.random.default_rng(ms)
+    return rng.normal(0, 5000, RATE * ms // 1000).astype(np.int16).tobytes()
+
+
+def silence(ms: int) -> bytes:
+    """Return digital silence."""
+    return bytes(MS * ms)
+
+
+def trim(
+    data: bytes, padding_ms: int = 100, chunk_size: int | None = None
+) -> tuple[bytes, SilenceTrimmer]:
+    """Trim data, whole or in chunks, and return the output and trimmer."""
+    trimmer = SilenceTrimmer(RATE, 1, -40.0, padding_ms)
+    size = chunk_size or len(data)
+    chunks = [data[start : start + size] for start in range(0, len(data), size)]
+    out = b"".join(trimmer.process(chunk) for chunk in chunks) + trimmer.flush()
+    return out, trimmer
+
+
+def test_leading_and_trailing_silence_trimmed_to_padding() -> None:
+    """Test that silence around speech is cut down to the padding."""
+    out, trimmer = trim(silence(1000) + speech(500) + silence(1000))
+
+    assert out == silence(100) + speech(500) + silence(100)
+    assert trimmer.bytes_removed == MS * 1800
+    assert trimmer.ms_removed == pytest.approx(1800)
+
+
+def test_pauses_within_speech_are_kept() -> None:
+    """Test that a long pause is kept whole once speech resumes."""
+    data = speech(300) + silence(700) + speech(300)
+
+    out, trimmer = trim(data)
+
+    assert out == data
+    assert trimmer.bytes_removed == 0
+
+
+def test_no_speech_keeps_padding() -> None:
+    """Test that silence alone leaves the padding, so a request stays valid."""
+    out, _ = trim(silence(1000))
+
+    assert out == silence(100)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 321, 3200])
+def test_chunked_matches_whole(chunk_size: int) -> None:
+    """Test that chunk boundaries do not change the output."""
+    data = silence(250) + speech(400) + silence(600) + speech(200) + silence(500)
+
+    whole, _ = trim(data)
+    chunked, trimmer = trim(data, chunk_size=chunk_size)
+
+    assert chunked == whole
+    assert trimmer.bytes_removed == len(data) - len(chunked)
+
+
+async def test_async_trim() -> None:
+    """Test trimming a stream."""
+    data = [silence(500), speech(200), silence(500)]
+
+    async def stream():
+        for chunk in data:
+            yield chunk
+
+    trimmer = SilenceTrimmer(RATE, 1, -40.0, 50)
+    out = b"".join([chunk async for chunk in trimmer.async_trim(stream())])
+
+    assert out == silence(50) + speech(200) + silence(50)
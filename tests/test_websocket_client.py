@@ -0,0 +1,91 @@
+"""Tests for the realtime WebSocket client."""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+
+import pytest
+
+from custom_components.openai_stt import websocket_client
+from custom_components.openai_stt.websocket_client import (
+    REALTIME_SAMPLE_RATE,
+    OpenAIWebSocketClient,
+    _coalesce_frames,
+)
+
+from .conftest import FakeRealtimeServer
+
+# Bytes of 20 ms of 24 kHz PCM16
+FRAME_20MS = REALTIME_SAMPLE_RATE * 2 * 20 // 1000
+
+
+async def chunks(sizes: list[int], delay: float = 0.0):
+    """Yield chunks of the given sizes, numbered by their first byte."""
+    for index, size in enumerate(sizes):
+        if delay:
+            await asyncio.sleep(delay)
+        yield bytes([index]) * size
+
+
+async def test_coalesce_into_frames() -> None:
+    """Test that small chunks are regrouped into whole frames."""
+    frames = [
+        frame async for frame in _coalesce_frames(chunks([100] * 20), frame_ms=20)
+    ]
+
+    assert [len(frame) for frame in frames] == [FRAME_20MS, FRAME_20MS, 80]
+    assert b"".join(frames) == b"".join([bytes([i]) * 100 for i in range(20)])
+
+
+async def test_coalesce_splits_large_chunks() -> None:
+    """Test that a chunk of several frames is sent as frames."""
+    frames = [
+        frame
+        async for frame in _coalesce_frames(chunks([FRAME_20MS * 2 + 10]), frame_ms=20)
+    ]
+
+    assert [len(frame) for frame in frames] == [FRAME_20MS, FRAME_20MS, 10]
+
+
+async def test_coalesce_flushes_partial_frame_in_time() -> None:
+    """Test that a partial frame goes out once frame_ms passed."""
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    sent = []
+
+    async for frame in _coalesce_frames(chunks([10, 10], delay=0.1), frame_ms=20):
+        sent.append((len(frame), loop.time() - start))
+
+    assert [size for size, _ in sent] == [10, 10]
+    # The first chunk did not wait for the second one
+    assert sent[0][1] < 0.18
+
+
+async def test_coalesce_passthrough() -> None:
+    """Test that chunks pass unchanged with a frame_ms of 0."""
+    frames = [frame async for frame in _coalesce_frames(chunks([5, 7]), frame_ms=0)]
+
+    assert frames == [b"\x00" * 5, b"\x01" * 7]
+
+
+@pytest.mark.parametrize("send_frame", [False, True])
+async def test_append_messages(
+    realtime_client: OpenAIWebSocketClient,
+    realtime_server: FakeRealtimeServer,
+    monkeypatch: pytest.MonkeyPatch,
+    send_frame: bool,
+) -> None:
+    """Test that the prepared append messages carry the audio."""
+    monkeypatch.setattr(websocket_client, "_SEND_FRAME", send_frame)
+    ws = await realtime_server.ws_connect("wss://api.openai.com/v1/realtime")
+
+    assert await realtime_client._send_audio_stream(ws, chunks([300, 600]))
+
+    appends = [
+        base64.b64decode(event["audio"])
+        for event in ws.sent
+        if event["type"] == "input_audio_buffer.append"
+    ]
+    assert appends == [b"\x00" * 300, b"\x01" * 600]
+    assert ws.sent[-1] == {"type": "input_audio_buffer.commit"}
@@ -0,0 +1,140 @@
+"""Tests for the pool of pre-warmed realtime sessions."""
+
+from __future__ import annotations
+
+import asyncio
+
+from aiohttp import ClientError
+import pytest
+
+from custom_components.openai_stt import websocket_pool
+from custom_components.openai_stt.websocket_client import OpenAIWebSocketClient
+from custom_components.openai_stt.websocket_pool import RealtimeSessionPool
+
+from .conftest import FakeRealtimeServer
+
+
+async def wait_for(condition) -> None:
+    """Wait until condition() holds."""
+    async with asyncio.timeout(1):
+        while not condition():
+            await asyncio.sleep(0.001)
+
+
+@pytest.fixture
+async def pool(realtime_client: OpenAIWebSocketClient):
+    """Return a pool of two sessions, closed after the test."""
+    pool = RealtimeSessionPool(realtime_client, 2, 300, "en-US")
+    yield pool
+    await pool.async_close()
+
+
+async def test_fills_to_size(
+    pool: RealtimeSessionPool, realtime_server: FakeRealtimeServer
+) -> None:
+    """Test that the pool opens its sessions in the background."""
+    pool.async_start()
+    await wait_for(lambda: pool.idle_count == 2)
+
+    assert len(realtime_server.sockets) == 2
+    for ws in realtime_server.sockets:
+        assert [event["type"] for event in ws.sent] == [
+            "transcription_session.update"
+        ]
+
+
+async def test_checkout_refills(
+    pool: RealtimeSessionPool, realtime_server: FakeRealtimeServer
+) -> None:
+    """Test that a checked out session is replaced."""
+    pool.async_start()
+    await wait_for(lambda: pool.idle_count == 2)
+
+    ws = await pool.async_checkout("en-US")
+
+    assert ws is realtime_server.sockets[0]
+    assert not ws.closed
+    await wait_for(lambda: pool.idle_count == 2)
+    assert len(realtime_server.sockets) == 3
+
+
+async def test_checkout_reconfigures_language(
+    pool: RealtimeSessionPool, realtime_server: FakeRealtimeServer
+) -> None:
+    """Test that a session is updated for another language before use."""
+    pool.async_start()
+    await wait_for(lambda: pool.idle_count == 2)
+
+    ws = await pool.async_checkout("de-DE")
+
+    languages = [
+        event["session"]["input_audio_transcription"]["language"] for event in ws.sent
+    ]
+    assert languages == ["en", "de"]
+
+
+async def test_checkout_empty(pool: RealtimeSessionPool) -> None:
+    """Test that an empty pool leaves connecting to the caller."""
+    assert await pool.async_checkout("en-US") is None
+
+
+async def test_closed_sessions_are_replaced(
+    pool: RealtimeSessionPool, realtime_server: FakeRealtimeServer
+) -> None:
+    """Test that a session closed by the server is dropped and replaced."""
+    pool.async_start()
+    await wait_for(lambda: pool.idle_count == 2)
+
+    realtime_server.sockets[0].drop()
+
+    await wait_for(lambda: len(realtime_server.sockets) == 3 and pool.idle_count == 2)
+    ws = await pool.async_checkout("en-US")
+    assert ws is realtime_server.sockets[1]
+
+
+async def test_idle_sessions_expire(
+    realtime_client: OpenAIWebSocketClient, realtime_server: FakeRealtimeServer
+) -> None:
+    """Test that sessions idle for max_idle are closed and replaced."""
+    pool = RealtimeSessionPool(realtime_client, 1, 0.05, "en-US")
+    pool.async_start()
+    await wait_for(lambda: pool.idle_count == 1)
+
+    await wait_for(lambda: len(realtime_server.sockets) >= 2)
+
+    assert realtime_server.sockets[0].closed
+    await wait_for(lambda: pool.idle_count == 1)
+    await pool.async_close()
+    assert all(ws.closed for ws in realtime_server.sockets)
+
+
+async def test_refill_backs_off_after_failure(
+    pool: RealtimeSessionPool,
+    realtime_server: FakeRealtimeServer,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that failed connections are retried with a growing delay."""
+    monkeypatch.setattr(websocket_pool, "REFILL_BACKOFF_MIN", 0.01)
+    realtime_server.connect_error = ClientError("Connection refused")
+    pool.async_start()
+    await wait_for(lambda: pool._backoff >= 0.02)
+
+    realtime_server.connect_error = None
+
+    await wait_for(lambda: pool.idle_count == 2)
+    assert pool._backoff == 0
+
+
+async def test_close_closes_idle_sessions(
+    pool: RealtimeSessionPool, realtime_server: FakeRealtimeServer
+) -> None:
+    """Test that closing the pool closes its sessions and stops refilling."""
+    pool.async_start()
+    await wait_for(lambda: pool.idle_count == 2)
+
+    await pool.async_close()
+
+    assert pool.idle_count == 0
+    assert all(ws.closed for ws in realtime_server.sockets)
+    await asyncio.sleep(0.01)
+    assert len(realtime_server.sockets) == 2